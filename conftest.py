@@ -6,9 +6,14 @@ pytest_plugins = [
     "pytest_plugins.markers",
     "pytest_plugins.issue_handlers",
     "pytest_plugins.manual_skipped",
+    "pytest_plugins.shared_gc",
+    "pytest_plugins.shared_function_telemetry",
+    "pytest_plugins.lock_profiler",
     # Fixtures
     "pytest_fixtures.api_fixtures",
     "pytest_fixtures.xdist",
+    "pytest_fixtures.entity_pool",
+    "pytest_fixtures.tracked_resources",
     "pytest_fixtures.broker",
     # Component Fixtures
     "pytest_fixtures.satellite_auth",
@@ -5,6 +5,8 @@ from nailgun import entities
 from wrapanapi import AzureSystem
 from wrapanapi import GoogleCloudSystem
 
+from robottelo import entity_pool
+from robottelo.api import default_entities
 from robottelo.api.utils import publish_puppet_module
 from robottelo.constants import AZURERM_RG_DEFAULT
 from robottelo.constants import AZURERM_RHEL7_FT_BYOS_IMG_URN
@@ -33,17 +35,17 @@ if not settings.configured:
 
 @pytest.fixture(scope='session')
 def default_org():
-    return entities.Organization().search(query={'search': f'name="{DEFAULT_ORG}"'})[0]
+    return default_entities.search_entity(entities.Organization, f'name="{DEFAULT_ORG}"')
 
 
 @pytest.fixture(scope='session')
 def default_location():
-    return entities.Location().search(query={'search': f'name="{DEFAULT_LOC}"'})[0]
+    return default_entities.search_entity(entities.Location, f'name="{DEFAULT_LOC}"')
 
 
 @pytest.fixture(scope='module')
 def module_org():
-    return entities.Organization().create()
+    return entity_pool.get_entity('org') or entities.Organization().create()
 
 
 @pytest.fixture(scope='module')
@@ -53,7 +55,7 @@ def module_location(module_org):
 
 @pytest.fixture(scope='session')
 def default_lce():
-    return entities.LifecycleEnvironment().search(query={'search': f'name={ENVIRONMENT}'})[0]
+    return default_entities.search_entity(entities.LifecycleEnvironment, f'name={ENVIRONMENT}')
 
 
 @pytest.fixture(scope='module')
@@ -79,10 +81,16 @@ def module_compute_profile():
 @pytest.fixture(scope='session')
 def default_domain(default_smart_proxy):
     domain_name = settings.server.hostname.partition('.')[-1]
-    dom = entities.Domain().search(query={'search': f'name={domain_name}'})[0]
-    dom.dns = default_smart_proxy
-    dom.update(['dns'])
-    return entities.Domain(id=dom.id).read()
+
+    def resolve_domain():
+        dom = entities.Domain().search(query={'search': f'name={domain_name}'})[0]
+        dom.dns = default_smart_proxy
+        dom.update(['dns'])
+        return dom
+
+    return default_entities.resolve_entity(
+        entities.Domain, resolve_domain, key=f'{domain_name}.{default_smart_proxy.id}'
+    )
 
 
 @pytest.fixture(scope='module')
@@ -115,9 +123,7 @@ def module_default_subnet(module_org, module_location):
 
 @pytest.fixture(scope='session')
 def default_partitiontable():
-    ptables = entities.PartitionTable().search(query={'search': f'name="{DEFAULT_PTABLE}"'})
-    if ptables:
-        return ptables[0].read()
+    return default_entities.search_entity(entities.PartitionTable, f'name="{DEFAULT_PTABLE}"')
 
 
 @pytest.fixture(scope='module')
@@ -148,12 +154,7 @@ def module_provisioningtemplate_pxe(module_org, module_location):
 
 @pytest.fixture(scope='session')
 def default_architecture():
-    arch = (
-        entities.Architecture()
-        .search(query={'search': f'name="{DEFAULT_ARCHITECTURE}"'})[0]
-        .read()
-    )
-    return arch
+    return default_entities.search_entity(entities.Architecture, f'name="{DEFAULT_ARCHITECTURE}"')
 
 
 @pytest.fixture(scope='module')
@@ -182,13 +183,23 @@ def default_os(
     else:
         version = os.split(' ')[1].split('.')
         search_string = f'family="Redhat" AND major="{version[0]}" AND minor="{version[1]}"'
-    os = entities.OperatingSystem().search(query={'search': search_string})[0].read()
-    os.architecture.append(default_architecture)
-    os.ptable.append(default_partitiontable)
-    os.provisioning_template.append(default_pxetemplate)
-    os.update(['architecture', 'ptable', 'provisioning_template'])
-    os = entities.OperatingSystem(id=os.id).read()
-    return os
+
+    def resolve_os():
+        os = entities.OperatingSystem().search(query={'search': search_string})[0].read()
+        os.architecture.append(default_architecture)
+        os.ptable.append(default_partitiontable)
+        os.provisioning_template.append(default_pxetemplate)
+        os.update(['architecture', 'ptable', 'provisioning_template'])
+        return os
+
+    return default_entities.resolve_entity(
+        entities.OperatingSystem,
+        resolve_os,
+        key=(
+            f'{search_string}.{default_architecture.id}.{default_partitiontable.id}.'
+            f'{default_pxetemplate.id}'
+        ),
+    )
 
 
 @pytest.fixture(scope='module')
@@ -438,8 +449,7 @@ def module_cv_with_puppet_module(module_org):
 
 @pytest.fixture(scope='session')
 def default_pxetemplate():
-    pxe_template = entities.ProvisioningTemplate().search(query={'search': DEFAULT_PXE_TEMPLATE})
-    return pxe_template[0].read()
+    return default_entities.search_entity(entities.ProvisioningTemplate, DEFAULT_PXE_TEMPLATE)
 
 
 @pytest.fixture(scope='module')
@@ -0,0 +1,44 @@
+"""Fixtures that manage the pre-warmed entities pools"""
+import pytest
+from nailgun import entities
+
+from robottelo import entity_pool
+from robottelo.cleanup import RESOURCES
+from robottelo.cli.factory import make_org_with_credentials
+from robottelo.cli.org import Org
+from robottelo.config import settings
+
+
+def _create_untracked(factory):
+    """The pooled entities outlive the module that created them"""
+    with RESOURCES.untracked():
+        return factory()
+
+
+@pytest.fixture(scope='session', autouse=True)
+def entity_pools(align_xdist_satellites):
+    """Start the worker organizations pools, when enabled, and delete the
+    organizations that were not handed out at session end. The handed out
+    organizations are tracked in the resources cleanup scope of the test
+    that took them, if any, like the organizations it would have created.
+    """
+    pool_size = settings.entity_pool_size
+    if pool_size:
+        entity_pool.register_pool(
+            'org',
+            lambda: _create_untracked(entities.Organization().create),
+            cleanup=lambda org: org.delete(),
+            hand_out=lambda org: RESOURCES.track('Organization', org.id, org.delete),
+            size=pool_size,
+        )
+        entity_pool.register_pool(
+            'cli_org',
+            lambda: _create_untracked(make_org_with_credentials),
+            cleanup=lambda org: Org.delete({'id': org['id']}),
+            hand_out=lambda org: RESOURCES.track(
+                'Org', org['id'], lambda: Org.delete({'id': org['id']})
+            ),
+            size=pool_size,
+        )
+    yield
+    entity_pool.reclaim_pools()
@@ -3,6 +3,7 @@ import copy
 import pytest
 from nailgun import entities
 
+from robottelo.api.satellite_settings import settings_updated
 from robottelo.api.utils import update_rhsso_settings_in_satellite
 from robottelo.config import settings
 from robottelo.constants import AUDIENCE_MAPPER
@@ -243,12 +244,8 @@ def rhsso_setting_setup(request):
 @pytest.fixture()
 def rhsso_setting_setup_with_timeout(rhsso_setting_setup, request):
     """Update the RHSSO setting with timeout setting and revert it in cleanup"""
-    setting_entity = entities.Setting().search(query={'search': f'name=idle_timeout'})[0]
-    setting_entity.value = 1
-    setting_entity.update({'value'})
-    yield
-    setting_entity.value = 30
-    setting_entity.update({'value'})
+    with settings_updated({'idle_timeout': 1}):
+        yield
 
 
 @pytest.fixture(scope='session')
@@ -1,17 +1,13 @@
 import pytest
 from nailgun import entities
 
+from robottelo.api import default_entities
 from robottelo.test import settings
 
 
 @pytest.fixture(scope='session')
 def default_smart_proxy():
-    smart_proxy = (
-        entities.SmartProxy()
-        .search(query={'search': f'name={settings.server.hostname}'})[0]
-        .read()
-    )
-    return entities.SmartProxy(id=smart_proxy.id).read()
+    return default_entities.search_entity(entities.SmartProxy, f'name={settings.server.hostname}')
 
 
 @pytest.fixture(scope='session')
@@ -0,0 +1,45 @@
+"""Fixtures that delete the entities created during a test module or session"""
+import pytest
+
+from robottelo.cleanup import RESOURCES
+from robottelo.cleanup import track_nailgun_entities
+from robottelo.config import settings
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_fixture_setup(fixturedef, request):
+    """The resources created by a session fixture are tracked in the session
+    scope, even when the fixture is first set up during a module, the later
+    modules still use them
+    """
+    if fixturedef.scope in ('session', 'package'):
+        with RESOURCES.attributed_to('session'):
+            yield
+    else:
+        yield
+
+
+def _resources_scope(scope):
+    """Track the resources created during the scope and delete them at the
+    scope end
+    """
+    if settings.resources_cleanup_scope != scope:
+        yield
+        return
+    RESOURCES.push_scope(scope)
+    try:
+        yield
+    finally:
+        RESOURCES.teardown(RESOURCES.pop_scope())
+
+
+@pytest.fixture(scope='session', autouse=True)
+def session_tracked_resources(align_xdist_satellites):
+    if settings.resources_cleanup_scope:
+        track_nailgun_entities()
+    yield from _resources_scope('session')
+
+
+@pytest.fixture(scope='module', autouse=True)
+def module_tracked_resources(session_tracked_resources):
+    yield from _resources_scope('module')
@@ -0,0 +1,71 @@
+"""Report the function locks contention of the session, merged from all the
+xdist workers
+"""
+import json
+
+import pytest
+
+from robottelo.decorators import lock_profiler
+
+_WORKER_OUTPUT_KEY = 'lock_profiler_records'
+
+
+def _get_worker_output(obj):
+    # pytest-xdist renamed slaveoutput to workeroutput
+    output = getattr(obj, 'workeroutput', None)
+    if output is None:
+        output = getattr(obj, 'slaveoutput', None)
+    return output
+
+
+def pytest_addoption(parser):
+    """Add options to report the function locks contention"""
+    parser.addoption(
+        '--lock-profile-report',
+        action='store',
+        default=None,
+        help='Write the function locks acquires of the session to this json file',
+    )
+    parser.addoption(
+        '--lock-profile-report-limit',
+        type=int,
+        default=20,
+        help='The maximum number of locks and tests in the terminal summary',
+    )
+
+
+def pytest_configure(config):
+    config._lock_profiler_records = []
+
+
+def pytest_sessionfinish(session):
+    """Send the worker records to the main process"""
+    worker_output = _get_worker_output(session.config)
+    if worker_output is not None:
+        worker_output[_WORKER_OUTPUT_KEY] = lock_profiler.get_records()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Merge the records of a worker"""
+    worker_output = _get_worker_output(node) or {}
+    node.config._lock_profiler_records.extend(worker_output.get(_WORKER_OUTPUT_KEY, []))
+
+
+def pytest_terminal_summary(terminalreporter):
+    config = terminalreporter.config
+    if hasattr(config, 'slaveinput'):
+        return
+    records = config._lock_profiler_records + lock_profiler.get_records()
+    if not records:
+        return
+    terminalreporter.write_sep('=', 'function locks contention')
+    for line in lock_profiler.format_report(
+        records, limit=config.getoption('lock_profile_report_limit')
+    ):
+        terminalreporter.write_line(line)
+    report_path = config.getoption('lock_profile_report')
+    if report_path:
+        with open(report_path, 'w') as report_file:
+            json.dump(records, report_file, indent=2, sort_keys=True)
+        terminalreporter.write_line(f'function locks acquires written to {report_path}')
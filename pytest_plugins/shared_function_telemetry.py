@@ -0,0 +1,71 @@
+"""Report the shared functions telemetry of the session, merged from all the
+xdist workers
+"""
+import json
+
+import pytest
+
+from robottelo.decorators.func_shared import telemetry
+
+_WORKER_OUTPUT_KEY = 'shared_function_stats'
+
+
+def _get_worker_output(obj):
+    # pytest-xdist renamed slaveoutput to workeroutput
+    output = getattr(obj, 'workeroutput', None)
+    if output is None:
+        output = getattr(obj, 'slaveoutput', None)
+    return output
+
+
+def pytest_addoption(parser):
+    """Add options to report the shared functions telemetry"""
+    parser.addoption(
+        '--shared-function-report',
+        action='store',
+        default=None,
+        help='Write the shared functions telemetry of the session to this json file',
+    )
+    parser.addoption(
+        '--shared-function-report-limit',
+        type=int,
+        default=20,
+        help='The maximum number of shared functions in the terminal summary',
+    )
+
+
+def pytest_configure(config):
+    config._shared_function_stats = {}
+
+
+def pytest_sessionfinish(session):
+    """Send the worker records to the main process"""
+    worker_output = _get_worker_output(session.config)
+    if worker_output is not None:
+        worker_output[_WORKER_OUTPUT_KEY] = telemetry.get_stats()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Merge the records of a worker"""
+    worker_output = _get_worker_output(node) or {}
+    telemetry.merge(node.config._shared_function_stats, worker_output.get(_WORKER_OUTPUT_KEY, {}))
+
+
+def pytest_terminal_summary(terminalreporter):
+    config = terminalreporter.config
+    if hasattr(config, 'slaveinput'):
+        return
+    stats = telemetry.merge(config._shared_function_stats, telemetry.get_stats())
+    if not stats:
+        return
+    terminalreporter.write_sep('=', 'shared functions telemetry')
+    for line in telemetry.format_report(
+        stats, limit=config.getoption('shared_function_report_limit')
+    ):
+        terminalreporter.write_line(line)
+    report_path = config.getoption('shared_function_report')
+    if report_path:
+        with open(report_path, 'w') as report_file:
+            json.dump(stats, report_file, indent=2, sort_keys=True)
+        terminalreporter.write_line(f'shared functions telemetry written to {report_path}')
@@ -0,0 +1,36 @@
+"""Collect the stale shared functions and function locks temp files at
+session start
+"""
+import logging
+
+from robottelo.config import settings
+from robottelo.decorators import garbage_collector
+
+LOGGER = logging.getLogger('robottelo')
+
+
+def pytest_addoption(parser):
+    """Add options to collect the shared functions temp files"""
+    parser.addoption(
+        '--shared-gc',
+        action='store_true',
+        default=False,
+        help='Remove the expired shared functions values and the stale function locks '
+        'at session start',
+    )
+    parser.addoption(
+        '--shared-gc-max-bytes',
+        type=int,
+        default=None,
+        help='The maximum size of the shared functions values kept by --shared-gc',
+    )
+
+
+def pytest_sessionstart(session):
+    """Collect the temp files once, in the main process"""
+    config = session.config
+    if not config.getoption('shared_gc') or hasattr(config, 'slaveinput'):
+        return
+    settings.configure()
+    stats = garbage_collector.collect(max_bytes=config.getoption('shared_gc_max_bytes'))
+    LOGGER.info('shared functions garbage collector: {}'.format(stats))
@@ -0,0 +1,113 @@
+"""Lookup cache of the Satellite default entities.
+
+The default entities (default organization, location, lifecycle environment,
+architecture, ...) are not modified by the tests, but they are searched by
+every pytest xdist worker and by many tests. The lookups are resolved once
+per Satellite by the first process, the entities attributes are saved in the
+shared function storage, and the other processes rehydrate the nailgun
+entities from the saved attributes without any API call.
+
+Usage::
+
+    from nailgun import entities
+
+    from robottelo.api import default_entities
+
+    org = default_entities.search_entity(entities.Organization, f'name="{DEFAULT_ORG}"')
+
+    def resolve_domain():
+        domain = entities.Domain().search(query={'search': f'name={domain_name}'})[0]
+        domain.dns = smart_proxy
+        domain.update(['dns'])
+        return domain
+
+    # the resolver is called once per Satellite and key
+    domain = default_entities.resolve_entity(
+        entities.Domain, resolve_domain, key=f'{domain_name}.{smart_proxy.id}'
+    )
+
+Note: when the shared function feature is disabled the attributes are only
+    cached in the process.
+"""
+import copy
+import logging
+
+from nailgun import entities
+
+from robottelo.config import settings
+from robottelo.decorators.func_shared.shared import shared
+
+logger = logging.getLogger('robottelo')
+
+_SCOPE_CONTEXT = 'default_entities'
+
+# the process cache of the resolved entities attributes
+_entities_attrs = {}
+
+
+@shared(scope_context=_SCOPE_CONTEXT, function_kw=['hostname', 'entity_name', 'key'])
+def _resolve_entity_attrs(resolver, hostname=None, entity_name=None, key=None):
+    """Return the attributes of the entity returned by resolver, None if the
+    resolver did not return an entity
+    """
+    entity = resolver()
+    if entity is None:
+        return None
+    return entity.read_json()
+
+
+def _rehydrate(entity_name, attrs):
+    """Return a new nailgun entity populated with attrs"""
+    entity_class = getattr(entities, entity_name)
+    # some entities read methods modify the attributes
+    return entity_class(id=attrs['id']).read(attrs=copy.deepcopy(attrs))
+
+
+def resolve_entity(entity_class, resolver, key):
+    """Return the entity returned by resolver, the resolver is called once per
+    Satellite and key, the other calls return an entity rehydrated from the
+    cached attributes.
+
+    :type entity_class: type
+    :type resolver: callable
+    :type key: str
+
+    :param entity_class: the nailgun entity class
+    :param resolver: a callable without arguments that return an
+        ``entity_class`` entity or None
+    :param key: the lookup key that identify the resolved entity
+    :return: a new ``entity_class`` entity at each call, or None
+    """
+    hostname = settings.server.hostname
+    entity_name = entity_class.__name__
+    cache_key = (hostname, entity_name, key)
+    if cache_key not in _entities_attrs:
+        _entities_attrs[cache_key] = _resolve_entity_attrs(
+            resolver, hostname=hostname, entity_name=entity_name, key=key
+        )
+    else:
+        logger.debug(f'default entities: {entity_name} "{key}" found in cache')
+    attrs = _entities_attrs[cache_key]
+    if attrs is None:
+        return None
+    return _rehydrate(entity_name, attrs)
+
+
+def search_entity(entity_class, search):
+    """Return the first ``entity_class`` entity found with the search query,
+    None if not found. The search is done once per Satellite.
+
+    :type entity_class: type
+    :type search: str
+    """
+
+    def search_first():
+        results = entity_class().search(query={'search': search})
+        return results[0] if results else None
+
+    return resolve_entity(entity_class, search_first, key=search)
+
+
+def clear_cache():
+    """Clear the process cache of the resolved entities attributes"""
+    _entities_attrs.clear()
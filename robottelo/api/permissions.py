@@ -0,0 +1,109 @@
+"""Satellite permissions catalog.
+
+The permissions of a Satellite do not change during a test session. The
+catalog loads all of them with paged searches once per Satellite and process,
+and indexes them by name and by resource type, so that permissions lookups are
+dictionary hits instead of API searches.
+
+Usage::
+
+    from robottelo.api.permissions import get_permission_catalog
+
+    catalog = get_permission_catalog()
+    permission = catalog.get('view_organizations')
+    permissions = catalog.get_resource_type_permissions('Organization')
+"""
+import logging
+from collections import defaultdict
+
+from nailgun import entities
+
+from robottelo.config import settings
+
+logger = logging.getLogger('robottelo')
+
+PERMISSIONS_PAGE_SIZE = 1000
+
+# the catalogs by server hostname
+_catalogs = {}
+
+
+class PermissionCatalog:
+    """Index of permissions entities by name and by resource type
+
+    :param permissions: a list of ``nailgun.entities.Permission``
+    """
+
+    def __init__(self, permissions):
+        self._by_name = defaultdict(list)
+        self._by_resource_type = defaultdict(list)
+        for permission in permissions:
+            self._by_name[permission.name].append(permission)
+            self._by_resource_type[permission.resource_type].append(permission)
+
+    @classmethod
+    def load(cls, page_size=PERMISSIONS_PAGE_SIZE):
+        """Load all the server permissions in a new catalog"""
+        permissions = []
+        page = 1
+        while True:
+            page_permissions = entities.Permission().search(
+                query={'per_page': page_size, 'page': page}
+            )
+            permissions.extend(page_permissions)
+            if len(page_permissions) < page_size:
+                break
+            page += 1
+        logger.debug(f'permission catalog: loaded {len(permissions)} permissions')
+        return cls(permissions)
+
+    def __len__(self):
+        return sum(len(permissions) for permissions in self._by_name.values())
+
+    def get(self, name):
+        """Return the permission entity with name
+
+        :raises nailgun.entities.APIResponseError: if the permission is not
+            found or if more than one permission is found
+        """
+        permissions = self._by_name.get(name)
+        if not permissions:
+            raise entities.APIResponseError(f'permission "{name}" not found')
+        if len(permissions) > 1:
+            raise entities.APIResponseError(f'found more than one entity for permission "{name}"')
+        return permissions[0]
+
+    def get_resource_type_permissions(self, resource_type, names=None):
+        """Return the permissions entities of resource type
+
+        :param resource_type: the permissions resource type
+        :param names: if supplied, return only the permissions with names
+        :raises nailgun.entities.APIResponseError: if no permission found for
+            the resource type or if some names were not found
+        """
+        permissions = self._by_resource_type.get(resource_type)
+        if not permissions:
+            raise entities.APIResponseError(
+                f'resource type "{resource_type}" permissions not found'
+            )
+        if names is None:
+            return list(permissions)
+        permissions = [permission for permission in permissions if permission.name in names]
+        # ensure that all the requested permissions entities where retrieved
+        not_found_names = set(names).difference(permission.name for permission in permissions)
+        if not_found_names:
+            raise entities.APIResponseError(
+                f'permissions names entities not found "{not_found_names}"'
+            )
+        return permissions
+
+
+def get_permission_catalog(refresh=False):
+    """Return the permission catalog of the server, loaded once per process
+
+    :param refresh: whether to load the catalog again
+    """
+    hostname = settings.server.hostname
+    if refresh or hostname not in _catalogs:
+        _catalogs[hostname] = PermissionCatalog.load()
+    return _catalogs[hostname]
@@ -0,0 +1,141 @@
+"""Satellite settings snapshot and batched updates.
+
+Updating several Satellite settings one after the other costs a search and an
+update per setting. A snapshot loads the settings (all of them, or only the
+named ones) with paged searches, indexed by name, so that the desired values
+can be diffed against it and only the settings that really change are
+updated, concurrently.
+
+Usage::
+
+    from robottelo.api.satellite_settings import apply_settings
+    from robottelo.api.satellite_settings import settings_updated
+
+    # update the settings, return the previous values of the changed ones
+    previous_values = apply_settings({'idle_timeout': 1, 'entries_per_page': 30})
+
+    # update the settings and restore the changed ones at exit
+    with settings_updated({'idle_timeout': 1}):
+        ...
+"""
+import contextlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from nailgun import entities
+
+logger = logging.getLogger('robottelo')
+
+SETTINGS_PAGE_SIZE = 1000
+SETTINGS_UPDATE_MAX_WORKERS = 8
+
+
+class SettingsSnapshot:
+    """Satellite settings entities indexed by name
+
+    :param settings_entities: a list of ``nailgun.entities.Setting``
+    """
+
+    def __init__(self, settings_entities):
+        self._settings = {setting.name: setting for setting in settings_entities}
+
+    @classmethod
+    def load(cls, names=None, page_size=SETTINGS_PAGE_SIZE):
+        """Load the server settings in a new snapshot
+
+        :param names: if supplied, load only the settings with names
+        """
+        query = {'per_page': page_size}
+        if names is not None:
+            query['search'] = 'name ^ ({})'.format(', '.join(names))
+        settings_entities = []
+        page = 1
+        while True:
+            page_settings = entities.Setting().search(query=dict(query, page=page))
+            settings_entities.extend(page_settings)
+            if len(page_settings) < page_size:
+                break
+            page += 1
+        snapshot = cls(settings_entities)
+        if names is not None:
+            not_found_names = set(names).difference(snapshot.names)
+            if not_found_names:
+                raise entities.APIResponseError(f'settings not found "{not_found_names}"')
+        return snapshot
+
+    @property
+    def names(self):
+        return set(self._settings)
+
+    def __contains__(self, name):
+        return name in self._settings
+
+    def __getitem__(self, name):
+        return self._settings[name]
+
+    def values(self):
+        """Return a dict of the settings values by name"""
+        return {name: setting.value for name, setting in self._settings.items()}
+
+    def diff(self, values):
+        """Return the values that differ from the snapshot ones
+
+        :param dict values: the desired settings values by name
+        :raises KeyError: if a setting is not in the snapshot
+        """
+        return {
+            name: value for name, value in values.items() if self._settings[name].value != value
+        }
+
+    def _update(self, name, value):
+        setting = self._settings[name]
+        setting.value = value
+        setting.update({'value'})
+
+    def apply(self, values, max_workers=SETTINGS_UPDATE_MAX_WORKERS):
+        """Update the settings that differ from the snapshot, concurrently
+
+        :param dict values: the desired settings values by name
+        :return: the previous values of the updated settings
+        """
+        changes = self.diff(values)
+        previous_values = {name: self._settings[name].value for name in changes}
+        if changes:
+            logger.debug(f'settings snapshot: updating {", ".join(changes)}')
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(changes))) as executor:
+                list(executor.map(self._update, changes, changes.values()))
+        return previous_values
+
+
+def apply_settings(values, snapshot=None):
+    """Update the server settings with values, only the ones that differ from
+    the current values are written
+
+    :param dict values: the desired settings values by name
+    :param SettingsSnapshot snapshot: the settings snapshot to diff with, by
+        default only the settings in values are loaded
+    :return: the previous values of the updated settings
+    """
+    if not values:
+        return {}
+    if snapshot is None:
+        snapshot = SettingsSnapshot.load(names=values)
+    return snapshot.apply(values)
+
+
+@contextlib.contextmanager
+def settings_updated(values):
+    """Update the server settings with values and restore the updated ones at
+    exit
+
+    :param dict values: the desired settings values by name
+    :return: the settings snapshot
+    """
+    snapshot = SettingsSnapshot.load(names=values)
+    previous_values = snapshot.apply(values)
+    try:
+        yield snapshot
+    finally:
+        if previous_values:
+            # the restored settings are only written if changed since
+            apply_settings(previous_values)
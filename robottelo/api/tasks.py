@@ -0,0 +1,312 @@
+"""Foreman tasks tracking engine.
+
+Polling the tasks one after the other with ``ForemanTask.poll`` costs at
+least one API request per task and per poll. The tracker polls all its
+pending tasks with a single bulk search per tick, backs off exponentially
+(with jitter) while nothing changes and polls faster again as soon as a task
+progress moves. Each tracked task has a future that is resolved as soon as
+the task finishes.
+
+Usage::
+
+    from robottelo.api.tasks import TaskTracker
+
+    tracker = TaskTracker()
+    futures = [tracker.track(task.id) for task in tasks]
+    tracker.wait()
+    finished_tasks = [future.result() for future in futures]
+
+    # wait for the applicability of several content hosts to be regenerated
+    tracker = ApplicabilityTracker(host_ids, from_when)
+    durations = tracker.wait()
+"""
+import logging
+import random
+import time
+from concurrent.futures import Future
+
+from nailgun import entities
+from nailgun import entity_mixins
+
+logger = logging.getLogger('robottelo')
+
+TASK_MIN_POLL_RATE = 1
+TASK_MAX_POLL_RATE = 30
+TASK_POLL_BACKOFF = 1.5
+TASK_POLL_JITTER = 0.1
+
+_TASK_FINISHED_STATES = ('paused', 'stopped')
+
+APPLICABILITY_TASK_LABEL = 'Actions::Katello::Host::GenerateApplicability'
+UPLOAD_PROFILE_TASK_LABEL = 'Actions::Katello::Host::UploadPackageProfile'
+APPLICABILITY_SEARCH_RATE = 1
+APPLICABILITY_TIMEOUT = 300
+APPLICABILITY_PAGE_SIZE = 1000
+
+
+class TaskTracker:
+    """Track the Foreman tasks and poll them in bulk
+
+    :param min_poll_rate: the initial and minimal delay between polls
+    :param max_poll_rate: the maximal delay between polls
+    :param backoff: the delay multiplier when no task progressed
+    :param jitter: the proportion of the delay to randomly add or remove
+    :param timeout: the maximum number of seconds to wait for the tasks, by
+        default ``nailgun.entity_mixins.TASK_TIMEOUT``
+    :param raise_on_failure: whether the future of a task finished with a
+        result other than "success" is resolved with a ``TaskFailedError``
+    """
+
+    def __init__(
+        self,
+        min_poll_rate=TASK_MIN_POLL_RATE,
+        max_poll_rate=TASK_MAX_POLL_RATE,
+        backoff=TASK_POLL_BACKOFF,
+        jitter=TASK_POLL_JITTER,
+        timeout=None,
+        raise_on_failure=True,
+    ):
+        if timeout is None:
+            timeout = entity_mixins.TASK_TIMEOUT
+        self._min_poll_rate = min_poll_rate
+        self._max_poll_rate = max(min_poll_rate, max_poll_rate)
+        self._backoff = backoff
+        self._jitter = jitter
+        self._timeout = timeout
+        self._raise_on_failure = raise_on_failure
+        self._delay = min_poll_rate
+        self._futures = {}
+        self._progress = {}
+        self._start_times = {}
+        self.durations = {}
+        self.requests_count = 0
+
+    @property
+    def pending(self):
+        """Return the ids of the tasks not yet finished"""
+        return [task_id for task_id, future in self._futures.items() if not future.done()]
+
+    def track(self, task_id):
+        """Start tracking the task and return its future
+
+        :param task_id: the Foreman task id
+        :return: a future resolved with the finished ``ForemanTask``
+        """
+        if task_id not in self._futures:
+            self._futures[task_id] = Future()
+            self._start_times[task_id] = time.time()
+        return self._futures[task_id]
+
+    def _search(self, task_ids):
+        self.requests_count += 1
+        search_query = 'id ^ ({})'.format(', '.join(str(task_id) for task_id in task_ids))
+        return entities.ForemanTask().search(
+            query={'search': search_query, 'per_page': len(task_ids)}
+        )
+
+    def _resolve(self, task):
+        future = self._futures[task.id]
+        self.durations[task.id] = time.time() - self._start_times[task.id]
+        if self._raise_on_failure and task.result != 'success':
+            future.set_exception(
+                entity_mixins.TaskFailedError(
+                    f'Task {task.id} did not succeed. Task result: {task.result}', task.id
+                )
+            )
+        else:
+            future.set_result(task)
+
+    def poll(self):
+        """Poll all the pending tasks with one request and resolve the futures
+        of the finished ones.
+
+        :return: whether any pending task progressed or finished
+        """
+        pending = self.pending
+        if not pending:
+            return False
+        progressed = False
+        for task in self._search(pending):
+            if task.id not in self._futures or self._futures[task.id].done():
+                continue
+            if task.state in _TASK_FINISHED_STATES:
+                self._resolve(task)
+                progressed = True
+            elif getattr(task, 'progress', None) != self._progress.get(task.id):
+                self._progress[task.id] = getattr(task, 'progress', None)
+                progressed = True
+        return progressed
+
+    def _next_delay(self, progressed):
+        if progressed:
+            self._delay = self._min_poll_rate
+        else:
+            self._delay = min(self._delay * self._backoff, self._max_poll_rate)
+        return max(0, self._delay + random.uniform(-1, 1) * self._jitter * self._delay)
+
+    def wait(self):
+        """Poll until all the tracked tasks are finished.
+
+        :raises: ``nailgun.entity_mixins.TaskTimedOutError`` if some tasks did
+            not finish before timeout, their futures are cancelled.
+        """
+        end_time = time.time() + self._timeout
+        while True:
+            progressed = self.poll()
+            pending = self.pending
+            if not pending:
+                break
+            if time.time() >= end_time:
+                for task_id in pending:
+                    self._futures[task_id].cancel()
+                raise entity_mixins.TaskTimedOutError(
+                    f'Timed out polling tasks {pending}', pending[0]
+                )
+            time.sleep(min(self._next_delay(progressed), max(0, end_time - time.time())))
+        logger.debug(
+            'tasks tracker: {} tasks finished with {} requests'.format(
+                len(self._futures), self.requests_count
+            )
+        )
+
+
+def wait_for_tasks_finished(tasks, poll_rate=None, timeout=None, raise_on_failure=True):
+    """Wait for the tasks to finish using a bulk tracker
+
+    :param tasks: a list of ``nailgun.entities.ForemanTask``
+    :param poll_rate: the minimal delay between polls
+    :param timeout: the maximum number of seconds to wait for the tasks
+    :param raise_on_failure: whether to raise if a task did not succeed
+    :return: the list of the finished ``nailgun.entities.ForemanTask``, in the
+        same order
+    """
+    kwargs = {'timeout': timeout, 'raise_on_failure': raise_on_failure}
+    if poll_rate is not None:
+        kwargs['min_poll_rate'] = poll_rate
+    tracker = TaskTracker(**kwargs)
+    futures = [tracker.track(task.id) for task in tasks]
+    tracker.wait()
+    return [future.result() for future in futures]
+
+
+def _get_task_host_ids(task):
+    """Return the ids of the hosts of an applicability or package profile
+    upload task, from the task input
+    """
+    if task.label == APPLICABILITY_TASK_LABEL:
+        return set(task.input.get('host_ids', []))
+    if task.label == UPLOAD_PROFILE_TASK_LABEL:
+        return {task.input['host']['id']}
+    return set()
+
+
+class ApplicabilityTracker:
+    """Wait for the errata applicability of several content hosts to be
+    regenerated.
+
+    Each tick does a single search of the applicability and package profile
+    upload tasks started since ``from_when``, the tasks are mapped to their
+    hosts once, from the task input. A host is done when it has at least one
+    task and all its tasks are finished.
+
+    :param host_ids: the content hosts ids
+    :param int from_when: timestamp (in UTC) of the oldest tasks to consider
+    :param search_rate: the delay between searches
+    :param timeout: the maximum number of seconds to wait for the hosts
+    :param raise_on_failure: whether to raise if a host task did not succeed
+    """
+
+    def __init__(
+        self,
+        host_ids,
+        from_when,
+        search_rate=APPLICABILITY_SEARCH_RATE,
+        timeout=APPLICABILITY_TIMEOUT,
+        raise_on_failure=True,
+    ):
+        self._host_ids = set(host_ids)
+        self._from_when = from_when
+        self._search_rate = search_rate
+        self._timeout = timeout
+        self._raise_on_failure = raise_on_failure
+        self._tasks_hosts = {}
+        self._hosts_tasks = {host_id: {} for host_id in self._host_ids}
+        self._start_time = None
+        self.durations = {}
+        self.requests_count = 0
+
+    @property
+    def pending(self):
+        """Return the ids of the hosts not yet done"""
+        return self._host_ids.difference(self.durations)
+
+    def _search(self):
+        self.requests_count += 1
+        max_age = int(time.time()) - self._from_when + 1
+        search_query = (
+            f'( label = {APPLICABILITY_TASK_LABEL} OR label = {UPLOAD_PROFILE_TASK_LABEL} )'
+            f' AND started_at > "{max_age} seconds ago"'
+        )
+        return entities.ForemanTask().search(
+            query={'search': search_query, 'per_page': APPLICABILITY_PAGE_SIZE}
+        )
+
+    def poll(self):
+        """Search the tasks once and mark the hosts with all their tasks
+        finished as done.
+
+        :return: the ids of the hosts done with this poll
+        """
+        if self._start_time is None:
+            self._start_time = time.time()
+        pending = self.pending
+        if not pending:
+            return set()
+        for task in self._search():
+            if task.id not in self._tasks_hosts:
+                self._tasks_hosts[task.id] = _get_task_host_ids(task) & self._host_ids
+            for host_id in self._tasks_hosts[task.id] & pending:
+                self._hosts_tasks[host_id][task.id] = task
+        done = set()
+        for host_id in pending:
+            host_tasks = self._hosts_tasks[host_id].values()
+            if not host_tasks or any(
+                task.state not in _TASK_FINISHED_STATES for task in host_tasks
+            ):
+                continue
+            if self._raise_on_failure:
+                for task in host_tasks:
+                    if task.result != 'success':
+                        raise entity_mixins.TaskFailedError(
+                            f'Task {task.id} of host {host_id} did not succeed.'
+                            f' Task result: {task.result}',
+                            task.id,
+                        )
+            self.durations[host_id] = time.time() - self._start_time
+            done.add(host_id)
+        return done
+
+    def wait(self):
+        """Poll until the applicability of all the hosts is regenerated
+
+        :return: a dict of the seconds waited by host id
+        :raises: ``nailgun.entity_mixins.TaskTimedOutError`` if some hosts are
+            not done before timeout.
+        """
+        end_time = time.time() + self._timeout
+        while True:
+            self.poll()
+            pending = self.pending
+            if not pending:
+                break
+            if time.time() >= end_time:
+                raise entity_mixins.TaskTimedOutError(
+                    f'Timed out waiting for the applicability of hosts {sorted(pending)}', None
+                )
+            time.sleep(min(self._search_rate, max(0, end_time - time.time())))
+        logger.debug(
+            'applicability tracker: {} hosts done with {} requests'.format(
+                len(self._host_ids), self.requests_count
+            )
+        )
+        return dict(self.durations)
@@ -1,5 +1,9 @@
 """Module containing convenience functions for working with the API."""
+import contextvars
+import functools
+import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 from fauxfactory import gen_ipaddr
 from fauxfactory import gen_mac
@@ -7,9 +11,13 @@ from fauxfactory import gen_string
 from inflector import Inflector
 from nailgun import entities
 from nailgun import entity_mixins
-from nailgun.client import request
 
+from robottelo import http_sessions
 from robottelo import ssh
+from robottelo.api.permissions import get_permission_catalog
+from robottelo.api.satellite_settings import apply_settings
+from robottelo.api.tasks import ApplicabilityTracker
+from robottelo.api.tasks import wait_for_tasks_finished
 from robottelo.config import settings
 from robottelo.config.base import ImproperlyConfigured
 from robottelo.constants import DEFAULT_ARCHITECTURE
@@ -20,6 +28,16 @@ from robottelo.constants import REPO_TYPE
 from robottelo.constants import RHEL_6_MAJOR_VERSION
 from robottelo.constants import RHEL_7_MAJOR_VERSION
 from robottelo.constants.repos import FAKE_1_YUM_REPO
+from robottelo.decorators.func_shared.shared import shared
+
+logger = logging.getLogger('robottelo')
+
+# the shared provisioning contents by server hostname and repository url
+_PROVISIONING_CONTENTS = {}
+
+# the timeout of the provisioning content repository sync and content view
+# publishing and promotion tasks
+PROVISIONING_CONTENT_TASK_TIMEOUT = 3600
 
 
 def call_entity_method_with_timeout(entity_callable, timeout=300, **kwargs):
@@ -67,7 +85,7 @@ def enable_rhrepo_and_fetchid(basearch, org_id, product, repo, reposet, releasev
     return result[0].id
 
 
-def promote(content_view_version, environment_id, force=False):
+def promote(content_view_version, environment_id, force=False, timeout=None):
     """Call ``content_view_version.promote(…)``.
 
     :param content_view_version: A ``nailgun.entities.ContentViewVersion``
@@ -76,11 +94,15 @@ def promote(content_view_version, environment_id, force=False):
     :param force: Whether to force the promotion or not. Only needed if
         promoting to a lifecycle environment that is not the next in order
         of sequence.
+    :param timeout: The time to wait for the promotion task to finish, the
+        nailgun default task timeout when not supplied.
     :returns: Whatever ``nailgun.entities.ContentViewVersion.promote`` returns.
 
     """
     data = {'environment_ids': [environment_id], 'force': True if force else False}
-    return content_view_version.promote(data=data)
+    if timeout is None:
+        return content_view_version.promote(data=data)
+    return content_view_version.promote(data=data, timeout=timeout)
 
 
 def upload_manifest(organization_id, manifest):
@@ -265,70 +287,93 @@ def one_to_many_names(name):
     return {name, name + '_ids', Inflector().pluralize(name)}
 
 
-def configure_provisioning(org=None, loc=None, compute=False, os=None):
-    """Create and configure org, loc, product, repo, cv, env. Update proxy,
-    domain, subnet, compute resource, provision templates and medium with
-    previously created entities and create a hostgroup using all mentioned
-    entities.
+def _timed_step(step_name, function, *args, **kwargs):
+    """Call function and log the time it took"""
+    start_time = time.time()
+    try:
+        return function(*args, **kwargs)
+    finally:
+        logger.info(
+            f'configure_provisioning: step "{step_name}" took {time.time() - start_time:.1f}s'
+        )
 
-    :param str org: Default Organization that should be used in both host
-        discovering and host provisioning procedures
-    :param str loc: Default Location that should be used in both host
-        discovering and host provisioning procedures
-    :param bool compute: If False creates a default Libvirt compute resource
-    :param str os: Specify the os to be used while provisioning and to
-        associate related entities to the specified os.
-    :return: List of created entities that can be re-used further in
-        provisioning or validation procedure (e.g. hostgroup or domain)
+
+def _create_provisioning_content(org, repo_url):
+    """Create a lifecycle environment, a repository synced with immediate
+    download policy and a content view with the repository, published and
+    promoted to the lifecycle environment.
+
+    :return: a dict of the created entities ids and of the repository name
     """
-    # Create new organization and location in case they were not passed
-    if org is None:
-        org = entities.Organization().create()
-    if loc is None:
-        loc = entities.Location(organization=[org]).create()
-    if settings.rhel7_os is None:
-        raise ImproperlyConfigured('settings file is not configured for rhel os')
-    # Create a new Life-Cycle environment
     lc_env = entities.LifecycleEnvironment(organization=org).create()
-    # Create a Product, Repository for custom RHEL6 contents
     product = entities.Product(organization=org).create()
-    repo = entities.Repository(
-        product=product, url=settings.rhel7_os, download_policy='immediate'
-    ).create()
+    repo = entities.Repository(product=product, url=repo_url, download_policy='immediate').create()
+    # Increased timeout value for repo sync and CV publishing and promotion,
+    # passed per call as the other configure_provisioning steps run
+    # concurrently with the nailgun default task timeout
+    repo.sync(timeout=PROVISIONING_CONTENT_TASK_TIMEOUT)
+    # Create, Publish and promote CV
+    content_view = entities.ContentView(organization=org).create()
+    content_view.repository = [repo]
+    content_view = content_view.update(['repository'])
+    content_view.publish(timeout=PROVISIONING_CONTENT_TASK_TIMEOUT)
+    content_view = content_view.read()
+    promote(content_view.version[0], lc_env.id, timeout=PROVISIONING_CONTENT_TASK_TIMEOUT)
+    return {
+        'lifecycle_environment_id': lc_env.id,
+        'repository_name': repo.name,
+        'content_view_id': content_view.id,
+    }
 
-    # Increased timeout value for repo sync and CV publishing and promotion
-    try:
-        old_task_timeout = entity_mixins.TASK_TIMEOUT
-        entity_mixins.TASK_TIMEOUT = 3600
-        repo.sync()
-        # Create, Publish and promote CV
-        content_view = entities.ContentView(organization=org).create()
-        content_view.repository = [repo]
-        content_view = content_view.update(['repository'])
-        content_view.publish()
-        content_view = content_view.read()
-        promote(content_view.version[0], lc_env.id)
-    finally:
-        entity_mixins.TASK_TIMEOUT = old_task_timeout
-    # Search for existing organization puppet environment, otherwise create a
-    # new one, associate organization and location where it is appropriate.
+
+@shared(function_kw=['hostname', 'repo_url'])
+def _create_shared_provisioning_content(hostname=None, repo_url=None):
+    """Create an organization with the provisioning content, shared by the
+    configure_provisioning calls with reuse_content
+    """
+    org = entities.Organization().create()
+    content = _create_provisioning_content(org, repo_url)
+    content['organization_id'] = org.id
+    return content
+
+
+def _get_shared_provisioning_content(repo_url):
+    """Return the shared provisioning organization and content ids"""
+    cache_key = (settings.server.hostname, repo_url)
+    if cache_key not in _PROVISIONING_CONTENTS:
+        _PROVISIONING_CONTENTS[cache_key] = _create_shared_provisioning_content(
+            hostname=settings.server.hostname, repo_url=repo_url
+        )
+    content = dict(_PROVISIONING_CONTENTS[cache_key])
+    return entities.Organization(id=content.pop('organization_id')).read(), content
+
+
+def _configure_provisioning_environment(org, loc):
+    """Search for existing organization puppet environment, otherwise create a
+    new one, associate organization and location where it is appropriate.
+    """
     environments = entities.Environment().search(query=dict(search=f'organization_id={org.id}'))
     if len(environments) > 0:
         environment = environments[0].read()
         environment.location.append(loc)
-        environment = environment.update(['location'])
-    else:
-        environment = entities.Environment(organization=[org], location=[loc]).create()
+        return environment.update(['location'])
+    return entities.Environment(organization=[org], location=[loc]).create()
+
 
-    # Search for SmartProxy, and associate location
+def _configure_provisioning_proxy(org, loc):
+    """Search for SmartProxy, and associate organization and location"""
     proxy = entities.SmartProxy().search(query={'search': f'name={settings.server.hostname}'})
     proxy = proxy[0].read()
     proxy.location.append(loc)
     proxy.organization.append(org)
-    proxy = proxy.update(['location', 'organization'])
+    return proxy.update(['location', 'organization'])
 
-    # Search for existing domain or create new otherwise. Associate org,
-    # location and dns to it
+
+def _configure_provisioning_domain_subnet(org, loc, proxy_future):
+    """Search for existing domain and subnet or create new ones otherwise.
+    Associate org, location and the proxy to them.
+    """
+    proxy = proxy_future.result()
     _, _, domain = settings.server.hostname.partition('.')
     domain = entities.Domain().search(query={'search': f'name="{domain}"'})
     if len(domain) == 1:
@@ -372,48 +417,53 @@ def configure_provisioning(org=None, loc=None, compute=False, os=None):
             discovery=proxy,
             ipam='DHCP',
         ).create()
+    return domain, subnet
 
-    # Search if Libvirt compute-resource already exists
-    # If so, just update its relevant fields otherwise,
-    # Create new compute-resource with 'libvirt' provider.
-    # compute boolean is added to not block existing test's that depend on
-    # Libvirt resource and use this same functionality to all CR's.
-    if compute is False:
-        resource_url = 'qemu+ssh://root@{}/system'.format(
-            settings.compute_resources.libvirt_hostname
-        )
-        comp_res = [
-            res
-            for res in entities.LibvirtComputeResource().search()
-            if res.provider == 'Libvirt' and res.url == resource_url
-        ]
-        if len(comp_res) > 0:
-            computeresource = entities.LibvirtComputeResource(id=comp_res[0].id).read()
-            computeresource.location.append(loc)
-            computeresource.organization.append(org)
-            computeresource.update(['location', 'organization'])
-        else:
-            # Create Libvirt compute-resource
-            entities.LibvirtComputeResource(
-                provider='libvirt',
-                url=resource_url,
-                set_console_password=False,
-                display_type='VNC',
-                location=[loc.id],
-                organization=[org.id],
-            ).create()
-
-    # Get the Partition table ID
+
+def _configure_provisioning_compute_resource(org, loc):
+    """Search if Libvirt compute-resource already exists. If so, just update
+    its relevant fields otherwise, create new compute-resource with 'libvirt'
+    provider.
+    """
+    resource_url = 'qemu+ssh://root@{}/system'.format(settings.compute_resources.libvirt_hostname)
+    comp_res = [
+        res
+        for res in entities.LibvirtComputeResource().search()
+        if res.provider == 'Libvirt' and res.url == resource_url
+    ]
+    if len(comp_res) > 0:
+        computeresource = entities.LibvirtComputeResource(id=comp_res[0].id).read()
+        computeresource.location.append(loc)
+        computeresource.organization.append(org)
+        computeresource.update(['location', 'organization'])
+    else:
+        # Create Libvirt compute-resource
+        entities.LibvirtComputeResource(
+            provider='libvirt',
+            url=resource_url,
+            set_console_password=False,
+            display_type='VNC',
+            location=[loc.id],
+            organization=[org.id],
+        ).create()
+
+
+def _configure_provisioning_ptable(org, loc):
+    """Get the default partition table and associate org and location"""
     ptable = (
         entities.PartitionTable().search(query={'search': f'name="{DEFAULT_PTABLE}"'})[0].read()
     )
     ptable.location.append(loc)
     ptable.organization.append(org)
-    ptable = ptable.update(['location', 'organization'])
+    return ptable.update(['location', 'organization'])
+
 
-    # Get the OS ID
+def _get_provisioning_os(os=None):
+    """Get the operating system, the first RHEL 6 or 7 by default, or the one
+    with os version string like 'RHEL 7.9'
+    """
     if os is None:
-        os = (
+        return (
             entities.OperatingSystem()
             .search(
                 query={
@@ -424,64 +474,157 @@ def configure_provisioning(org=None, loc=None, compute=False, os=None):
             )[0]
             .read()
         )
-    else:
-        os_ver = os.split(' ')[1].split('.')
-        os = (
-            entities.OperatingSystem()
-            .search(
-                query={
-                    'search': f'family="Redhat" AND major="{os_ver[0]}" AND minor="{os_ver[1]}")'
-                }
-            )[0]
-            .read()
-        )
-
-    # Get the Provisioning template_ID and update with OS, Org, Location
-    provisioning_template = entities.ProvisioningTemplate().search(
-        query={'search': f'name="{DEFAULT_TEMPLATE}"'}
-    )
-    provisioning_template = provisioning_template[0].read()
-    provisioning_template.operatingsystem.append(os)
-    provisioning_template.organization.append(org)
-    provisioning_template.location.append(loc)
-    provisioning_template = provisioning_template.update(
-        ['location', 'operatingsystem', 'organization']
-    )
-
-    # Get the PXE template ID and update with OS, Org, location
-    pxe_template = entities.ProvisioningTemplate().search(
-        query={'search': f'name="{DEFAULT_PXE_TEMPLATE}"'}
-    )
-    pxe_template = pxe_template[0].read()
-    pxe_template.operatingsystem.append(os)
-    pxe_template.organization.append(org)
-    pxe_template.location.append(loc)
-    pxe_template = pxe_template.update(['location', 'operatingsystem', 'organization'])
-
-    # Get the arch ID
-    arch = (
-        entities.Architecture()
-        .search(query={'search': f'name="{DEFAULT_ARCHITECTURE}"'})[0]
+    os_ver = os.split(' ')[1].split('.')
+    return (
+        entities.OperatingSystem()
+        .search(
+            query={'search': f'family="Redhat" AND major="{os_ver[0]}" AND minor="{os_ver[1]}")'}
+        )[0]
         .read()
     )
 
-    # Update the OS to associate arch, ptable, templates
-    os.architecture.append(arch)
-    os.ptable.append(ptable)
-    os.provisioning_template.append(provisioning_template)
-    os.provisioning_template.append(pxe_template)
-    os = os.update(['architecture', 'provisioning_template', 'ptable'])
+
+def _configure_provisioning_template(template_name, org, loc, os):
+    """Get the provisioning template and associate os, org and location"""
+    template = entities.ProvisioningTemplate().search(query={'search': f'name="{template_name}"'})
+    template = template[0].read()
+    template.operatingsystem.append(os)
+    template.organization.append(org)
+    template.location.append(loc)
+    return template.update(['location', 'operatingsystem', 'organization'])
+
+
+def configure_provisioning(org=None, loc=None, compute=False, os=None, reuse_content=False):
+    """Create and configure org, loc, product, repo, cv, env. Update proxy,
+    domain, subnet, compute resource, provision templates and medium with
+    previously created entities and create a hostgroup using all mentioned
+    entities.
+
+    :param str org: Default Organization that should be used in both host
+        discovering and host provisioning procedures
+    :param str loc: Default Location that should be used in both host
+        discovering and host provisioning procedures
+    :param bool compute: If False creates a default Libvirt compute resource
+    :param str os: Specify the os to be used while provisioning and to
+        associate related entities to the specified os.
+    :param bool reuse_content: when org is not supplied, reuse the
+        organization and its synced repository, content view and lifecycle
+        environment created once per Satellite instead of creating new ones.
+    :return: List of created entities that can be re-used further in
+        provisioning or validation procedure (e.g. hostgroup or domain)
+
+    Note: the repository sync and the content view publishing run while the
+        independent entities associations are updated concurrently, the time
+        of each step is logged.
+    """
+    if settings.rhel7_os is None:
+        raise ImproperlyConfigured('settings file is not configured for rhel os')
+    start_time = time.time()
+    executor = ThreadPoolExecutor(max_workers=8)
+    try:
+        if reuse_content and org is None:
+            org, content = _timed_step(
+                'content', _get_shared_provisioning_content, settings.rhel7_os
+            )
+            content_future = None
+        else:
+            # Create new organization in case it was not passed
+            if org is None:
+                org = entities.Organization().create()
+            content_future = executor.submit(
+                contextvars.copy_context().run,
+                _timed_step,
+                'content',
+                _create_provisioning_content,
+                org,
+                settings.rhel7_os,
+            )
+        # Create new location in case it was not passed
+        if loc is None:
+            loc = entities.Location(organization=[org]).create()
+
+        def submit(step_name, function, *args):
+            # the steps see the caller resources tracking context
+            return executor.submit(
+                contextvars.copy_context().run, _timed_step, step_name, function, *args
+            )
+
+        environment_future = submit(
+            'puppet environment', _configure_provisioning_environment, org, loc
+        )
+        proxy_future = submit('smart proxy', _configure_provisioning_proxy, org, loc)
+        ptable_future = submit('partition table', _configure_provisioning_ptable, org, loc)
+        os_future = submit('operating system', _get_provisioning_os, os)
+        arch_future = submit(
+            'architecture',
+            lambda: entities.Architecture()
+            .search(query={'search': f'name="{DEFAULT_ARCHITECTURE}"'})[0]
+            .read(),
+        )
+        if compute is False:
+            compute_resource_future = submit(
+                'compute resource', _configure_provisioning_compute_resource, org, loc
+            )
+        else:
+            compute_resource_future = None
+        domain_subnet_future = submit(
+            'domain and subnet',
+            _configure_provisioning_domain_subnet,
+            org,
+            loc,
+            proxy_future,
+        )
+        os = os_future.result()
+        provisioning_template_future = submit(
+            'provisioning template',
+            _configure_provisioning_template,
+            DEFAULT_TEMPLATE,
+            org,
+            loc,
+            os,
+        )
+        pxe_template_future = submit(
+            'pxe template', _configure_provisioning_template, DEFAULT_PXE_TEMPLATE, org, loc, os
+        )
+        arch = arch_future.result()
+        ptable = ptable_future.result()
+        provisioning_template = provisioning_template_future.result()
+        pxe_template = pxe_template_future.result()
+
+        # Update the OS to associate arch, ptable, templates
+        os.architecture.append(arch)
+        os.ptable.append(ptable)
+        os.provisioning_template.append(provisioning_template)
+        os.provisioning_template.append(pxe_template)
+        os = _timed_step(
+            'operating system update',
+            os.update,
+            ['architecture', 'provisioning_template', 'ptable'],
+        )
+        environment = environment_future.result()
+        proxy = proxy_future.result()
+        domain, subnet = domain_subnet_future.result()
+        if compute_resource_future is not None:
+            compute_resource_future.result()
+        if content_future is not None:
+            content = content_future.result()
+    finally:
+        executor.shutdown(wait=True)
     # kickstart_repository is the content view and lce bind repo
     kickstart_repository = entities.Repository().search(
-        query=dict(content_view_id=content_view.id, environment_id=lc_env.id, name=repo.name)
+        query=dict(
+            content_view_id=content['content_view_id'],
+            environment_id=content['lifecycle_environment_id'],
+            name=content['repository_name'],
+        )
     )[0]
     # Create Hostgroup
     host_group = entities.HostGroup(
         architecture=arch,
         domain=domain.id,
         subnet=subnet.id,
-        lifecycle_environment=lc_env.id,
-        content_view=content_view.id,
+        lifecycle_environment=content['lifecycle_environment_id'],
+        content_view=content['content_view_id'],
         location=[loc.id],
         environment=environment.id,
         puppet_proxy=proxy,
@@ -493,6 +636,7 @@ def configure_provisioning(org=None, loc=None, compute=False, os=None):
         organization=[org.id],
         ptable=ptable.id,
     ).create()
+    logger.info(f'configure_provisioning: took {time.time() - start_time:.1f}s')
 
     return {
         'host_group': host_group.name,
@@ -504,7 +648,28 @@ def configure_provisioning(org=None, loc=None, compute=False, os=None):
     }
 
 
-def create_role_permissions(role, permissions_types_names, search=None):  # pragma: no cover
+def _get_filters_permissions(catalog, permissions_types_names):
+    """Return the permissions entities of each filter of permissions_types_names"""
+    filters_permissions = []
+    for resource_type, permissions_name in permissions_types_names.items():
+        if resource_type is None:
+            permissions_entities = [catalog.get(name) for name in permissions_name]
+        else:
+            if not permissions_name:
+                raise ValueError(
+                    'resource type "{}" empty. You must select at'
+                    ' least one permission'.format(resource_type)
+                )
+            permissions_entities = catalog.get_resource_type_permissions(
+                resource_type, names=permissions_name
+            )
+        filters_permissions.append(permissions_entities)
+    return filters_permissions
+
+
+def create_role_permissions(
+    role, permissions_types_names, search=None, parallel=False
+):  # pragma: no cover
     """Create role permissions found in dict permissions_types_names.
 
     :param role: nailgun.entities.Role
@@ -512,6 +677,10 @@ def create_role_permissions(role, permissions_types_names, search=None):  # prag
         and permission names to add to the role.
     :param search: string that contains search criteria that should be applied
         to the filter
+    :param parallel: whether to create the role filters in parallel
+
+    Note: the permissions are looked up in the server permission catalog,
+        loaded once per session.
 
           example usage::
 
@@ -532,53 +701,31 @@ def create_role_permissions(role, permissions_types_names, search=None):  # prag
                'name = {0}'.format(lce.name)
            )
     """
-    for resource_type, permissions_name in permissions_types_names.items():
-        if resource_type is None:
-            permissions_entities = []
-            for name in permissions_name:
-                result = entities.Permission().search(query={'search': f'name="{name}"'})
-                if not result:
-                    raise entities.APIResponseError(f'permission "{name}" not found')
-                if len(result) > 1:
-                    raise entities.APIResponseError(
-                        f'found more than one entity for permission "{name}"'
-                    )
-                entity_permission = result[0]
-                if entity_permission.name != name:
-                    raise entities.APIResponseError(
-                        'the returned permission is different from the'
-                        ' requested one "{} != {}"'.format(entity_permission.name, name)
-                    )
-                permissions_entities.append(entity_permission)
-        else:
-            if not permissions_name:
-                raise ValueError(
-                    'resource type "{}" empty. You must select at'
-                    ' least one permission'.format(resource_type)
-                )
+    try:
+        filters_permissions = _get_filters_permissions(
+            get_permission_catalog(), permissions_types_names
+        )
+    except entities.APIResponseError:
+        # the server permissions may have changed since the catalog was loaded
+        filters_permissions = _get_filters_permissions(
+            get_permission_catalog(refresh=True), permissions_types_names
+        )
 
-            resource_type_permissions_entities = entities.Permission().search(
-                query={'per_page': 350, 'search': f'resource_type="{resource_type}"'}
-            )
-            if not resource_type_permissions_entities:
-                raise entities.APIResponseError(
-                    f'resource type "{resource_type}" permissions not found'
-                )
+    def create_filter(permissions_entities):
+        return entities.Filter(permission=permissions_entities, role=role, search=search).create()
 
-            permissions_entities = [
-                entity
-                for entity in resource_type_permissions_entities
-                if entity.name in permissions_name
+    if parallel and len(filters_permissions) > 1:
+        with ThreadPoolExecutor(max_workers=len(filters_permissions)) as executor:
+            # the filters creations see the caller resources tracking context
+            futures = [
+                executor.submit(contextvars.copy_context().run, create_filter, permissions)
+                for permissions in filters_permissions
             ]
-            # ensure that all the requested permissions entities where
-            # retrieved
-            permissions_entities_names = {entity.name for entity in permissions_entities}
-            not_found_names = set(permissions_name).difference(permissions_entities_names)
-            if not_found_names:
-                raise entities.APIResponseError(
-                    f'permissions names entities not found "{not_found_names}"'
-                )
-        entities.Filter(permission=permissions_entities, role=role, search=search).create()
+            for future in futures:
+                future.result()
+    else:
+        for permissions_entities in filters_permissions:
+            create_filter(permissions_entities)
 
 
 def wait_for_tasks(search_query, search_rate=1, max_tries=10, poll_rate=None, poll_timeout=None):
@@ -595,12 +742,13 @@ def wait_for_tasks(search_query, search_rate=1, max_tries=10, poll_rate=None, po
             Parameter for ``nailgun.entities.ForemanTask.poll()`` method.
     :return: List of ``nailgun.entities.ForemanTasks`` entities.
     :raises: ``AssertionError``. If not tasks were found until timeout.
+
+    Note: the found tasks are polled together, with one bulk search per poll.
     """
     for _ in range(max_tries):
         tasks = entities.ForemanTask().search(query={'search': search_query})
         if len(tasks) > 0:
-            for task in tasks:
-                task.poll(poll_rate=poll_rate, timeout=poll_timeout)
+            tasks = wait_for_tasks_finished(tasks, poll_rate=poll_rate, timeout=poll_timeout)
             break
         else:
             time.sleep(search_rate)
@@ -609,62 +757,90 @@ def wait_for_tasks(search_query, search_rate=1, max_tries=10, poll_rate=None, po
     return tasks
 
 
-def wait_for_syncplan_tasks(repo_backend_id=None, timeout=10, repo_name=None):
+@functools.lru_cache(maxsize=None)
+def _get_pulp_password(hostname):
+    """Fetch the Pulp admin password of the server, the result is cached per
+    server hostname
+    """
+    return ssh.command(
+        'grep "^default_password" /etc/pulp/server.conf | awk \'{print $2}\'', hostname=hostname
+    ).stdout[0]
+
+
+def wait_for_syncplan_tasks(
+    repo_backend_id=None, timeout=10, repo_name=None, poll_rate=1, max_poll_rate=10
+):
     """Search the pulp tasks and identify repositories sync tasks with
     specified name or backend_identifier
 
     :param repo_backend_id: The Backend ID for the repository to identify the
-        repo in Pulp environment
+        repo in Pulp environment, or a list of Backend IDs to wait for several
+        repositories sync tasks with a single search per poll
     :param timeout: Value to decided how long to check for the Sync task
-    :param repo_name: If repo_backend_id can not be passed, pass the repo_name
+    :param repo_name: If repo_backend_id can not be passed, pass the repo_name,
+        or a list of repositories names
+    :param poll_rate: The initial delay in seconds between the searches
+    :param max_poll_rate: The maximal delay in seconds between the searches, the
+        delay is doubled after each search until max_poll_rate
     """
     if repo_name:
-        repo_backend_id = (
+        repo_names = [repo_name] if isinstance(repo_name, str) else repo_name
+        repo_backend_id = [
             entities.Repository()
-            .search(query={'search': f'name="{repo_name}"', 'per_page': 1000})[0]
+            .search(query={'search': f'name="{name}"', 'per_page': 1000})[0]
             .backend_identifier
-        )
-    # Fetch the Pulp password
-    pulp_pass = ssh.command(
-        'grep "^default_password" /etc/pulp/server.conf | awk \'{print $2}\''
-    ).stdout[0]
+            for name in repo_names
+        ]
+    backend_ids = [repo_backend_id] if isinstance(repo_backend_id, str) else repo_backend_id
+    pending_tags = {f'pulp:repository:{backend_id}': backend_id for backend_id in backend_ids}
+    pulp_pass = _get_pulp_password(settings.server.hostname)
     # Set the Timeout value
     timeup = time.time() + int(timeout) * 60
-    # Search Filter to filter out the task based on backend-id and sync action
-    filtered_req = {
-        'criteria': {
-            'filters': {
-                'tags': {'$in': [f"pulp:repository:{repo_backend_id}"]},
-                'task_type': {'$in': ["pulp.server.managers.repo.sync.sync"]},
-            }
-        }
-    }
+    delay = poll_rate
     while True:
         if time.time() > timeup:
-            raise entities.APIResponseError(f'Pulp task with repo_id {repo_backend_id} not found')
-        # Send request to pulp API to get the task info
-        req = request(
-            'POST',
+            raise entities.APIResponseError(
+                f'Pulp task with repo_id {", ".join(pending_tags.values())} not found'
+            )
+        # Search Filter to filter out the task based on backend-id and sync action
+        filtered_req = {
+            'criteria': {
+                'filters': {
+                    'tags': {'$in': list(pending_tags)},
+                    'task_type': {'$in': ["pulp.server.managers.repo.sync.sync"]},
+                }
+            }
+        }
+        # Send request to pulp API to get the tasks info, the search does not
+        # change anything and is retried on 5xx
+        req = http_sessions.post(
             f'{settings.server.get_url()}/pulp/api/v2/tasks/search/',
             verify=False,
-            auth=('admin', f'{pulp_pass}'),
-            headers={'content-type': 'application/json'},
-            data=filtered_req,
+            auth=('admin', pulp_pass),
+            json=filtered_req,
+            retry_statuses=True,
         )
         # Check Status code of response
         if req.status_code != 200:
-            raise entities.APIResponseError(f'Pulp task with repo_id {repo_backend_id} not found')
-        # Check content of response
-        # It is '[]' string for empty content when backend_identifier is wrong
-        if len(req.content) > 2:
-            if req.json()[0].get('state') in ['finished']:
-                return True
-            elif req.json()[0].get('error'):
+            raise entities.APIResponseError(
+                f'Pulp task with repo_id {", ".join(pending_tags.values())} not found'
+            )
+        # The response is an empty list when backend_identifier is wrong
+        for task in req.json():
+            tag = next((tag for tag in task.get('tags', []) if tag in pending_tags), None)
+            if tag is None:
+                continue
+            if task.get('state') in ['finished']:
+                del pending_tags[tag]
+            elif task.get('error'):
                 raise AssertionError(
-                    f"Pulp task with repo_id {repo_backend_id} error or not found: "
-                    f"'{req.json().get('error')}'"
+                    f"Pulp task with repo_id {pending_tags[tag]} error or not found: "
+                    f"'{task.get('error')}'"
                 )
-        time.sleep(2)
+        if not pending_tags:
+            return True
+        time.sleep(min(delay, max(0, timeup - time.time())))
+        delay = min(delay * 2, max_poll_rate)
 
 
 def wait_for_errata_applicability_task(
@@ -697,21 +873,20 @@ def wait_for_errata_applicability_task(
             % max_age
         )
         tasks = entities.ForemanTask().search(query={'search': search_query})
-        tasks_finished = 0
-        for task in tasks:
+        host_tasks = [
+            task
+            for task in tasks
             if (
                 task.label == 'Actions::Katello::Host::GenerateApplicability'
                 and host_id in task.input['host_ids']
-            ):
-                task.poll(poll_rate=poll_rate, timeout=poll_timeout)
-                tasks_finished += 1
-            elif (
+            )
+            or (
                 task.label == 'Actions::Katello::Host::UploadPackageProfile'
                 and host_id == task.input['host']['id']
-            ):
-                task.poll(poll_rate=poll_rate, timeout=poll_timeout)
-                tasks_finished += 1
-        if tasks_finished > 0:
+            )
+        ]
+        if host_tasks:
+            wait_for_tasks_finished(host_tasks, poll_rate=poll_rate, timeout=poll_timeout)
             break
         time.sleep(search_rate)
     else:
@@ -720,6 +895,30 @@ def wait_for_errata_applicability_task(
         )
 
 
+def wait_for_errata_applicability_tasks(host_ids, from_when, search_rate=1, timeout=300):
+    """Wait for the generate applicability tasks of several hosts to finish
+
+    The tasks are searched once per tick for all the hosts, use it instead of
+    calling ``wait_for_errata_applicability_task`` for each host.
+
+    :param host_ids: Content hosts IDs where we are regenerating applicability.
+    :param int from_when: Timestamp (in UTC) to limit number of returned tasks to investigate.
+    :param int search_rate: Delay between searches.
+    :param int timeout: Maximum number of seconds to wait for all the hosts.
+    :return: dict of the seconds waited by host ID.
+    :raises: ``nailgun.entity_mixins.TaskTimedOutError``. If some hosts tasks
+        were not found or did not finish until timeout.
+    """
+    assert all(isinstance(host_id, int) for host_id in host_ids), 'Param host_ids have to be int'
+    assert isinstance(from_when, int), 'Param from_when have to be int'
+    assert from_when <= int(time.time()), 'Param from_when have to be timestamp in the past'
+    tracker = ApplicabilityTracker(host_ids, from_when, search_rate=search_rate, timeout=timeout)
+    durations = tracker.wait()
+    for host_id, duration in sorted(durations.items()):
+        logger.debug(f'applicability of host {host_id} regenerated in {duration:.1f}s')
+    return durations
+
+
 def create_discovered_host(name=None, ip_address=None, mac_address=None, options=None):
     """Creates a discovered host.
 
@@ -952,7 +1151,10 @@ def set_hammer_api_timeout(timeout=-1, reverse=False):
 
 
 def update_rhsso_settings_in_satellite(revert=False):
-    """Update or Revert the RH-SSO settings in satellite"""
+    """Update or Revert the RH-SSO settings in satellite
+
+    Note: only the settings that differ from the desired values are updated.
+    """
     rhhso_settings = {
         'authorize_login_delegation': True,
         'authorize_login_delegation_auth_source_user_autocreate': 'External',
@@ -964,13 +1166,6 @@ def update_rhsso_settings_in_satellite(revert=False):
         f'/{settings.rhsso.realm}/protocol/openid-connect/certs',
     }
     if revert:
-        setting_entity = entities.Setting().search(
-            query={'search': 'name=authorize_login_delegation'}
-        )[0]
-        setting_entity.value = False
-        setting_entity.update({'value'})
+        apply_settings({'authorize_login_delegation': False})
     else:
-        for setting_name, setting_value in rhhso_settings.items():
-            setting_entity = entities.Setting().search(query={'search': f'name={setting_name}'})[0]
-            setting_entity.value = setting_value
-            setting_entity.update({'value'})
+        apply_settings(rhhso_settings)
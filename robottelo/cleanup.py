@@ -1,8 +1,32 @@
-"""Cleanup module for different entities"""
+"""Cleanup module for different entities
+
+Besides the single entity cleanup helpers, the module provides a registry of
+the resources created during a scope (module or session), that deletes them
+in dependency order at the scope end. When a scope is active, the entities
+created with the CLI factory or with nailgun are tracked automatically.
+
+Usage::
+
+    from robottelo.cleanup import RESOURCES
+
+    RESOURCES.push_scope('module')
+    # ... create entities
+    RESOURCES.teardown(RESOURCES.pop_scope())
+
+The untracked and attributed scope states are context variables, the threads
+of an executor see them when the work is submitted with
+``contextvars.copy_context().run``.
+"""
+import contextlib
+import contextvars
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from nailgun import entities
+from nailgun import signals
 
+from robottelo.api.satellite_settings import apply_settings
 from robottelo.cli.proxy import Proxy
 from robottelo.vm import VirtualMachine
 
@@ -36,9 +60,7 @@ def host_cleanup(host_id=None):
 
 def setting_cleanup(setting_name=None, setting_value=None):
     """Put necessary value for a specified setting"""
-    setting_entity = entities.Setting().search(query={'search': f'name={setting_name}'})[0]
-    setting_entity.value = setting_value
-    setting_entity.update({'value'})
+    apply_settings({setting_name: setting_value})
 
 
 def vm_cleanup(vm):
@@ -65,3 +87,186 @@ def cleanup_of_provisioned_server(hostname=None, provisioning_server=None, distr
         )
         vm._created = True
         vm.destroy()
+
+
+# the resources kinds in teardown order, the resources of a rank are deleted in
+# parallel, after the resources of the previous ranks
+TEARDOWN_ORDER = (
+    ('Host', 'DiscoveredHost'),
+    ('ActivationKey', 'HostCollection', 'JobInvocation', 'VirtWhoConfig'),
+    ('ContentViewFilterRule',),
+    ('ContentViewFilter',),
+    ('ContentView',),
+    ('LifecycleEnvironment', 'SyncPlan'),
+    ('Repository',),
+    ('Product', 'GPGKey', 'ContentCredential'),
+    ('HostGroup',),
+    # the kinds not listed are deleted here
+    None,
+    ('User', 'UserGroup'),
+    ('Role',),
+    ('Location',),
+    ('Organization', 'Org'),
+)
+TEARDOWN_MAX_WORKERS = 8
+
+_KIND_RANKS = {kind: rank for rank, kinds in enumerate(TEARDOWN_ORDER) if kinds for kind in kinds}
+_DEFAULT_KIND_RANK = TEARDOWN_ORDER.index(None)
+
+
+class TrackedResource:
+    """A created resource and the callable that deletes it"""
+
+    def __init__(self, kind, resource_id, delete):
+        self.kind = kind
+        self.resource_id = resource_id
+        self.delete = delete
+
+    @property
+    def rank(self):
+        return _KIND_RANKS.get(self.kind, _DEFAULT_KIND_RANK)
+
+    def __repr__(self):
+        return f'<TrackedResource {self.kind} id={self.resource_id}>'
+
+
+class ResourceRegistry:
+    """Record the resources created in the active scopes and delete them in
+    dependency order
+    """
+
+    def __init__(self, max_workers=TEARDOWN_MAX_WORKERS):
+        self._max_workers = max_workers
+        self._scopes = []
+        self._lock = threading.Lock()
+        self._untracked = contextvars.ContextVar(f'untracked_{id(self)}', default=False)
+        self._attributed_scope = contextvars.ContextVar(
+            f'attributed_scope_{id(self)}', default=None
+        )
+
+    @property
+    def active(self):
+        return bool(self._scopes)
+
+    def push_scope(self, name):
+        """Start a new scope, the resources are tracked in the last scope"""
+        with self._lock:
+            self._scopes.append((name, {}))
+
+    def pop_scope(self):
+        """End the last scope and return its resources"""
+        with self._lock:
+            _, resources = self._scopes.pop()
+        return list(resources.values())
+
+    @contextlib.contextmanager
+    def untracked(self):
+        """Do not track the resources created in the current context"""
+        token = self._untracked.set(True)
+        try:
+            yield
+        finally:
+            self._untracked.reset(token)
+
+    @contextlib.contextmanager
+    def attributed_to(self, name):
+        """Track the resources created in the current context in the last
+        scope with name, ex: the resources of a session fixture set up during
+        a module, the resources are not tracked if there is no such scope
+        """
+        token = self._attributed_scope.set(name)
+        try:
+            yield
+        finally:
+            self._attributed_scope.reset(token)
+
+    def track(self, kind, resource_id, delete):
+        """Record a resource in the last scope, or in the attributed scope, if
+        any
+
+        :param str kind: the resource kind, ex: the entity class name
+        :param resource_id: the resource id
+        :param callable delete: a callable without arguments that delete the
+            resource
+        """
+        if resource_id is None or self._untracked.get():
+            return
+        attributed_scope = self._attributed_scope.get()
+        with self._lock:
+            for name, resources in reversed(self._scopes):
+                if attributed_scope is None or name == attributed_scope:
+                    resources[(kind, resource_id)] = TrackedResource(kind, resource_id, delete)
+                    return
+
+    def untrack(self, kind, resource_id):
+        """Forget a resource already deleted"""
+        with self._lock:
+            for _, resources in self._scopes:
+                resources.pop((kind, resource_id), None)
+
+    @staticmethod
+    def _delete(resource):
+        try:
+            resource.delete()
+        except Exception as err:
+            return err
+        return None
+
+    def teardown(self, resources):
+        """Delete the resources in dependency order, the resources of the same
+        rank in parallel.
+
+        The resources of a rank that failed to be deleted are retried once
+        sequentially, in reverse creation order (ex: lifecycle environments
+        paths), then logged and ignored.
+        """
+        ranks = {}
+        for resource in resources:
+            ranks.setdefault(resource.rank, []).append(resource)
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            for rank in sorted(ranks):
+                rank_resources = ranks[rank]
+                errors = list(executor.map(self._delete, rank_resources))
+                failed = [res for res, err in zip(rank_resources, errors) if err is not None]
+                for resource in reversed(failed):
+                    err = self._delete(resource)
+                    if err is not None:
+                        LOGGER.warning(f'resources teardown: failed to delete {resource}: {err}')
+        LOGGER.debug(f'resources teardown: {len(resources)} resources processed')
+
+
+RESOURCES = ResourceRegistry()
+
+
+def _on_nailgun_entity_created(sender, entity=None, **kwargs):
+    if RESOURCES.active and entity is not None:
+        RESOURCES.track(type(entity).__name__, getattr(entity, 'id', None), entity.delete)
+
+
+def _on_nailgun_entity_deleted(sender, signal_emitter=None, **kwargs):
+    if RESOURCES.active and signal_emitter is not None:
+        RESOURCES.untrack(type(signal_emitter).__name__, getattr(signal_emitter, 'id', None))
+
+
+def track_nailgun_entities():
+    """Track the entities created with nailgun in the registry active scope
+
+    Note: nailgun signals require the blinker package.
+    """
+    if not signals.SIGNALS_AVAILABLE:
+        LOGGER.warning('nailgun signals not available, nailgun entities are not tracked')
+        return
+    signals.post_create.connect(_on_nailgun_entity_created, weak=False)
+    signals.post_delete.connect(_on_nailgun_entity_deleted, weak=False)
+
+
+def track_cli_object(cli_object, result, options=None):
+    """Track an entity created with the CLI factory in the registry active
+    scope
+    """
+    if not RESOURCES.active or not isinstance(result, dict) or 'id' not in result:
+        return
+    delete_options = {'id': result['id']}
+    if cli_object.command_requires_org and options and options.get('organization-id'):
+        delete_options['organization-id'] = options['organization-id']
+    RESOURCES.track(cli_object.__name__, result['id'], lambda: cli_object.delete(delete_options))
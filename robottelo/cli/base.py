@@ -212,25 +212,15 @@ class Base:
         return (username, password)
 
     @classmethod
-    def execute(
-        cls,
-        command,
-        user=None,
-        password=None,
-        output_format=None,
-        timeout=None,
-        ignore_stderr=None,
-        return_raw_response=None,
-        connection_timeout=None,
-    ):
-        """Executes the cli ``command`` on the server via ssh"""
+    def _construct_hammer_command(cls, command, user=None, password=None, output_format=None):
+        """Build the full hammer shell command line of the cli ``command``"""
         user, password = cls._get_username_password(user, password)
         time_hammer = False
         if settings.performance:
             time_hammer = settings.performance.time_hammer
 
         # add time to measure hammer performance
-        cmd = 'LANG={} {} hammer -v {} {} {} {}'.format(
+        return 'LANG={} {} hammer -v {} {} {} {}'.format(
             settings.locale,
             'time -p' if time_hammer else '',
             f'-u {user}' if user else "--interactive no",
@@ -238,6 +228,23 @@ class Base:
             f'--output={output_format}' if output_format else "",
             command,
         )
+
+    @classmethod
+    def execute(
+        cls,
+        command,
+        user=None,
+        password=None,
+        output_format=None,
+        timeout=None,
+        ignore_stderr=None,
+        return_raw_response=None,
+        connection_timeout=None,
+    ):
+        """Executes the cli ``command`` on the server via ssh"""
+        cmd = cls._construct_hammer_command(
+            command, user=user, password=password, output_format=output_format
+        )
         response = ssh.command(
             cmd.encode('utf-8'),
             output_format=output_format,
@@ -0,0 +1,183 @@
+"""Batch creation of CLI entities graphs.
+
+Creating a graph of entities with the CLI factory runs one ssh connection and
+hammer process per entity creation plus one for its info. A batch collects
+the entities creations, where an entity option can reference the id of an
+entity created by a previous step, and compiles them into a single shell
+script executed on the server in one round trip.
+
+Usage::
+
+    from robottelo.cli.batch import CLIBatch
+    from robottelo.cli.lifecycleenvironment import LifecycleEnvironment
+    from robottelo.cli.org import Org
+    from robottelo.cli.product import Product
+
+    batch = CLIBatch()
+    org = batch.create(Org, {'name': gen_string('alpha')})
+    lce = batch.create(
+        LifecycleEnvironment,
+        {'name': gen_string('alpha'), 'organization-id': org['id'], 'prior': 'Library'},
+    )
+    product = batch.create(
+        Product, {'name': gen_string('alpha'), 'organization-id': org['id']}
+    )
+    org_info, lce_info, product_info = batch.execute()
+
+Note: only the ``id`` of a previous step can be referenced. The steps are raw
+CLI ``create`` calls, the defaults of the ``robottelo.cli.factory`` make
+functions are not applied, all the options required by the hammer command
+must be supplied.
+"""
+import logging
+
+from robottelo import ssh
+from robottelo.cli import hammer
+from robottelo.cli.base import CLIError
+
+logger = logging.getLogger('robottelo')
+
+_STEP_MARKER = '@@robottelo-batch-step'
+_FAILED_MARKER = '@@robottelo-batch-failed'
+_STEP_ID_COLUMN = 'Id'
+
+
+class CLIBatchError(CLIError):
+    """Indicates that a batch step could not be executed"""
+
+
+class Placeholder:
+    """A reference to the id of the entity created by a batch step"""
+
+    def __init__(self, step_index):
+        self.step_index = step_index
+
+    @property
+    def variable(self):
+        return f'STEP_{self.step_index}_ID'
+
+    def __str__(self):
+        # the options values are double quoted, the variable will be expanded
+        return f'${{{self.variable}}}'
+
+
+class BatchStep:
+    """A batch entity creation step"""
+
+    def __init__(self, index, cli_object, options):
+        self.index = index
+        self.cli_object = cli_object
+        self.options = options
+
+    def __getitem__(self, key):
+        if key != 'id':
+            raise KeyError(f'only the "id" of a batch step can be referenced, not "{key}"')
+        return Placeholder(self.index)
+
+    def _info_options(self):
+        info_options = {'id': self['id']}
+        if self.cli_object.command_requires_org:
+            if 'organization-id' not in self.options:
+                raise CLIError(
+                    f'organization-id option is required for {self.cli_object.__name__}.create'
+                )
+            info_options['organization-id'] = self.options['organization-id']
+        return info_options
+
+    def compile(self):
+        """Return the shell script lines of this step"""
+        cli_object = self.cli_object
+        cli_object.command_sub = 'create'
+        create_command = cli_object._construct_hammer_command(
+            cli_object._construct_command(self.options), output_format='csv'
+        )
+        cli_object.command_sub = 'info'
+        info_command = cli_object._construct_hammer_command(
+            cli_object._construct_command(self._info_options())
+        )
+        # extract the id column of the create csv output
+        extract_id = (
+            "awk -F, 'NR==1{for(i=1;i<=NF;i++) if($i==\"%s\") c=i} NR==2 && c{print $c}'"
+            % _STEP_ID_COLUMN
+        )
+        variable = self['id'].variable
+        return [
+            f'{variable}=$({create_command} | {extract_id})',
+            f'if [ -z "${{{variable}}}" ]; then echo "{_FAILED_MARKER} {self.index}"; exit 1; fi',
+            f'echo "{_STEP_MARKER} {self.index}"',
+            f'{info_command} || {{ echo "{_FAILED_MARKER} {self.index}"; exit 1; }}',
+        ]
+
+
+class CLIBatch:
+    """Collect CLI entities creations and execute them in one round trip"""
+
+    def __init__(self):
+        self._steps = []
+
+    @property
+    def steps(self):
+        return list(self._steps)
+
+    def create(self, cli_object, options=None):
+        """Add an entity creation step
+
+        :param cli_object: A valid CLI object.
+        :param dict options: The create options, values can reference previous
+            steps ids. Passed as is to the hammer create command, without the
+            CLI factory defaults.
+        :return: the batch step, use ``step['id']`` to reference the created
+            entity id in the next steps options.
+        """
+        step = BatchStep(len(self._steps), cli_object, dict(options or {}))
+        self._steps.append(step)
+        return step
+
+    def compile(self):
+        """Return the shell script that create all the batch entities"""
+        lines = ['set -o pipefail']
+        for step in self._steps:
+            lines.extend(step.compile())
+        return '\n'.join(lines)
+
+    def _parse_output(self, stdout):
+        """Split the script output by step and parse each step info"""
+        results = []
+        lines = None
+        for line in stdout:
+            if line.startswith(_STEP_MARKER):
+                if lines is not None:
+                    results.append(hammer.parse_info(lines))
+                lines = []
+            elif line.startswith(_FAILED_MARKER):
+                failed_index = int(line.split()[1])
+                # the failed step info, if any, is not complete
+                if lines is not None and len(results) < failed_index:
+                    results.append(hammer.parse_info(lines))
+                return results
+            elif lines is not None:
+                lines.append(line)
+        if lines is not None:
+            results.append(hammer.parse_info(lines))
+        return results
+
+    def execute(self, timeout=None):
+        """Execute all the batch steps on the server in one ssh round trip
+
+        :param int timeout: Time to wait for the batch to finish.
+        :return: the list of the created entities info, in steps order
+        :raises robottelo.cli.batch.CLIBatchError: if a step failed, the
+            entities created by the previous steps are not removed.
+        """
+        if not self._steps:
+            return []
+        response = ssh.command(self.compile().encode('utf-8'), timeout=timeout)
+        results = self._parse_output(response.stdout)
+        if response.return_code != 0 or len(results) != len(self._steps):
+            failed_step = self._steps[min(len(results), len(self._steps) - 1)]
+            raise CLIBatchError(
+                'Failed to create {} at batch step {}:\n{}'.format(
+                    failed_step.cli_object.__name__, failed_step.index, response.stderr
+                )
+            )
+        return results
@@ -1,12 +1,14 @@
 """
 Factory object creation for all CLI methods
 """
+import contextvars
 import datetime
 import logging
 import os
 import pprint
 import random
 import time
+from concurrent.futures import ThreadPoolExecutor
 from os import chmod
 from tempfile import mkstemp
 from time import sleep
@@ -20,6 +22,7 @@ from fauxfactory import gen_netmask
 from fauxfactory import gen_string
 from fauxfactory import gen_url
 
+from robottelo import entity_pool
 from robottelo import manifests
 from robottelo import ssh
 from robottelo.cli.activationkey import ActivationKey
@@ -63,12 +66,14 @@ from robottelo.cli.scapcontent import Scapcontent
 from robottelo.cli.subnet import Subnet
 from robottelo.cli.subscription import Subscription
 from robottelo.cli.syncplan import SyncPlan
+from robottelo.cli.task import Task
 from robottelo.cli.template import Template
 from robottelo.cli.template_input import TemplateInput
 from robottelo.cli.user import User
 from robottelo.cli.usergroup import UserGroup
 from robottelo.cli.usergroup import UserGroupExternal
 from robottelo.cli.virt_who_config import VirtWhoConfig
+from robottelo.cleanup import track_cli_object
 from robottelo.config import settings
 from robottelo.constants import DEFAULT_ARCHITECTURE
 from robottelo.constants import DEFAULT_LOC
@@ -91,6 +96,7 @@ from robottelo.constants import TEMPLATE_TYPES
 from robottelo.constants.repos import FAKE_1_YUM_REPO
 from robottelo.datafactory import valid_cron_expressions
 from robottelo.decorators import cacheable
+from robottelo.decorators.func_shared.shared import shared
 from robottelo.helpers import default_url_on_new_port
 from robottelo.helpers import get_available_capsule_port
 from robottelo.helpers import update_dictionary
@@ -103,6 +109,10 @@ ORG_KEYS = ['organization', 'organization-id', 'organization-label']
 CONTENT_VIEW_KEYS = ['content-view', 'content-view-id']
 LIFECYCLE_KEYS = ['lifecycle-environment', 'lifecycle-environment-id']
 
+# RH repository content templates created by this process, keyed by content
+# signature, see _get_rh_repo_content_template
+_RH_REPO_CONTENT_TEMPLATES = {}
+
 
 class CLIFactoryError(Exception):
     """Indicates an error occurred while creating an entity using hammer"""
@@ -145,6 +155,7 @@ def create_object(cli_object, options, values):
     if type(result) is list and len(result) > 0:
         result = result[0]
 
+    track_cli_object(cli_object, result, options)
     return result
 
 
@@ -161,7 +172,27 @@ def _entity_with_credentials(credentials, cli_entity_cls):
     return cli_entity_cls
 
 
-@cacheable
+def _object_exists(cli_object):
+    """Return a cached objects validator, that check using the cheap ``info``
+    command that a cached object still exists.
+
+    :param cli_object: A valid CLI object.
+    :return: A callable that accept the cached object and the factory options
+    """
+
+    def validate(obj, options):
+        info_options = {'id': obj['id']}
+        if cli_object.command_requires_org:
+            info_options['organization-id'] = (options or {}).get('organization-id')
+        try:
+            return bool(cli_object.info(info_options))
+        except CLIReturnCodeError:
+            return False
+
+    return validate
+
+
+@cacheable(validate=_object_exists(ActivationKey))
 def make_activation_key(options=None):
     """Creates an Activation Key
 
@@ -199,7 +230,7 @@ def make_activation_key(options=None):
     return create_object(ActivationKey, args, options)
 
 
-@cacheable
+@cacheable(validate=_object_exists(Architecture))
 def make_architecture(options=None):
     """Creates an Architecture
 
@@ -212,7 +243,7 @@ def make_architecture(options=None):
     return create_object(Architecture, args, options)
 
 
-@cacheable
+@cacheable(validate=_object_exists(ContentView))
 def make_content_view(options=None):
     """Creates a Content View
 
@@ -431,7 +462,7 @@ def make_content_credential(options=None):
     return create_object(ContentCredential, args, options)
 
 
-@cacheable
+@cacheable(validate=_object_exists(Location))
 def make_location(options=None):
     """Creates a Location
 
@@ -515,7 +546,7 @@ def make_partition_table(options=None):
     return create_object(PartitionTable, args, options)
 
 
-@cacheable
+@cacheable(validate=_object_exists(Product))
 def make_product(options=None):
     """Creates a Product
 
@@ -603,7 +634,7 @@ def make_proxy(options=None):
     return create_object(Proxy, args, options)
 
 
-@cacheable
+@cacheable(validate=_object_exists(Repository))
 def make_repository(options=None):
     """Creates a Repository
 
@@ -647,7 +678,7 @@ def make_repository_with_credentials(options=None, credentials=None):
     return create_object(repo_cls, args, options)
 
 
-@cacheable
+@cacheable(validate=_object_exists(Role))
 def make_role(options=None):
     """Creates a Role
 
@@ -1058,7 +1089,7 @@ def make_job_template(options=None):
     return create_object(JobTemplate, args, options)
 
 
-@cacheable
+@cacheable(validate=_object_exists(User))
 def make_user(options=None):
     """Creates a User
 
@@ -1227,7 +1258,7 @@ def make_compute_resource(options=None):
     return create_object(ComputeResource, args, options)
 
 
-@cacheable
+@cacheable(validate=_object_exists(Org))
 def make_org(options=None):
     """Creates an Organization
 
@@ -1235,6 +1266,11 @@ def make_org(options=None):
 
     :returns Organization object
     """
+    if not options:
+        # take a pre-created organization when available
+        org = entity_pool.get_entity('cli_org')
+        if org is not None:
+            return org
     return make_org_with_credentials(options)
 
 
@@ -1328,7 +1364,7 @@ def make_report_template(options=None):
     return create_object(ReportTemplate, args, options)
 
 
-@cacheable
+@cacheable(validate=_object_exists(OperatingSys))
 def make_os(options=None):
     """Creates an Operating System
 
@@ -1380,7 +1416,7 @@ def make_scapcontent(options=None):
     return create_object(Scapcontent, args, options)
 
 
-@cacheable
+@cacheable(validate=_object_exists(Domain))
 def make_domain(options=None):
     """Creates a Domain
 
@@ -1510,7 +1546,7 @@ def make_environment(options=None):
     return create_object(Environment, args, options)
 
 
-@cacheable
+@cacheable(validate=_object_exists(LifecycleEnvironment))
 def make_lifecycle_environment(options=None):
     """Creates a Lifecycle Environment
 
@@ -1809,44 +1845,12 @@ def setup_org_for_a_custom_repo(options=None):
     }
 
 
-def _setup_org_for_a_rh_repo(options=None):
-    """Sets up Org for the given Red Hat repository by:
-
-    1. Checks if organization and lifecycle environment were given, otherwise
-        creates new ones.
-    2. Clones and uploads manifest.
-    3. Enables RH repo and synchronizes it.
-    4. Checks if content view was given, otherwise creates a new one and
-        - adds the RH repo
-        - publishes
-        - promotes to the lifecycle environment
-    5. Checks if activation key was given, otherwise creates a new one and
-        associates it with the content view.
-    6. Adds the RH repo subscription to the activation key
-
-    Note that in most cases you should use ``setup_org_for_a_rh_repo`` instead
-    as it's more flexible.
-
-    :return: A dictionary with the entity ids of Activation key, Content view,
-        Lifecycle Environment, Organization and Repository
+def _setup_rh_repo_content(options, org_id):
+    """Upload a manifest to the organization, enable the RH repository, update
+    its download policy if given and synchronize it.
 
+    :return: The RH repository info
     """
-    if (
-        not options
-        or not options.get('product')
-        or not options.get('repository-set')
-        or not options.get('repository')
-    ):
-        raise CLIFactoryError('Please provide valid product, repository-set and repo.')
-    # Create new organization and lifecycle environment if needed
-    if options.get('organization-id') is None:
-        org_id = make_org()['id']
-    else:
-        org_id = options['organization-id']
-    if options.get('lifecycle-environment-id') is None:
-        env_id = make_lifecycle_environment({'organization-id': org_id})['id']
-    else:
-        env_id = options['lifecycle-environment-id']
     # Clone manifest and upload it
     with manifests.clone() as manifest:
         upload_file(manifest.content, manifest.filename)
@@ -1878,6 +1882,13 @@ def _setup_org_for_a_rh_repo(options=None):
         )
     except CLIReturnCodeError as err:
         raise CLIFactoryError(f'Failed to fetch repository info\n{err.msg}')
+    if options.get('download-policy'):
+        try:
+            Repository.update(
+                {'id': rhel_repo['id'], 'download-policy': options['download-policy']}
+            )
+        except CLIReturnCodeError as err:
+            raise CLIFactoryError(f'Failed to update repository download policy\n{err.msg}')
     # Synchronize the RH repository
     try:
         Repository.synchronize(
@@ -1889,6 +1900,137 @@ def _setup_org_for_a_rh_repo(options=None):
         )
     except CLIReturnCodeError as err:
         raise CLIFactoryError(f'Failed to synchronize repository\n{err.msg}')
+    return rhel_repo
+
+
+def _get_rh_repo_content_signature(options):
+    """Return the signature of the RH repository content described by options"""
+    return (
+        options['product'],
+        options['repository-set'],
+        options['repository'],
+        options.get('releasever'),
+        options.get('download-policy'),
+    )
+
+
+@shared(function_kw=['product', 'repository_set', 'repository', 'releasever', 'download_policy'])
+def _setup_rh_repo_content_template(
+    product=None, repository_set=None, repository=None, releasever=None, download_policy=None
+):
+    """Create an organization with a manifest, enable and synchronize the RH
+    repository in it.
+
+    The resulting organization and repository are used as a template by
+    ``_setup_org_for_a_rh_repo`` when its callers allow to reuse already
+    synchronized content, when shared functions are enabled this is done once
+    per Satellite.
+
+    :return: A dictionary with the template Organization and Repository ids
+    """
+    org_id = make_org()['id']
+    rhel_repo = _setup_rh_repo_content(
+        {
+            'product': product,
+            'repository-set': repository_set,
+            'repository': repository,
+            'releasever': releasever,
+            'download-policy': download_policy,
+        },
+        org_id,
+    )
+    return {'organization-id': org_id, 'repository-id': rhel_repo['id']}
+
+
+def _rh_repo_content_template_exists(template):
+    """Return whether the template repository still exists"""
+    try:
+        Repository.info(
+            {'id': template['repository-id'], 'organization-id': template['organization-id']}
+        )
+    except CLIReturnCodeError:
+        return False
+    return True
+
+
+def _get_rh_repo_content_template(options):
+    """Return the RH repository content template of options.
+
+    The template created by this process or shared by an other one is checked
+    to still exist before it is reused, as a test may have deleted it,
+    otherwise a new template is created by this process.
+    """
+    signature = _get_rh_repo_content_signature(options)
+    product, repository_set, repository, releasever, download_policy = signature
+    template_kwargs = dict(
+        product=product,
+        repository_set=repository_set,
+        repository=repository,
+        releasever=releasever,
+        download_policy=download_policy,
+    )
+    template = _RH_REPO_CONTENT_TEMPLATES.get(signature)
+    if template is None:
+        template = _setup_rh_repo_content_template(**template_kwargs)
+    if not _rh_repo_content_template_exists(template):
+        # the shared result is kept until it expires, bypass it
+        template = _setup_rh_repo_content_template.__wrapped__(**template_kwargs)
+    _RH_REPO_CONTENT_TEMPLATES[signature] = template
+    return template
+
+
+def _setup_org_for_a_rh_repo(options=None, reuse_content=False):
+    """Sets up Org for the given Red Hat repository by:
+
+    1. Checks if organization and lifecycle environment were given, otherwise
+        creates new ones.
+    2. Clones and uploads manifest.
+    3. Enables RH repo and synchronizes it.
+    4. Checks if content view was given, otherwise creates a new one and
+        - adds the RH repo
+        - publishes
+        - promotes to the lifecycle environment
+    5. Checks if activation key was given, otherwise creates a new one and
+        associates it with the content view.
+    6. Adds the RH repo subscription to the activation key
+
+    When ``reuse_content`` is True and no organization was given, steps 1 to
+    3 are done only once for the same product, repository set, repository,
+    releasever and download policy: the organization with the already
+    synchronized repository is reused and only the lifecycle environment,
+    content view and activation key are created.
+
+    Note that in most cases you should use ``setup_org_for_a_rh_repo`` instead
+    as it's more flexible.
+
+    :return: A dictionary with the entity ids of Activation key, Content view,
+        Lifecycle Environment, Organization and Repository
+
+    """
+    if (
+        not options
+        or not options.get('product')
+        or not options.get('repository-set')
+        or not options.get('repository')
+    ):
+        raise CLIFactoryError('Please provide valid product, repository-set and repo.')
+    template = None
+    if reuse_content and options.get('organization-id') is None:
+        template = _get_rh_repo_content_template(options)
+        org_id = template['organization-id']
+    # Create new organization and lifecycle environment if needed
+    elif options.get('organization-id') is None:
+        org_id = make_org()['id']
+    else:
+        org_id = options['organization-id']
+    if options.get('lifecycle-environment-id') is None:
+        env_id = make_lifecycle_environment({'organization-id': org_id})['id']
+    else:
+        env_id = options['lifecycle-environment-id']
+    if template is not None:
+        rhel_repo = {'id': template['repository-id']}
+    else:
+        rhel_repo = _setup_rh_repo_content(options, org_id)
     # Create CV if needed and associate repo with it
     if options.get('content-view-id') is None:
         cv_id = make_content_view({'organization-id': org_id})['id']
@@ -1953,7 +2095,9 @@ def _setup_org_for_a_rh_repo(options=None):
     }
 
 
-def setup_org_for_a_rh_repo(options=None, force_manifest_upload=False, force_use_cdn=False):
+def setup_org_for_a_rh_repo(
+    options=None, force_manifest_upload=False, force_use_cdn=False, reuse_content=False
+):
     """Wrapper above ``_setup_org_for_a_rh_repo`` to use custom downstream repo
     instead of CDN's 'Satellite Capsule' and 'Satellite Tools' if
     ``settings.cdn == 0`` and URL for custom repositories is set in properties.
@@ -1966,6 +2110,9 @@ def setup_org_for_a_rh_repo(options=None, force_manifest_upload=False, force_use
         organization even if downstream custom repo is used instead of CDN.
         Useful when test relies on organization with manifest (e.g. uses some
         other RH repo afterwards). Defaults to False.
+    :param reuse_content: bool flag whether to reuse an organization with the
+        same RH repository already synchronized when no organization is given,
+        only the cheap per test entities are created. Defaults to False.
     :return: a dict with entity ids (see ``_setup_org_for_a_rh_repo`` and
         ``setup_org_for_a_custom_repo``).
     """
@@ -1977,7 +2124,7 @@ def setup_org_for_a_rh_repo(options=None, force_manifest_upload=False, force_use
     elif 'Satellite Capsule' in options.get('repository'):
         custom_repo_url = settings.capsule_repo
     if force_use_cdn or settings.cdn or not custom_repo_url:
-        return _setup_org_for_a_rh_repo(options)
+        return _setup_org_for_a_rh_repo(options, reuse_content=reuse_content)
     else:
         options['url'] = custom_repo_url
         result = setup_org_for_a_custom_repo(options)
@@ -2389,8 +2536,74 @@ def add_role_permissions(role_id, resource_permissions):
         make_filter(options=options)
 
 
+def start_repositories_sync(repos_info):
+    """Start the synchronization of the repositories without waiting for it
+
+    :param list repos_info: a list of dict repositories info
+    :return: a dict of the repositories sync tasks ids by repository id
+    """
+    sync_tasks = {}
+    for repo_info in repos_info:
+        try:
+            result = Repository.synchronize({'id': repo_info['id'], 'async': True})
+        except CLIReturnCodeError as err:
+            raise CLIFactoryError(f'Failed to synchronize repository\n{err.msg}')
+        sync_tasks[repo_info['id']] = result[0]['id']
+    return sync_tasks
+
+
+def wait_for_repositories_sync(sync_tasks, timeout=4800):
+    """Wait concurrently for the repositories sync tasks to finish
+
+    :param dict sync_tasks: the repositories sync tasks ids by repository id,
+        as returned by ``start_repositories_sync``
+    :param int timeout: the time in seconds to wait for each sync task
+    :return: a dict of each repository sync duration in seconds by repository
+        id, measured from the start of the wait
+    :raises CLIFactoryError: if a repository sync failed or did not finish
+        in time
+    """
+    if not sync_tasks:
+        return {}
+    start_time = time.time()
+
+    def wait_for_sync(repo_id, task_id):
+        try:
+            Task.progress({'id': task_id}, timeout=timeout)
+            repo_info = Repository.info({'id': repo_id})
+        except CLIReturnCodeError as err:
+            raise CLIFactoryError(f'Failed to synchronize repository {repo_id}\n{err.msg}')
+        except ssh.SSHCommandTimeoutError as err:
+            raise CLIFactoryError(
+                f'Timeout waiting for the synchronization of repository {repo_id}\n{err}'
+            )
+        if repo_info['sync']['status'] != 'Success':
+            raise CLIFactoryError(
+                'Failed to synchronize repository {}, sync status: {}'.format(
+                    repo_id, repo_info['sync']['status']
+                )
+            )
+        return time.time() - start_time
+
+    with ThreadPoolExecutor(max_workers=len(sync_tasks)) as executor:
+        futures = {
+            repo_id: executor.submit(
+                contextvars.copy_context().run, wait_for_sync, repo_id, task_id
+            )
+            for repo_id, task_id in sync_tasks.items()
+        }
+        sync_durations = {repo_id: future.result() for repo_id, future in futures.items()}
+    logger.info(
+        'repositories sync durations: {} - critical path: {:.1f} seconds'.format(
+            {repo_id: round(duration, 1) for repo_id, duration in sync_durations.items()},
+            time.time() - start_time,
+        )
+    )
+    return sync_durations
+
+
 def setup_cdn_and_custom_repositories(
-    org_id, repos, download_policy='on_demand', synchronize=True
+    org_id, repos, download_policy='on_demand', synchronize=True, pipelined=False
 ):
     """Setup cdn and custom repositories
 
@@ -2399,6 +2612,8 @@ def setup_cdn_and_custom_repositories(
     :param str download_policy: update the repositories with this download
         policy
     :param bool synchronize: Whether to synchronize the repositories.
+    :param bool pipelined: Whether to start all the repositories syncs at once
+        and wait for them together, instead of one after the other.
     :return: a dict containing the content view and repos info
     """
     custom_product = None
@@ -2435,7 +2650,9 @@ def setup_cdn_and_custom_repositories(
             # Set download policy
             Repository.update({'download-policy': download_policy, 'id': repo_info['id']})
         repos_info.append(repo_info)
-    if synchronize:
+    if synchronize and pipelined:
+        wait_for_repositories_sync(start_repositories_sync(repos_info))
+    elif synchronize:
         # Synchronize the repositories
         for repo_info in repos_info:
             Repository.synchronize({'id': repo_info['id']}, timeout=4800)
@@ -2450,6 +2667,7 @@ def setup_cdn_and_custom_repos_content(
     download_policy='on_demand',
     rh_subscriptions=None,
     default_cv=False,
+    pipelined=False,
 ):
     """Setup cdn and custom repositories, content view and activations key
 
@@ -2462,6 +2680,10 @@ def setup_cdn_and_custom_repos_content(
         policy
     :param list rh_subscriptions: a list of RH subscription to attach to
         activation key
+    :param bool pipelined: Whether to enable all the repositories first, start
+        all their syncs at once and prepare the content view while they are
+        running, the content view is published as soon as the last
+        repository sync finishes.
     :return: a dict containing the activation key, content view and repos info
     """
     if lce_id is None and not default_cv:
@@ -2481,9 +2703,14 @@ def setup_cdn_and_custom_repos_content(
             raise CLIFactoryError(f'Failed to upload manifest\n{err.msg}')
 
     custom_product, repos_info = setup_cdn_and_custom_repositories(
-        org_id=org_id, repos=repos, download_policy=download_policy
+        org_id=org_id,
+        repos=repos,
+        download_policy=download_policy,
+        synchronize=not pipelined,
     )
+    sync_tasks = start_repositories_sync(repos_info) if pipelined else {}
     if default_cv:
+        wait_for_repositories_sync(sync_tasks)
         activation_key = make_activation_key(
             {'organization-id': org_id, 'lifecycle-environment': 'Library'}
         )
@@ -2502,6 +2729,7 @@ def setup_cdn_and_custom_repos_content(
                     'repository-id': repo_info['id'],
                 }
             )
+        wait_for_repositories_sync(sync_tasks)
         # Publish the content view
         ContentView.publish({'id': content_view['id']})
         # Get the latest content view version id
@@ -25,7 +25,7 @@ class Task(Base):
     command_base = 'task'
 
     @classmethod
-    def progress(cls, options=None, return_raw_response=None):
+    def progress(cls, options=None, return_raw_response=None, timeout=None):
         """Shows a task progress
 
         Usage::
@@ -37,7 +37,9 @@ class Task(Base):
         """
         cls.command_sub = 'progress'
         return cls.execute(
-            cls._construct_command(options), return_raw_response=return_raw_response
+            cls._construct_command(options),
+            return_raw_response=return_raw_response,
+            timeout=timeout,
         )
 
     @classmethod
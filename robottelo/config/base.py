@@ -14,6 +14,7 @@ from nailgun import entities
 from nailgun import entity_mixins
 from nailgun.config import ServerConfig
 
+from robottelo import http_sessions
 from robottelo.config import casts
 from robottelo.constants import AZURERM_VALID_REGIONS
 from robottelo.constants import VALID_GCE_ZONES
@@ -1225,6 +1226,11 @@ class SharedFunctionSettings(FeatureSettings):
         self.redis_db = None
         self.redis_password = None
         self.call_retries = None
+        self.serializer = None
+        self.compression = None
+        self.compression_threshold = None
+        self.function_lock_backend = None
+        self.function_lock_lease_time = None
 
     def read(self, reader):
         """Read shared settings."""
@@ -1240,20 +1246,59 @@ class SharedFunctionSettings(FeatureSettings):
         self.redis_db = reader.get('shared_function', 'redis_db', 0, int)
         self.redis_password = reader.get('shared_function', 'redis_password', None)
         self.call_retries = reader.get('shared_function', 'call_retries', 2, int)
+        self.serializer = reader.get('shared_function', 'serializer', 'json')
+        self.compression = reader.get('shared_function', 'compression', None)
+        self.compression_threshold = reader.get(
+            'shared_function', 'compression_threshold', 4096, int
+        )
+        self.function_lock_backend = reader.get('shared_function', 'function_lock_backend', 'file')
+        self.function_lock_lease_time = reader.get(
+            'shared_function', 'function_lock_lease_time', 60, int
+        )
 
     def validate(self):
         """Validate the shared settings"""
         validation_errors = []
-        supported_storage_handlers = ['file', 'redis']
+        supported_storage_handlers = ['file', 'redis', 'sqlite']
         if self.storage not in supported_storage_handlers:
             validation_errors.append(
                 f'[shared] storage must be one of {supported_storage_handlers}'
             )
-        if self.storage == 'redis':
+        if self.function_lock_backend is None:
+            self.function_lock_backend = 'file'
+        supported_lock_backends = ['file', 'redis']
+        if self.function_lock_backend not in supported_lock_backends:
+            validation_errors.append(
+                f'[shared] function_lock_backend must be one of {supported_lock_backends}'
+            )
+        if 'redis' in (self.storage, self.function_lock_backend):
             try:
                 importlib.import_module('redis')
             except ImportError:
                 validation_errors.append('[shared] python redis package not installed')
+        if self.serializer is None:
+            self.serializer = 'json'
+        supported_serializers = {'json': None, 'msgpack': 'msgpack'}
+        if self.serializer not in supported_serializers:
+            validation_errors.append(
+                f'[shared] serializer must be one of {list(supported_serializers)}'
+            )
+        supported_compressions = {'zlib': None, 'zstd': 'zstandard'}
+        if self.compression and self.compression not in supported_compressions:
+            validation_errors.append(
+                f'[shared] compression must be one of {list(supported_compressions)}'
+            )
+        for module_name in (
+            supported_serializers.get(self.serializer),
+            supported_compressions.get(self.compression),
+        ):
+            if module_name:
+                try:
+                    importlib.import_module(module_name)
+                except ImportError:
+                    validation_errors.append(
+                        f'[shared] python {module_name} package not installed'
+                    )
         if self.share_timeout is None:
             self.share_timeout = self.MAX_SHARE_TIMEOUT
         if self.share_timeout > self.MAX_SHARE_TIMEOUT:
@@ -1405,6 +1450,8 @@ class Settings:
         self.webdriver_desired_capabilities = None
         self.command_executor = None
         self.repos_hosting_url = None
+        self.entity_pool_size = None
+        self.resources_cleanup_scope = None
 
         self.broker = BrokerSettings()
         self.bugzilla = BugzillaSettings()
@@ -1522,6 +1569,10 @@ class Settings:
         self.artifacts_server = self.reader.get('robottelo', 'artifacts_server', None)
         self.run_one_datapoint = self.reader.get('robottelo', 'run_one_datapoint', False, bool)
         self.upstream = self.reader.get('robottelo', 'upstream', True, bool)
+        self.entity_pool_size = self.reader.get('robottelo', 'entity_pool_size', 0, int)
+        self.resources_cleanup_scope = self.reader.get(
+            'robottelo', 'resources_cleanup_scope', None
+        )
         self.verbosity = self.reader.get(
             'robottelo',
             'verbosity',
@@ -1558,6 +1609,13 @@ class Settings:
             validation_errors.append(
                 '[robottelo] webdriver should be one of {}.'.format(', '.join(webdrivers))
             )
+        cleanup_scopes = ('module', 'session')
+        if self.resources_cleanup_scope and self.resources_cleanup_scope not in cleanup_scopes:
+            validation_errors.append(
+                '[robottelo] resources_cleanup_scope should be one of {}.'.format(
+                    ', '.join(cleanup_scopes)
+                )
+            )
         if self.browser == 'saucelabs':
             if self.saucelabs_user is None:
                 validation_errors.append(
@@ -1596,11 +1654,14 @@ class Settings:
             ``robottelo.entity_mixins.Entity`` for more information on the effects
             of this.
         * Set a default value for ``nailgun.entities.GPGKey.content``.
+        * Make NailGun send its requests with the pooled http sessions of
+            :mod:`robottelo.http_sessions`.
         """
         entity_mixins.CREATE_MISSING = True
         entity_mixins.DEFAULT_SERVER_CONFIG = ServerConfig(
             self.server.get_url(), self.server.get_credentials(), verify=False
         )
+        http_sessions.configure_nailgun()
 
         gpgkey_init = entities.GPGKey.__init__
 
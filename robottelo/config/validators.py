@@ -222,7 +222,7 @@ validators = dict(
         )
     ],
     shared_function=[
-        Validator("shared_function.storage", is_in=("file", "redis"), default='file'),
+        Validator("shared_function.storage", is_in=("file", "redis", "sqlite"), default='file'),
         Validator("shared_function.share_timeout", lte=86400, default=86400),
         Validator("shared_function.scope", default=None),
         Validator("shared_function.enabled", default=False),
@@ -231,6 +231,13 @@ validators = dict(
         Validator("shared_function.redis_port", default=6379),
         Validator("shared_function.redis_db", default=0),
         Validator("shared_function.call_retries", default=2),
+        Validator("shared_function.serializer", is_in=("json", "msgpack"), default='json'),
+        Validator("shared_function.compression", is_in=(None, "zlib", "zstd"), default=None),
+        Validator("shared_function.compression_threshold", default=4096),
+        Validator(
+            "shared_function.function_lock_backend", is_in=("file", "redis"), default='file'
+        ),
+        Validator("shared_function.function_lock_lease_time", default=60),
     ],
     upgrade=[
         Validator("upgrade.rhev_cap_host", must_exist=False)
@@ -5,9 +5,10 @@ from functools import wraps
 import unittest2
 
 from robottelo.config import settings
+from robottelo.decorators.func_cache import cacheable  # noqa
+from robottelo.decorators.func_cache import OBJECT_CACHE  # noqa
 
 LOGGER = logging.getLogger('robottelo')
-OBJECT_CACHE = {}
 
 
 def setting_is_set(option):
@@ -98,26 +99,6 @@ def skip_if_not_set(*options):
     return decorator
 
 
-def cacheable(func):
-    """Decorator that makes an optional object cache available"""
-
-    @wraps(func)
-    def cacheable_function(options=None, cached=False):
-        """
-        This is the function being returned.
-        Requires input function's name start with 'make_'
-        """
-        object_key = func.__name__.replace('make_', '')
-        if cached is True and object_key in OBJECT_CACHE:
-            return OBJECT_CACHE[object_key]
-        new_object = func(options)
-        if cached is True:
-            OBJECT_CACHE[object_key] = new_object
-        return new_object
-
-    return cacheable_function
-
-
 class ProjectModeError(Exception):
     """Indicates an error occurred while skipping based on Project Mode."""
 
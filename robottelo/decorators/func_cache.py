@@ -0,0 +1,278 @@
+"""Implements the factory functions object cache.
+
+The cache is keyed by the factory function name and the normalized options
+passed to it, bounded in size (least recently used entries are evicted first)
+and each entry expires after a time to live. Expired entries can be
+re-validated (for example with a cheap hammer ``info`` call) instead of being
+created again.
+
+Optionally, the cached objects can be shared with other processes (ex: xdist
+workers running against the same Satellite) by using the shared function
+storage (file or redis), in that case the shared function feature must be
+enabled and the cached objects must be json compatible.
+
+Usage::
+
+    from robottelo.decorators.func_cache import cacheable
+
+    @cacheable
+    def make_foo(options=None):
+        return create_object(Foo, args, options)
+
+    def _foo_exists(obj, options):
+        # return True if the object still exists
+        ...
+
+    @cacheable(validate=_foo_exists, ttl=600, shared=True)
+    def make_bar(options=None):
+        return create_object(Bar, args, options)
+
+    # create a new object without caching it
+    foo = make_foo({'name': 'foo'})
+    # create a new object or return an already cached one
+    foo = make_foo({'name': 'foo'}, cached=True)
+"""
+import functools
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+
+from robottelo.config import settings
+
+logger = logging.getLogger('robottelo')
+
+# the maximum number of objects kept in the process cache
+CACHE_MAX_SIZE = 256
+# after one hour the cached objects are considered stale
+CACHE_DEFAULT_TTL = 3600
+
+_CACHE_SCOPE_CONTEXT = 'object_cache'
+
+
+def _get_object_name(function):
+    """Return the object name of a factory function, ex: make_org -> org"""
+    return function.__name__.replace('make_', '')
+
+
+def _normalize_options(options):
+    """Return a json representation of options that does not depend on the
+    keys order and ignore the options not set.
+    """
+    if not options:
+        return None
+    options = {key: value for key, value in options.items() if value is not None}
+    if not options:
+        return None
+    return json.dumps(options, sort_keys=True, default=str)
+
+
+def get_object_key(function, options=None):
+    """Return the cache key of the object created by function with options
+
+    note: when options are empty the key is the object name, otherwise an md5
+        hexdigest of the normalized options is appended to the object name.
+    """
+    object_key = _get_object_name(function)
+    normalized_options = _normalize_options(options)
+    if normalized_options:
+        options_md5 = hashlib.md5(normalized_options.encode()).hexdigest()
+        object_key = f'{object_key}.{options_md5}'
+    return object_key
+
+
+class ObjectCache:
+    """A bounded least recently used object cache with entries expiry"""
+
+    def __init__(self, max_size=CACHE_MAX_SIZE):
+        self._max_size = max_size
+        self._entries = OrderedDict()
+
+    @property
+    def max_size(self):
+        return self._max_size
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __getitem__(self, key):
+        return self._entries[key][0]
+
+    def __setitem__(self, key, value):
+        self.set(key, value)
+
+    def keys(self):
+        return list(self._entries.keys())
+
+    def get_entry(self, key):
+        """Return the (value, creation_time) tuple of key or None"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key, value, creation_time=None):
+        """Add the value to cache, evicting the least recently used entries
+        when the cache is full
+        """
+        if creation_time is None:
+            creation_time = time.time()
+        self._entries[key] = (value, creation_time)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            evicted_key, _ = self._entries.popitem(last=False)
+            logger.debug(f'object cache: evicted key "{evicted_key}"')
+
+    def touch(self, key):
+        """Reset the creation time of key"""
+        value, _ = self._entries[key]
+        self.set(key, value)
+
+    def pop(self, key, default=None):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return default
+        return entry[0]
+
+    def clear(self):
+        self._entries.clear()
+
+
+OBJECT_CACHE = ObjectCache()
+
+
+def _has_expired(creation_time, ttl):
+    return ttl is not None and time.time() >= creation_time + ttl
+
+
+def _is_entry_valid(entry, ttl, validate, options):
+    """Return whether a cached entry can be used and whether it was
+    re-validated
+    """
+    value, creation_time = entry
+    if not _has_expired(creation_time, ttl):
+        return True, False
+    if validate is None:
+        return False, False
+    try:
+        return bool(validate(value, options)), True
+    except Exception as err:
+        logger.warning(f'object cache: validation failed with error: {err}')
+        return False, True
+
+
+def _get_shared_key(object_key):
+    """Return the key of object in the shared storage, scoped by the server
+    hostname
+    """
+    from robottelo.decorators.func_shared.shared import _get_function_name_key
+
+    return _get_function_name_key(
+        object_key,
+        scope=lambda: settings.server.hostname,
+        scope_context=_CACHE_SCOPE_CONTEXT,
+    )
+
+
+def _shared_storage():
+    """Return the shared functions storage handler if the shared function
+    feature is enabled, None otherwise
+    """
+    from robottelo.decorators.func_shared import shared
+
+    shared._check_config()
+    if not shared.ENABLED:
+        return None
+    return shared._get_default_storage_handler()
+
+
+def _untracked():
+    """Return a context in which the created entities are not tracked for
+    cleanup, the cached objects outlive the caller scope
+    """
+    from robottelo.cleanup import RESOURCES
+
+    return RESOURCES.untracked()
+
+
+def _get_or_create_shared(storage, object_key, function, options, ttl, validate):
+    """Return the object from the shared storage or create and store it,
+    other processes wait for the object creation.
+    """
+    shared_key = _get_shared_key(object_key)
+    with storage.lock(shared_key) as data:
+        storage.when_lock_acquired(data)
+        value = storage.get(shared_key)
+        if value is not None:
+            entry = (value['object'], value['creation_time'])
+            is_valid, validated = _is_entry_valid(entry, ttl, validate, options)
+            if is_valid:
+                if validated:
+                    value['creation_time'] = time.time()
+                    storage.set(shared_key, value)
+                return value['object'], value['creation_time']
+        new_object = function(options)
+        value = dict(object=new_object, creation_time=time.time())
+        storage.set(shared_key, value)
+    return value['object'], value['creation_time']
+
+
+def cacheable(function=None, ttl=CACHE_DEFAULT_TTL, validate=None, shared=False, cache=None):
+    """Decorator that makes an optional object cache available to factory
+    functions. The decorated function accepts an added ``cached`` kwarg, when
+    ``cached=True`` an already created object with the same options is
+    returned if available, otherwise a new object is created and cached.
+
+    :type function: callable
+    :type ttl: int
+    :type validate: callable
+    :type shared: bool
+    :type cache: ObjectCache
+
+    :param function: the factory function, its name must start with 'make_'
+        and it must accept options as the only argument
+    :param ttl: the time in seconds after which a cached object is stale,
+        None for no expiry
+    :param validate: a callable that receive the stale object and the options
+        and return whether the object is still valid, if not supplied, stale
+        objects are created again
+    :param shared: whether to share the cached objects with other processes
+        using the shared function storage
+    :param cache: the cache to use, by default the module ``OBJECT_CACHE``
+    """
+
+    def main_wrapper(func):
+        @functools.wraps(func)
+        def cacheable_function(options=None, cached=False):
+            if cached is not True:
+                return func(options)
+            object_cache = OBJECT_CACHE if cache is None else cache
+            object_key = get_object_key(func, options)
+            entry = object_cache.get_entry(object_key)
+            if entry is not None:
+                is_valid, validated = _is_entry_valid(entry, ttl, validate, options)
+                if is_valid:
+                    if validated:
+                        object_cache.touch(object_key)
+                    return entry[0]
+                object_cache.pop(object_key)
+            storage = _shared_storage() if shared else None
+            with _untracked():
+                if storage is not None:
+                    new_object, creation_time = _get_or_create_shared(
+                        storage, object_key, func, options, ttl, validate
+                    )
+                else:
+                    new_object, creation_time = func(options), None
+            object_cache.set(object_key, new_object, creation_time=creation_time)
+            return new_object
+
+        return cacheable_function
+
+    if function:
+        return main_wrapper(function)
+    return main_wrapper
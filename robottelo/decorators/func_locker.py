@@ -1,4 +1,5 @@
-"""Implements test function locking, using pytest_services file locking
+"""Implements test function locking, using pytest_services file locking, or
+redis locks shared by several runner hosts with the redis lock backend
 
 Usage::
 
@@ -38,17 +39,49 @@ Usage::
        def test_that_conflict_with_test_to_lock(self)
             with locking_function(self.test_to_lock):
                 # do some operations that conflict with test_to_lock
+
+    # with the redis lock backend, the locks are shared by all the runner
+    # hosts, the locked code can check that the lock lease was not lost
+    class SomeTestCase(TestCase):
+
+       def test_upload_manifest(self)
+            with locking_function(upload_manifest) as lock:
+                # do some long operations
+                lock.check()
+                # upload the manifest
+
+    # a locked function gets its lock with get_current_lock
+    @lock_function
+    def upload_manifest():
+        # do some long operations
+        get_current_lock().check()
+        # upload the manifest
+
+    # some operations can run concurrently, but the server handles only a few
+    # at once
+    @limit_concurrency(3, scope_context='repository_sync')
+    def sync_repository(repo):
+        repo.sync()
 """
+import contextvars
 import functools
 import inspect
 import logging
 import os
+import random
 import tempfile
+import threading
+import time
 from contextlib import contextmanager
+from contextlib import ExitStack
 
 from pytest_services.locks import file_lock
+from zc.lockfile import LockError
 
 from robottelo.config import settings
+from robottelo.decorators import lock_profiler
+from robottelo.decorators import setting_is_set
+from robottelo.decorators.redis_locker import RedisLockBackend
 
 logger = logging.getLogger('robottelo')
 
@@ -58,9 +91,17 @@ LOCK_DIR = None
 LOCK_DEFAULT_TIMEOUT = 1800  # 30 minutes
 LOCK_FILE_NAME_EXT = 'lock'
 LOCK_DEFAULT_SCOPE = None
+# the lock backend name, by default the shared function function_lock_backend
+# setting
+LOCK_BACKEND = None
+SEMAPHORE_EXT = 'semaphore'
+SEMAPHORE_WAITERS_DIR = 'waiters'
 
 _DEFAULT_CLASS_NAME_DEPTH = 3
 
+# the innermost function lock held in the current context
+_current_lock = contextvars.ContextVar('current_function_lock', default=None)
+
 
 class FunctionLockerError(Exception):
     """the default function locker error"""
@@ -162,37 +203,276 @@ def _get_function_name_lock_path(function_name, scope=None, scope_kwargs=None, s
     )
 
 
-def _check_deadlock(lock_file_path, process_id):
-    """To prevent process deadlock, raise exception if the file content is the
-    same as process_id
+def _write_content(handler, content):
+    """write content to locked file"""
+    handler.seek(0)
+    handler.truncate()
+    if content:
+        handler.write(content)
+    handler.flush()
+
+
+class FileLock:
+    """An acquired function lock file, or semaphore slot file, held until
+    released or the holder process exits. As the lock can not be lost while
+    held, it has no fencing token and its token is None.
+    """
+
+    token = None
+
+    def __init__(self, name, handler):
+        self.name = name
+        self.handler = handler
+
+    def is_held(self):
+        return FileLockBackend.get_holder(self.name) == FileLockBackend.get_process_id()
+
+    def check(self):
+        """Raise FunctionLockerError if the lock file is not held by the
+        current process
+        """
+        if not self.is_held():
+            raise FunctionLockerError(f'function lock "{self.name}" not held')
 
-    note: this function is called before the lock
 
-    :type lock_file_path: str
-    :type process_id: str
+class FileLockBackend:
+    """Function locker backend of the locks files in the local temp dir, the
+    lock file content is the process id of the holder
     """
-    if os.path.exists(lock_file_path):
+
+    @staticmethod
+    def get_process_id():
+        return str(os.getpid())
+
+    @staticmethod
+    def get_holder(name):
+        """Return the process id of the lock holder, None if the lock is free"""
+        lock_file_path = os.path.join(_get_temp_lock_function_dir(), name)
         try:
-            lock_file_handler = open(lock_file_path)
-            lock_file_content = lock_file_handler.read()
+            with open(lock_file_path) as lock_file_handler:
+                lock_file_content = lock_file_handler.read()
+        except FileNotFoundError:
+            return None
         except OSError as exp:
             # do nothing, but anyway log the exception
             logger.exception(exp)
-            lock_file_content = None
+            return None
+        return lock_file_content or None
+
+    @contextmanager
+    def lock(self, name, timeout):
+        lock_file_path = os.path.join(_get_temp_lock_function_dir(), name)
+        with file_lock(lock_file_path, remove=False, timeout=timeout) as handler:
+            # write the process id that locked this function
+            _write_content(handler, self.get_process_id())
+            try:
+                yield FileLock(name, handler)
+            finally:
+                # clear the file
+                _write_content(handler, None)
+
+    @staticmethod
+    def _get_waiters_dir(name):
+        return os.path.join(_get_temp_lock_function_dir(), name, SEMAPHORE_WAITERS_DIR)
+
+    @contextmanager
+    def semaphore(self, name, limit, timeout):
+        """Return the semaphore context manager, the semaphore slots are the
+        lock files of the semaphore directory, the waiters create a file in
+        the waiters directory
+
+        :raises FunctionLockerError: if no slot is acquired after timeout
+            seconds
+        """
+        semaphore_dir = os.path.join(_get_temp_lock_function_dir(), name)
+        waiters_dir = self._get_waiters_dir(name)
+        waiter_path = os.path.join(waiters_dir, f'{os.getpid()}.{threading.get_ident()}')
+        os.makedirs(semaphore_dir, exist_ok=True)
+        end_time = time.time() + timeout
+        with ExitStack() as stack:
+            handler = None
+            while handler is None:
+                for index in range(limit):
+                    slot_name = f'slot.{index}.{LOCK_FILE_NAME_EXT}'
+                    try:
+                        handler = stack.enter_context(
+                            file_lock(
+                                os.path.join(semaphore_dir, slot_name), remove=False, timeout=0
+                            )
+                        )
+                        break
+                    except LockError:
+                        pass
+                else:
+                    if not os.path.exists(waiter_path):
+                        os.makedirs(waiters_dir, exist_ok=True)
+                        open(waiter_path, 'w').close()
+                    if time.time() >= end_time:
+                        os.remove(waiter_path)
+                        raise FunctionLockerError(
+                            f'timeout waiting for function semaphore "{name}"'
+                        )
+                    time.sleep(random.random() * 0.1 + 0.05)
+            if os.path.exists(waiter_path):
+                os.remove(waiter_path)
+            _write_content(handler, self.get_process_id())
+            try:
+                yield FileLock(os.path.join(name, slot_name), handler)
+            finally:
+                _write_content(handler, None)
+
+    def get_holders(self, name):
+        """Return the process ids of the semaphore holders"""
+        semaphore_dir = os.path.join(_get_temp_lock_function_dir(), name)
+        if not os.path.isdir(semaphore_dir):
+            return []
+        holders = []
+        for entry in os.scandir(semaphore_dir):
+            if entry.is_file() and entry.name.endswith(f'.{LOCK_FILE_NAME_EXT}'):
+                holder = self.get_holder(os.path.join(name, entry.name))
+                if holder and _is_process_alive(int(holder)):
+                    holders.append(holder)
+        return holders
+
+    def get_queue_depth(self, name):
+        """Return the number of processes waiting for a semaphore slot, the
+        waiter files of the dead processes are removed
+        """
+        waiters_dir = self._get_waiters_dir(name)
+        if not os.path.isdir(waiters_dir):
+            return 0
+        queue_depth = 0
+        for entry in os.scandir(waiters_dir):
+            if _is_process_alive(int(entry.name.split('.')[0])):
+                queue_depth += 1
+            else:
+                try:
+                    os.remove(entry.path)
+                except FileNotFoundError:
+                    pass
+        return queue_depth
+
+
+def _is_process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+# the redis lock backends by settings, the backends register their lua
+# scripts once
+_redis_lock_backends = {}
+_redis_lock_backends_lock = threading.Lock()
+
+
+def _get_redis_lock_backend():
+    kwargs = {}
+    if setting_is_set('shared_function'):
+        kwargs = dict(
+            host=settings.shared_function.redis_host,
+            port=settings.shared_function.redis_port,
+            db=settings.shared_function.redis_db,
+            password=settings.shared_function.redis_password,
+            lease_time=settings.shared_function.function_lock_lease_time,
+        )
+    key = tuple(sorted(kwargs.items()))
+    with _redis_lock_backends_lock:
+        if key not in _redis_lock_backends:
+            _redis_lock_backends[key] = RedisLockBackend(**kwargs)
+        return _redis_lock_backends[key]
 
-        if lock_file_content and lock_file_content == process_id:
-            raise FunctionLockerError(
-                'recursion detected: the function file already locked by the same process'
-            )
 
+_lock_backends = dict(file=FileLockBackend, redis=_get_redis_lock_backend)
 
-def _write_content(handler, content):
-    """write content to locked file"""
-    handler.seek(0)
-    handler.truncate()
-    if content:
-        handler.write(content)
-    handler.flush()
+
+def set_lock_backend(value):
+    """Set the lock backend, one of file or redis, by default the shared
+    function function_lock_backend setting
+
+    :type value: str
+    """
+    global LOCK_BACKEND
+    LOCK_BACKEND = value
+
+
+def _get_lock_backend():
+    lock_backend = LOCK_BACKEND
+    if lock_backend is None:
+        lock_backend = 'file'
+        if setting_is_set('shared_function'):
+            lock_backend = settings.shared_function.function_lock_backend
+    if lock_backend not in _lock_backends:
+        raise FunctionLockerError(f'lock backend: "{lock_backend}" not supported')
+    return _lock_backends[lock_backend]()
+
+
+def _get_lock_name(lock_file_path):
+    return os.path.relpath(lock_file_path, _get_temp_lock_function_dir())
+
+
+def get_current_lock():
+    """Return the innermost function lock held in the current context by
+    :func:`lock_function` or :func:`locking_function`, None if no lock is
+    held
+
+    The lock has a ``check()`` method raising an exception if the lock is not
+    held anymore and a ``token`` attribute, the fencing token of the redis
+    locks, None for the file locks.
+    """
+    return _current_lock.get()
+
+
+@contextmanager
+def _profile_lock(lock_name, lock_context, holder_pid=None):
+    """Enter the lock context and record the lock wait and hold times, or
+    the wait time when the lock is not acquired
+    """
+    start_time = time.time()
+    acquire_time = None
+    try:
+        with lock_context as handler:
+            acquire_time = time.time()
+            yield handler
+    finally:
+        end_time = time.time()
+        # the lock backend raised while waiting when not acquired
+        acquired = acquire_time is not None
+        if not acquired:
+            acquire_time = end_time
+        lock_profiler.record(
+            lock_name,
+            acquire_time - start_time,
+            end_time - acquire_time,
+            holder_pid=holder_pid,
+            nodeid=lock_profiler.get_current_test(),
+            acquired=acquired,
+        )
+
+
+@contextmanager
+def _acquire_lock(lock_file_path, timeout):
+    """Acquire the function lock with the lock backend and record the lock
+    wait and hold times, the lock is the current lock until released
+    """
+    lock_backend = _get_lock_backend()
+    lock_name = _get_lock_name(lock_file_path)
+    holder = lock_backend.get_holder(lock_name)
+    # to prevent dead lock when recursively calling this function
+    # check if the same process is trying to acquire the lock
+    if holder and holder == lock_backend.get_process_id():
+        raise FunctionLockerError(
+            'recursion detected: the function file already locked by the same process'
+        )
+    with _profile_lock(lock_name, lock_backend.lock(lock_name, timeout), holder) as lock:
+        current_lock_token = _current_lock.set(lock)
+        try:
+            yield lock
+        finally:
+            _current_lock.reset(current_lock_token)
 
 
 def lock_function(
@@ -242,24 +522,14 @@ def lock_function(
                 function_name, scope=scope, scope_kwargs=scope_kwargs, scope_context=scope_context
             )
             process_id = str(os.getpid())
-            # to prevent dead lock when recursively calling this function
-            # check if the same process is trying to acquire the lock
-            _check_deadlock(lock_file_path, process_id)
-
-            with file_lock(lock_file_path, remove=False, timeout=timeout) as handler:
+            with _acquire_lock(lock_file_path, timeout):
                 logger.info(
                     'process id: {} lock function using file path: {}'.format(
                         process_id, lock_file_path
                     )
                 )
-                # write the process id that locked this function
-                _write_content(handler, process_id)
                 # call the locked function
-                try:
-                    res = func(*args, **kwargs)
-                finally:
-                    # clear the file
-                    _write_content(handler, None)
+                res = func(*args, **kwargs)
 
             return res
 
@@ -297,6 +567,8 @@ def locking_function(
            lock in combination with scope and function.
     :param scope_kwargs: kwargs to be passed to scope if is a callable
     :param timeout: the time in seconds to wait for acquiring the lock
+    :return: the context manager of the acquired lock, see
+        :func:`get_current_lock`
     """
     if not getattr(function, '__function_locked__', False):
         raise FunctionLockerError('Cannot ensure locking when using a non locked function')
@@ -306,21 +578,159 @@ def locking_function(
         function_name, scope=scope, scope_kwargs=scope_kwargs, scope_context=scope_context
     )
     process_id = str(os.getpid())
-    # to prevent dead lock when recursively calling this function
-    # check if the same process is trying to acquire the lock
-    _check_deadlock(lock_file_path, process_id)
-
-    with file_lock(lock_file_path, remove=False, timeout=timeout) as handler:
+    with _acquire_lock(lock_file_path, timeout) as lock:
         logger.info(
             'process id: {} - lock function name:{}  - using file path: {}'.format(
                 process_id, function_name, lock_file_path
             )
         )
-        # write the process id that locked this function
-        _write_content(handler, process_id)
         # let the locked code run
-        try:
+        yield lock
+
+
+class ConcurrencyLimit:
+    """A counting semaphore shared by the pytest xdist workers, that lets at
+    most ``limit`` holders in. Returned by :func:`limit_concurrency`, usable as
+    a decorator or as a context manager.
+    """
+
+    def __init__(
+        self,
+        limit,
+        scope=_get_default_scope,
+        scope_context=None,
+        scope_kwargs=None,
+        timeout=LOCK_DEFAULT_TIMEOUT,
+    ):
+        if limit < 1:
+            raise FunctionLockerError('the concurrency limit must be at least 1')
+        self.limit = limit
+        self._scope = scope
+        self._scope_context = scope_context
+        self._scope_kwargs = scope_kwargs
+        self._timeout = timeout
+        self._function_name = None
+        # the entered slots contexts, per thread as the instance is shared
+        self._local = threading.local()
+
+    def _get_semaphore_path(self):
+        if self._scope_context is not None:
+            # shared by all the functions and code blocks of this context
+            semaphore_name = self._scope_context
+        elif self._function_name is not None:
+            semaphore_name = self._function_name
+        else:
+            raise FunctionLockerError(
+                'a scope_context is needed to limit the concurrency of a code block'
+            )
+        return os.path.join(
+            _get_scope_path(self._scope, scope_kwargs=self._scope_kwargs, create=False),
+            f'{semaphore_name}.{SEMAPHORE_EXT}',
+        )
+
+    @property
+    def name(self):
+        return _get_lock_name(self._get_semaphore_path())
+
+    def get_queue_depth(self):
+        """Return the number of processes waiting for a slot"""
+        return _get_lock_backend().get_queue_depth(self.name)
+
+    def get_holders(self):
+        """Return the process ids of the slots holders"""
+        return _get_lock_backend().get_holders(self.name)
+
+    @contextmanager
+    def acquire(self):
+        """Return the context manager of a semaphore slot"""
+        lock_backend = _get_lock_backend()
+        semaphore_name = self.name
+        queue_depth = lock_backend.get_queue_depth(semaphore_name)
+        logger.info(
+            'process id: {} - concurrency limit: {} - queue depth: {} - semaphore: {}'.format(
+                os.getpid(), self.limit, queue_depth, semaphore_name
+            )
+        )
+        holders = lock_backend.get_holders(semaphore_name)
+        # the wait is contended when all the slots are held
+        holder_pid = ','.join(holders) if len(holders) >= self.limit else None
+        with _profile_lock(
+            semaphore_name,
+            lock_backend.semaphore(semaphore_name, self.limit, self._timeout),
+            holder_pid,
+        ) as handler:
             yield handler
-        finally:
-            # clear the file
-            _write_content(handler, None)
+
+    @property
+    def _contexts(self):
+        if not hasattr(self._local, 'contexts'):
+            self._local.contexts = []
+        return self._local.contexts
+
+    def __enter__(self):
+        context = self.acquire()
+        handler = context.__enter__()
+        self._contexts.append(context)
+        return handler
+
+    def __exit__(self, *exc_info):
+        return self._contexts.pop().__exit__(*exc_info)
+
+    def __call__(self, function):
+        if self._scope_context is None:
+            self._function_name = f'{function.__module__}.{function.__qualname__}'
+
+        @functools.wraps(function)
+        def function_wrapper(*args, **kwargs):
+            with self.acquire():
+                return function(*args, **kwargs)
+
+        function_wrapper.concurrency_limit = self
+        return function_wrapper
+
+
+def limit_concurrency(
+    limit,
+    scope=_get_default_scope,
+    scope_context=None,
+    scope_kwargs=None,
+    timeout=LOCK_DEFAULT_TIMEOUT,
+):
+    """Let at most limit parallel pytest xdist workers run the decorated
+    function or the code block, the others wait for a free slot
+
+    Usage::
+
+        @limit_concurrency(3, scope_context='repository_sync')
+        def sync_repository(repo):
+            repo.sync()
+
+        with limit_concurrency(3, scope_context='repository_sync'):
+            # synchronize a repository
+            pass
+
+        sync_repository.concurrency_limit.get_queue_depth()
+
+    :type limit: int
+    :type scope: str or callable
+    :type scope_kwargs: dict
+    :type scope_context: str
+    :type timeout: int
+
+    :param limit: the maximum number of holders
+    :param scope: this parameter will define the namespace of locking
+    :param scope_context: the name of the limited operation, the functions and
+        code blocks with the same scope_context share the same slots, needed
+        when used as a context manager, by default a decorated function has
+        its own slots
+    :param scope_kwargs: kwargs to be passed to scope if is a callable
+    :param timeout: the time in seconds to wait for a free slot
+    :rtype: ConcurrencyLimit
+    """
+    return ConcurrencyLimit(
+        limit,
+        scope=scope,
+        scope_context=scope_context,
+        scope_kwargs=scope_kwargs,
+        timeout=timeout,
+    )
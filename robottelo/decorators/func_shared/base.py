@@ -1,14 +1,21 @@
-import json
+from robottelo.decorators.func_shared import encoding
 
 
 class BaseStorageHandler:
+    @property
+    def identity(self):
+        """Return a hashable identity of the storage, the handlers with the
+        same identity read and write the same values
+        """
+        return type(self), id(self)
+
     @staticmethod
     def encode(data):
-        return json.dumps(data)
+        return encoding.encode(data)
 
     @staticmethod
     def decode(data):
-        return json.loads(data)
+        return encoding.decode(data)
 
     def lock(self, lock_key):
         """Return the storage locker context manager"""
@@ -25,3 +32,16 @@ class BaseStorageHandler:
     def set(self, key, value):
         """Write the value of key to storage"""
         raise NotImplementedError
+
+    def get_version(self, key):
+        """Return a token that changes each time the key value is written, or
+        None if the key does not exist
+        """
+        raise NotImplementedError
+
+    def get_with_version(self, key):
+        """Return the key value and its version"""
+        # a value written meanwhile makes the returned version outdated, not
+        # the value
+        version = self.get_version(key)
+        return self.get(key), version
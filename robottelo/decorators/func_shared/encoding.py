@@ -0,0 +1,117 @@
+"""Encoding of the shared functions stored values.
+
+The values are serialized with json or msgpack, and compressed with zlib or
+zstd when bigger than a threshold. The serializer and the compression used
+are recorded in the value header, so that any process can decode the values
+written with other encoding settings. The values without header are json.
+"""
+import json
+import zlib
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# the serializer and compression used to encode the values
+SERIALIZER = 'json'
+COMPRESSION = None
+# the values smaller than this number of bytes are not compressed
+COMPRESSION_THRESHOLD = 4096
+
+_HEADER_PREFIX = b'RSF1:'
+_HEADER_END = b'\n'
+_NO_COMPRESSION = 'none'
+
+
+class EncodingError(Exception):
+    """Shared value encoding related exception"""
+
+
+def _json_dumps(data):
+    return json.dumps(data).encode()
+
+
+def _msgpack_dumps(data):
+    return msgpack.packb(data, use_bin_type=True)
+
+
+def _msgpack_loads(data):
+    return msgpack.unpackb(data, raw=False)
+
+
+def _zstd_compress(data):
+    return zstandard.ZstdCompressor().compress(data)
+
+
+def _zstd_decompress(data):
+    return zstandard.ZstdDecompressor().decompress(data)
+
+
+# the serializers and compressions by name, with the module they need
+_serializers = {
+    'json': (None, _json_dumps, json.loads),
+    'msgpack': ('msgpack', _msgpack_dumps, _msgpack_loads),
+}
+_compressions = {
+    'zlib': (None, zlib.compress, zlib.decompress),
+    'zstd': ('zstandard', _zstd_compress, _zstd_decompress),
+}
+
+
+def _get_codec(codecs, name):
+    if name not in codecs:
+        raise EncodingError(f'encoding "{name}" not supported, must be one of {list(codecs)}')
+    module_name, encode_function, decode_function = codecs[name]
+    if module_name and globals()[module_name] is None:
+        raise EncodingError(f'encoding "{name}" needs the python {module_name} package')
+    return encode_function, decode_function
+
+
+def encode(data, serializer=None, compression=None, threshold=None):
+    """Return the bytes of data with a header of the encoding used
+
+    :param data: the value to encode
+    :param serializer: the serializer name, by default ``SERIALIZER``
+    :param compression: the compression name, by default ``COMPRESSION``
+    :param threshold: the minimal size of the serialized data to compress, by
+        default ``COMPRESSION_THRESHOLD``
+    """
+    serializer = serializer or SERIALIZER
+    compression = compression or COMPRESSION
+    if threshold is None:
+        threshold = COMPRESSION_THRESHOLD
+    dumps, _ = _get_codec(_serializers, serializer)
+    payload = dumps(data)
+    if compression and len(payload) >= threshold:
+        compress, _ = _get_codec(_compressions, compression)
+        payload = compress(payload)
+    else:
+        compression = _NO_COMPRESSION
+    header = _HEADER_PREFIX + f'{serializer}:{compression}'.encode() + _HEADER_END
+    return header + payload
+
+
+def decode(data):
+    """Return the value of the encoded data
+
+    :type data: bytes or str
+    """
+    if isinstance(data, str):
+        data = data.encode()
+    if not data.startswith(_HEADER_PREFIX):
+        # a value written before the header was introduced
+        return json.loads(data)
+    header, payload = data.split(_HEADER_END, 1)
+    _, _, codec_names = header.partition(_HEADER_PREFIX)
+    serializer, compression = codec_names.decode().split(':')
+    if compression != _NO_COMPRESSION:
+        _, decompress = _get_codec(_compressions, compression)
+        payload = decompress(payload)
+    _, loads = _get_codec(_serializers, serializer)
+    return loads(payload)
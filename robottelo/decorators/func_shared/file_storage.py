@@ -61,6 +61,10 @@ class FileStorageHandler(BaseStorageHandler):
     def root_dir(self):
         return self.root_dir()
 
+    @property
+    def identity(self):
+        return type(self), os.path.realpath(self._root_dir)
+
     def get_key_file_path(self, key):
         return os.path.join(self._root_dir, key)
 
@@ -85,7 +89,7 @@ class FileStorageHandler(BaseStorageHandler):
         value = None
         key_file_path = self.get_key_file_path(key)
         if os.path.exists(key_file_path):
-            with open(key_file_path) as file_handler:
+            with open(key_file_path, 'rb') as file_handler:
                 value = file_handler.read()
 
         if value is not None:
@@ -100,5 +104,19 @@ class FileStorageHandler(BaseStorageHandler):
         """
         value = self.encode(value)
         key_file_path = self.get_key_file_path(key)
-        with open(key_file_path, 'w') as file_handler:
+        # the value is read without lock, replace the file atomically
+        file_handle, tmp_file_path = tempfile.mkstemp(dir=self._root_dir, prefix=f'.{key}.')
+        with os.fdopen(file_handle, 'wb') as file_handler:
             file_handler.write(value)
+        os.replace(tmp_file_path, key_file_path)
+
+    def get_version(self, key):
+        """Return the key file identity, the file is replaced at each write
+
+        :type key: str
+        """
+        try:
+            stat = os.stat(self.get_key_file_path(key))
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
@@ -1,3 +1,8 @@
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
 try:
     import redis
 except ImportError:
@@ -10,6 +15,26 @@ REDIS_PORT = 6379
 REDIS_DB = 0
 REDIS_PASSWORD = None
 LOCK_TIMEOUT = 7200
+# the maximum number of seconds between two lock acquire attempts, when no
+# notification is received
+LOCK_POLL_RATE = 1
+
+_READY_MESSAGE = 'ready'
+_RELEASED_MESSAGE = 'released'
+
+# the connection pools by connection parameters, shared by the handlers
+_connection_pools = {}
+_connection_pools_lock = threading.Lock()
+
+
+def _get_connection_pool(host, port, db, password):
+    key = (host, port, db, password)
+    with _connection_pools_lock:
+        if key not in _connection_pools:
+            _connection_pools[key] = redis.ConnectionPool(
+                host=host, port=port, db=db, password=password
+            )
+        return _connection_pools[key]
 
 
 class RedisStorageHandler(BaseStorageHandler):
@@ -25,20 +50,59 @@ class RedisStorageHandler(BaseStorageHandler):
     ):
 
         self._lock_timeout = lock_timeout
-        self._client = redis.StrictRedis(host=host, port=port, db=db, password=password)
+        self._identity = (type(self), host, port, db)
+        self._client = redis.StrictRedis(
+            connection_pool=_get_connection_pool(host, port, db, password)
+        )
 
     @property
     def client(self):
         return self._client
 
+    @property
+    def identity(self):
+        return self._identity
+
+    @staticmethod
+    def _get_channel(key):
+        return f'{key}.channel'
+
+    @contextmanager
     def lock(self, key, timeout=None):
-        """Return the storage locker context manager"""
+        """Return the storage locker context manager
+
+        The waiters subscribe to the key channel and try to acquire the lock
+        again as soon as the value is published or the lock released, instead
+        of polling the lock.
+        """
         if timeout is None:
             timeout = self._lock_timeout
 
         lock_key = f'{key}.lock'
         # If acquired the lock will be acquired until release
-        return self.client.lock(lock_key, timeout=None, blocking_timeout=timeout)
+        lock = self.client.lock(lock_key, timeout=None)
+        end_time = time.time() + timeout
+        pubsub = None
+        try:
+            while not lock.acquire(blocking=False):
+                if pubsub is None:
+                    # subscribe before the next attempt to not miss the
+                    # notifications
+                    pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                    pubsub.subscribe(self._get_channel(key))
+                    continue
+                remaining = end_time - time.time()
+                if remaining <= 0:
+                    raise redis.exceptions.LockError(f'timeout waiting for lock "{lock_key}"')
+                pubsub.get_message(timeout=min(remaining, LOCK_POLL_RATE))
+        finally:
+            if pubsub is not None:
+                pubsub.close()
+        try:
+            yield lock
+        finally:
+            lock.release()
+            self.client.publish(self._get_channel(key), _RELEASED_MESSAGE)
 
     def when_lock_acquired(self, lock_object):
         # do nothing
@@ -55,10 +119,41 @@ class RedisStorageHandler(BaseStorageHandler):
         return value
 
     def set(self, key, value):
-        """Write the value of key
+        """Write the value of key, the value version is its transaction id or
+        a new unique id for the values without one, like the object cache
+        values
 
         :type key: str
         :type value: object
         """
+        version = value.get('id') or uuid.uuid4().hex
         value = self.encode(value)
-        self.client.set(key, value)
+        # write the value and its version in the same transaction, and
+        # notify the waiters
+        pipeline = self.client.pipeline()
+        pipeline.set(key, value)
+        pipeline.set(f'{key}.version', version)
+        pipeline.publish(self._get_channel(key), _READY_MESSAGE)
+        pipeline.execute()
+
+    def get_with_version(self, key):
+        """Return the key value and version with a single round trip
+
+        :type key: str
+        """
+        value, version = self.client.mget(key, f'{key}.version')
+        if value is not None:
+            value = self.decode(value)
+        if version is not None:
+            version = version.decode()
+        return value, version
+
+    def get_version(self, key):
+        """Return the transaction id of the key value
+
+        :type key: str
+        """
+        version = self.client.get(f'{key}.version')
+        if version is not None:
+            version = version.decode()
+        return version
@@ -84,6 +84,7 @@ Usage::
 
             return dict(org=cls.org, repo=cls.repo}
 """
+import copy
 import datetime
 import functools
 import hashlib
@@ -91,22 +92,34 @@ import inspect
 import logging
 import os
 import sys
+import threading
+import time
 import traceback
 import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
 from importlib import import_module
 
 from nailgun.entities import Entity
 
 from robottelo.config import settings
 from robottelo.decorators import setting_is_set
+from robottelo.decorators.func_shared import encoding
 from robottelo.decorators.func_shared import file_storage
 from robottelo.decorators.func_shared import redis_storage
+from robottelo.decorators.func_shared import sqlite_storage
+from robottelo.decorators.func_shared import telemetry
 from robottelo.decorators.func_shared.file_storage import FileStorageHandler
 from robottelo.decorators.func_shared.redis_storage import RedisStorageHandler
+from robottelo.decorators.func_shared.sqlite_storage import SQLiteStorageHandler
 
 logger = logging.getLogger('robottelo')
 
-_storage_handlers = {'file': FileStorageHandler, 'redis': RedisStorageHandler}
+_storage_handlers = {
+    'file': FileStorageHandler,
+    'redis': RedisStorageHandler,
+    'sqlite': SQLiteStorageHandler,
+}
 
 DEFAULT_STORAGE_HANDLER = 'file'
 # by default using the shared data is disabled
@@ -115,6 +128,8 @@ NAMESPACE_SCOPE = None
 # after 24 hours the shared function data will became not valid
 SHARE_DEFAULT_TIMEOUT = 86400
 DEFAULT_CALL_RETRIES = 2
+# the maximum number of ready results kept in the process memo
+MEMO_MAX_SIZE = 256
 
 _configured = False
 
@@ -149,6 +164,10 @@ def _check_config():
         DEFAULT_CALL_RETRIES = settings.shared_function.call_retries
         file_storage.LOCK_TIMEOUT = settings.shared_function.lock_timeout
         redis_storage.LOCK_TIMEOUT = settings.shared_function.lock_timeout
+        sqlite_storage.LOCK_TIMEOUT = settings.shared_function.lock_timeout
+        encoding.SERIALIZER = settings.shared_function.serializer
+        encoding.COMPRESSION = settings.shared_function.compression
+        encoding.COMPRESSION_THRESHOLD = settings.shared_function.compression_threshold
         redis_storage.REDIS_HOST = settings.shared_function.redis_host
         redis_storage.REDIS_PORT = settings.shared_function.redis_port
         redis_storage.REDIS_DB = settings.shared_function.redis_db
@@ -190,6 +209,74 @@ def _get_default_storage_handler():
     return _storage_handlers.get(DEFAULT_STORAGE_HANDLER)()
 
 
+class _ResultsMemo:
+    """Process memo of the decoded ready results, in front of the storage.
+
+    The entries are keyed by the storage identity and the function key. An
+    entry is valid while its result has not expired and the storage version
+    of its key did not change, the version is read from the storage at each
+    hit.
+    """
+
+    def __init__(self, max_size=MEMO_MAX_SIZE):
+        self._max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, storage, key):
+        """Return the memo value of key, None if not found or not valid"""
+        memo_key = (storage.identity, key)
+        with self._lock:
+            entry = self._entries.get(memo_key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(memo_key)
+        value, version, expire_datetime = entry
+        if datetime.datetime.utcnow() >= expire_datetime or storage.get_version(key) != version:
+            self.discard(storage, key)
+            return None
+        return value
+
+    def set(self, storage, key, value, share_timeout, version=None):
+        """Keep the ready value of key with its storage version, by default
+        the current one
+        """
+        if value['state'] != _STATE_READY:
+            return
+        if version is None:
+            version = storage.get_version(key)
+        if version is None:
+            return
+        expire_datetime = datetime.datetime.strptime(
+            value['creation_datetime'], _DATETIME_FORMAT
+        ) + datetime.timedelta(seconds=share_timeout)
+        memo_key = (storage.identity, key)
+        with self._lock:
+            self._entries[memo_key] = (value, version, expire_datetime)
+            self._entries.move_to_end(memo_key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def discard(self, storage, key):
+        with self._lock:
+            self._entries.pop((storage.identity, key), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_memo = _ResultsMemo()
+
+
+def clear_memo():
+    """Clear the process memo of the shared functions results"""
+    _memo.clear()
+
+
 class SharedFunctionError(Exception):
     """Shared function related exception"""
 
@@ -239,6 +326,11 @@ class _SharedFunction:
         self._max_retries = retries
         self._transaction = uuid.uuid4().hex
         self._share_timeout = timeout
+        self._read_version = None
+        # the telemetry of the call
+        self._lock_wait_time = 0
+        self._compute_time = 0
+        self._retries = 0
 
     @property
     def storage(self):
@@ -262,6 +354,7 @@ class _SharedFunction:
         return kwargs
 
     def _call_function(self):
+        from robottelo.cleanup import RESOURCES
 
         retries = self._max_retries
         if not retries:
@@ -279,9 +372,14 @@ class _SharedFunction:
                         self._function_key, retry_index
                     )
                 )
-                result = self._function(*self._function_args, **self._function_kwargs)
+                # the shared results outlive the caller scope, the entities
+                # created by the function are not tracked for cleanup
+                with RESOURCES.untracked():
+                    result = self._function(*self._function_args, **self._function_kwargs)
                 break
             except Exception as err:
+                if retry_index < retries - 1:
+                    self._retries += 1
                 exp = err
                 result = None
                 logger.exception(exp)
@@ -298,71 +396,130 @@ class _SharedFunction:
 
         return False
 
-    def __call__(self):
+    @contextmanager
+    def _storage_lock(self):
+        """Hold the storage lock of the function key, the time spent waiting
+        for the lock is kept, also when the wait fails
+        """
+        lock_start_time = time.time()
+        acquired = False
+        try:
+            with self.storage.lock(self.key) as data:
+                acquired = True
+                self._lock_wait_time = time.time() - lock_start_time
+                yield data
+        finally:
+            if not acquired:
+                self._lock_wait_time = time.time() - lock_start_time
+
+    def _locked_call(self):
+        """Call the function with the storage lock held, unless an other
+        process stored valid results meanwhile
+
+        :return: a tuple of the stored value and the exception raised by the
+            function if called
+        """
         # this lock prevent any other process to run the function,
         # and if an other process is running the function, I should wait it
         # to finish
-        # note: when results are ready this lock has a very short time
-        with self.storage.lock(self.key) as data:
+        with self._storage_lock() as data:
             self.storage.when_lock_acquired(data)
-            # first must investigate, call the function or use the results
-            result = None
-            error = None
-            traceback_text = ''
-            error_class_name = None
-            exp = None
-            pid = None
-            value = self.storage.get(self.key)
-            if value is None:
-                call_function = True
+            value = self._get_valid_value(self.storage.get(self.key))
+            if value is not None:
+                return value, None
+            compute_start_time = time.time()
+            result, exp, traceback_text = self._call_function()
+            self._compute_time = time.time() - compute_start_time
+            creation_datetime = datetime.datetime.utcnow().strftime(_DATETIME_FORMAT)
+            if exp:
+                error = str(exp) or 'error occurred'
+                error_class_name = '{}.{}'.format(exp.__class__.__module__, exp.__class__.__name__)
+                value = dict(
+                    state=_STATE_FAILED,
+                    id=self.transaction,
+                    result=None,
+                    error=error,
+                    error_class_name=error_class_name,
+                    traceback=traceback_text,
+                    pid=os.getpid(),
+                    creation_datetime=creation_datetime,
+                    share_timeout=self._share_timeout,
+                )
             else:
-                state = value['state']
-                result = value['result']
-                error = value['error']
-                traceback_text = value.get('traceback', '')
-                error_class_name = value.get('error_class_name')
-                pid = value['pid']
-                creation_datetime = datetime.datetime.strptime(
-                    value['creation_datetime'], _DATETIME_FORMAT
+                result = self._encode_result_kwargs(result)
+                value = dict(
+                    state=_STATE_READY,
+                    id=self.transaction,
+                    result=result,
+                    error=None,
+                    pid=os.getpid(),
+                    creation_datetime=creation_datetime,
+                    share_timeout=self._share_timeout,
                 )
+            self.storage.set(self.key, value)
+        return value, exp
+
+    def _get_valid_value(self, value, states=(_STATE_READY, _STATE_FAILED)):
+        """Return the stored value if its state is in states and it has not
+        expired, None otherwise
+        """
+        if value is None or value['state'] not in states:
+            return None
+        creation_datetime = datetime.datetime.strptime(
+            value['creation_datetime'], _DATETIME_FORMAT
+        )
+        if self._has_result_expired(creation_datetime):
+            return None
+        return value
+
+    def _read_value(self):
+        """Read the stored value without locking, return it only if ready and
+        not expired
+        """
+        try:
+            value, self._read_version = self.storage.get_with_version(self.key)
+        except ValueError:
+            # the value is being written by an other process
+            return None
+        return self._get_valid_value(value, states=(_STATE_READY,))
 
-                if state in [_STATE_READY, _STATE_FAILED] and not self._has_result_expired(
-                    creation_datetime
-                ):
-                    call_function = False
-                else:
-                    call_function = True
-
-            if call_function is True:
-                result, exp, traceback_text = self._call_function()
-                creation_datetime = datetime.datetime.utcnow().strftime(_DATETIME_FORMAT)
-                if exp:
-                    error = str(exp) or 'error occurred'
-                    error_class_name = '{}.{}'.format(
-                        exp.__class__.__module__, exp.__class__.__name__
-                    )
-                    value = dict(
-                        state=_STATE_FAILED,
-                        id=self.transaction,
-                        result=None,
-                        error=error,
-                        error_class_name=error_class_name,
-                        traceback=traceback_text,
-                        pid=os.getpid(),
-                        creation_datetime=creation_datetime,
-                    )
-                else:
-                    error = None
-                    result = self._encode_result_kwargs(result)
-                    value = dict(
-                        state=_STATE_READY,
-                        id=self.transaction,
-                        result=result,
-                        error=error,
-                        pid=os.getpid(),
-                        creation_datetime=creation_datetime,
-                    )
-                self.storage.set(self.key, value)
+    def __call__(self):
+        # the results already read by this process cost a storage version
+        # check, without reading, decoding nor locking the stored value
+        value = _memo.get(self.storage, self.key)
+        call_function = False
+        exp = None
+        try:
+            if value is None:
+                # optimistic read: once the results are ready, the processes
+                # read them without waiting for the lock
+                value = self._read_value()
+                version = self._read_version
+                if value is None:
+                    value, exp = self._locked_call()
+                    call_function = value['id'] == self.transaction
+                    version = None
+                _memo.set(self.storage, self.key, value, self._share_timeout, version=version)
+        finally:
+            # a call without value failed on the storage, like a storage lock
+            # timeout
+            telemetry.record(
+                self.key,
+                calls=1,
+                hits=int(value is not None and not call_function),
+                misses=int(call_function),
+                retries=self._retries,
+                failures=int(value is None or value['state'] == _STATE_FAILED),
+                lock_wait_time=self._lock_wait_time,
+                compute_time=self._compute_time,
+            )
+        # the callers may modify the result, they receive a copy of the kept one
+        value = copy.deepcopy(value)
+        result = value['result']
+        error = value['error']
+        traceback_text = value.get('traceback', '')
+        error_class_name = value.get('error_class_name')
+        pid = value['pid']
 
         if call_function and exp:
             # i'am in the first launched process
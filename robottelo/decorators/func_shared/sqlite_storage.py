@@ -0,0 +1,235 @@
+"""SQLite storage handler of the shared functions.
+
+All the keys are stored in a single database in WAL mode, the readers never
+wait for the writers. The storage lock of a key is a compare-and-set of the
+key row owner: a key is PENDING while owned, the value written by the owner
+switches the key to READY or FAILED and releases it in the same statement.
+The waiters only poll the row of their key.
+"""
+import datetime
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from robottelo.decorators.func_shared.base import BaseStorageHandler
+from robottelo.decorators.func_shared.file_storage import _get_root_dir
+
+DATABASE_NAME = 'shared_functions.db'
+LOCK_TIMEOUT = 7200
+# the delays between the checks of a locked key row
+LOCK_MIN_POLL_RATE = 0.01
+LOCK_MAX_POLL_RATE = 0.5
+# the maximum number of seconds to wait for the database write lock
+BUSY_TIMEOUT = 30
+# the number of seconds after their creation the values without share
+# timeout expire, like the object cache values
+DEFAULT_EXPIRY = 86400
+
+_DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S'
+
+_SCHEMA = (
+    '''
+    CREATE TABLE IF NOT EXISTS shared_values (
+        key TEXT PRIMARY KEY,
+        value TEXT,
+        state TEXT,
+        owner TEXT,
+        owner_pid INTEGER,
+        version INTEGER NOT NULL DEFAULT 0,
+        expire_time REAL
+    )
+    ''',
+    'CREATE INDEX IF NOT EXISTS shared_values_expire_time ON shared_values (expire_time)',
+)
+
+_connections = threading.local()
+
+
+class SQLiteStorageError(Exception):
+    """SQLite storage related exception"""
+
+
+def _is_process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _get_expire_time(value):
+    """Return the expire timestamp of the value, None if the value has no
+    creation time
+    """
+    if value.get('creation_datetime'):
+        creation_time = (
+            datetime.datetime.strptime(value['creation_datetime'], _DATETIME_FORMAT)
+            .replace(tzinfo=datetime.timezone.utc)
+            .timestamp()
+        )
+    elif value.get('creation_time'):
+        creation_time = value['creation_time']
+    else:
+        return None
+    return creation_time + (value.get('share_timeout') or DEFAULT_EXPIRY)
+
+
+def _get_connection(database_path):
+    """Return the connection to the database of the current thread and
+    process, create the database if needed
+    """
+    connections = getattr(_connections, 'connections', None)
+    if connections is None or _connections.pid != os.getpid():
+        connections = _connections.connections = {}
+        _connections.pid = os.getpid()
+    connection = connections.get(database_path)
+    if connection is None:
+        # autocommit mode, each statement is atomic
+        connection = sqlite3.connect(database_path, timeout=BUSY_TIMEOUT, isolation_level=None)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        for statement in _SCHEMA:
+            connection.execute(statement)
+        connections[database_path] = connection
+    return connection
+
+
+class SQLiteStorageHandler(BaseStorageHandler):
+    """SQLite key value storage handler"""
+
+    def __init__(self, database_path=None, lock_timeout=LOCK_TIMEOUT):
+        if database_path is None:
+            database_path = os.path.join(_get_root_dir(), DATABASE_NAME)
+        self._database_path = database_path
+        self._lock_timeout = lock_timeout
+        # the owner token of the keys locked by this handler
+        self._owners = {}
+
+    @property
+    def connection(self):
+        return _get_connection(self._database_path)
+
+    @property
+    def identity(self):
+        return type(self), os.path.realpath(self._database_path)
+
+    def _acquire(self, key, owner):
+        """Try to take the key ownership, return whether acquired"""
+        connection = self.connection
+        connection.execute('INSERT OR IGNORE INTO shared_values (key) VALUES (?)', (key,))
+        cursor = connection.execute(
+            'UPDATE shared_values SET owner = ?, owner_pid = ? WHERE key = ? AND owner IS NULL',
+            (owner, os.getpid(), key),
+        )
+        if cursor.rowcount:
+            return True
+        row = connection.execute(
+            'SELECT owner, owner_pid FROM shared_values WHERE key = ?', (key,)
+        ).fetchone()
+        if row and row[0] and not _is_process_alive(row[1]):
+            # the owner died without releasing the key
+            cursor = connection.execute(
+                'UPDATE shared_values SET owner = ?, owner_pid = ? WHERE key = ? AND owner = ?',
+                (owner, os.getpid(), key, row[0]),
+            )
+            return bool(cursor.rowcount)
+        return False
+
+    def _release(self, key, owner):
+        self.connection.execute(
+            'UPDATE shared_values SET owner = NULL, owner_pid = NULL WHERE key = ? AND owner = ?',
+            (key, owner),
+        )
+
+    @contextmanager
+    def lock(self, key):
+        """Return the storage locker context manager, the key is PENDING
+        while locked
+        """
+        owner = uuid.uuid4().hex
+        end_time = time.time() + self._lock_timeout
+        delay = LOCK_MIN_POLL_RATE
+        while not self._acquire(key, owner):
+            if time.time() >= end_time:
+                raise SQLiteStorageError(f'timeout waiting for the lock of key "{key}"')
+            time.sleep(delay)
+            delay = min(delay * 2, LOCK_MAX_POLL_RATE)
+        self._owners[key] = owner
+        try:
+            yield owner
+        finally:
+            del self._owners[key]
+            self._release(key, owner)
+
+    def when_lock_acquired(self, data):
+        # do nothing
+        pass
+
+    def get(self, key):
+        """Return the key value
+
+        :type key: str
+        """
+        row = self.connection.execute(
+            'SELECT value FROM shared_values WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return self.decode(row[0])
+
+    def set(self, key, value):
+        """Write the value of key and release the key, the key must be locked
+        by this handler
+
+        The values without state, like the object cache values, are stored
+        without state and expire ``DEFAULT_EXPIRY`` seconds after their
+        creation when they have no share timeout.
+
+        :type key: str
+        :type value: object
+        """
+        owner = self._owners.get(key)
+        # compare-and-set: PENDING to READY or FAILED
+        cursor = self.connection.execute(
+            'UPDATE shared_values SET value = ?, state = ?, version = version + 1,'
+            ' expire_time = ?, owner = NULL, owner_pid = NULL WHERE key = ? AND owner = ?',
+            (self.encode(value), value.get('state'), _get_expire_time(value), key, owner),
+        )
+        if not cursor.rowcount:
+            raise SQLiteStorageError(f'key "{key}" is not locked by this storage handler')
+
+    def get_version(self, key):
+        """Return the version of the key value
+
+        :type key: str
+        """
+        row = self.connection.execute(
+            'SELECT version FROM shared_values WHERE key = ? AND value IS NOT NULL', (key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def get_with_version(self, key):
+        """Return the key value and version with a single query
+
+        :type key: str
+        """
+        row = self.connection.execute(
+            'SELECT value, version FROM shared_values WHERE key = ? AND value IS NOT NULL', (key,)
+        ).fetchone()
+        if row is None:
+            return None, None
+        return self.decode(row[0]), row[1]
+
+    def delete_expired(self):
+        """Delete the values expired and not locked, return the number of
+        deleted keys
+        """
+        cursor = self.connection.execute(
+            'DELETE FROM shared_values WHERE expire_time <= ? AND owner IS NULL', (time.time(),)
+        )
+        return cursor.rowcount
@@ -0,0 +1,80 @@
+"""Telemetry of the shared functions.
+
+Each process records per function key the number of calls, the hits (the
+results were stored by a previous call), the misses (the function was
+called), the retries and failures of the function calls, the time spent
+waiting for the storage lock and the time spent calling the function.
+The ``pytest_plugins.shared_function_telemetry`` plugin merges the records
+of the xdist workers in a session report.
+"""
+import threading
+
+COUNTERS = ('calls', 'hits', 'misses', 'retries', 'failures')
+TIMERS = ('lock_wait_time', 'compute_time')
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def _new_entry():
+    return dict.fromkeys(COUNTERS + TIMERS, 0)
+
+
+def record(key, **values):
+    """Add the counters and timers values of the function key
+
+    :param key: the shared function key
+    :param values: the counters and timers increments by name
+    """
+    with _stats_lock:
+        entry = _stats.setdefault(key, _new_entry())
+        for name, value in values.items():
+            entry[name] += value
+
+
+def get_stats():
+    """Return a copy of the process records by function key"""
+    with _stats_lock:
+        return {key: dict(entry) for key, entry in _stats.items()}
+
+
+def reset():
+    """Clear the process records"""
+    with _stats_lock:
+        _stats.clear()
+
+
+def merge(stats, other_stats):
+    """Add the records of other_stats to stats"""
+    for key, other_entry in other_stats.items():
+        entry = stats.setdefault(key, _new_entry())
+        for name, value in other_entry.items():
+            entry[name] = entry.get(name, 0) + value
+    return stats
+
+
+def format_report(stats, limit=None):
+    """Return the report lines of the records, the functions that cost the
+    most time first
+
+    :param stats: the records by function key
+    :param limit: the maximum number of functions to report
+    """
+    entries = sorted(
+        stats.items(),
+        key=lambda item: item[1]['lock_wait_time'] + item[1]['compute_time'],
+        reverse=True,
+    )
+    if limit is not None:
+        entries = entries[:limit]
+    lines = [
+        '{:>6} {:>6} {:>6} {:>7} {:>8} {:>10} {:>11}  {}'.format(
+            'calls', 'hits', 'misses', 'retries', 'failures', 'wait (s)', 'compute (s)', 'function'
+        )
+    ]
+    for key, entry in entries:
+        lines.append(
+            '{calls:>6} {hits:>6} {misses:>6} {retries:>7} {failures:>8} {lock_wait_time:>10.2f}'
+            ' {compute_time:>11.2f}  {key}'.format(key=key, **entry)
+        )
+    return lines
@@ -0,0 +1,269 @@
+"""Garbage collector of the shared functions and locked functions temp files.
+
+The shared functions values and the functions lock files are written in the
+robottelo temp directory and are never deleted. The collector removes:
+
+- the shared values whose ``creation_datetime`` + ``share_timeout`` passed,
+  and the shared object cache values whose ``creation_time`` + the default
+  share timeout passed, with their lock files
+- the least recently used shared values, while the total size of the shared
+  values is above the bytes cap
+- the lock files not held by a process
+- the expired rows of the sqlite storage
+
+A file is only removed while the collector holds its lock, and the lock files
+modified less than ``min_age`` seconds ago are kept.
+
+Usage::
+
+    python -m robottelo.decorators.garbage_collector --max-bytes 104857600
+
+"""
+import argparse
+import datetime
+import fcntl
+import logging
+import math
+import os
+import time
+from contextlib import contextmanager
+
+from robottelo.config import settings
+from robottelo.decorators import func_locker
+from robottelo.decorators.func_shared import encoding
+from robottelo.decorators.func_shared import file_storage
+from robottelo.decorators.func_shared import sqlite_storage
+from robottelo.decorators.func_shared.shared import _DATETIME_FORMAT
+from robottelo.decorators.func_shared.shared import SHARE_DEFAULT_TIMEOUT
+
+logger = logging.getLogger('robottelo')
+
+# the lock files modified since less than this number of seconds are kept
+GC_MIN_AGE = 3600
+
+_LOCK_EXT = '.lock'
+
+
+class _LockHeld(Exception):
+    """The lock file is held by an other process"""
+
+
+@contextmanager
+def _acquired(lock_file_path):
+    """Hold the lock of the lock file without waiting, the lock file is not
+    created if missing
+
+    :raises _LockHeld: if an other process holds the lock
+    """
+    try:
+        file_descriptor = os.open(lock_file_path, os.O_RDWR)
+    except FileNotFoundError:
+        yield
+        return
+    try:
+        try:
+            fcntl.flock(file_descriptor, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise _LockHeld(lock_file_path)
+        yield
+    finally:
+        os.close(file_descriptor)
+
+
+def _is_recent(path, min_age):
+    try:
+        return time.time() - os.stat(path).st_mtime < min_age
+    except FileNotFoundError:
+        return False
+
+
+def _remove(path, stats, dry_run):
+    try:
+        size = os.stat(path).st_size
+        if not dry_run:
+            os.remove(path)
+    except FileNotFoundError:
+        return
+    stats['removed_files'] += 1
+    stats['removed_bytes'] += size
+    logger.debug(f'garbage collector: removed {path}')
+
+
+def _get_expire_time(value_path):
+    """Return the expire timestamp of the stored value, None if the value can
+    not be decoded, infinity if the value schema is unknown
+    """
+    try:
+        with open(value_path, 'rb') as file_handler:
+            value = encoding.decode(file_handler.read())
+    except (OSError, ValueError, TypeError):
+        return None
+    try:
+        if 'creation_datetime' in value:
+            creation_time = (
+                datetime.datetime.strptime(value['creation_datetime'], _DATETIME_FORMAT)
+                .replace(tzinfo=datetime.timezone.utc)
+                .timestamp()
+            )
+        else:
+            # an object cache value, see robottelo.decorators.func_cache
+            creation_time = float(value['creation_time'])
+    except (ValueError, KeyError, TypeError):
+        # only removed above the bytes cap
+        return math.inf
+    share_timeout = value.get('share_timeout') or SHARE_DEFAULT_TIMEOUT
+    return creation_time + share_timeout
+
+
+def _new_stats():
+    return {'removed_files': 0, 'removed_bytes': 0}
+
+
+def collect_shared_functions(root_dir=None, max_bytes=None, min_age=GC_MIN_AGE, dry_run=False):
+    """Remove the expired shared values and the least recently used ones
+    above max_bytes
+
+    :param root_dir: the shared functions directory, by default the file
+        storage one
+    :param max_bytes: the maximum total size of the kept values
+    :param min_age: the lock files modified since less than this number of
+        seconds are kept
+    :param dry_run: whether to only report the files to remove
+    :return: a dict of the number of removed files and bytes
+    """
+    stats = _new_stats()
+    if root_dir is None:
+        root_dir = file_storage._get_root_dir(create=False)
+    if not os.path.isdir(root_dir):
+        return stats
+    database_path = os.path.join(root_dir, sqlite_storage.DATABASE_NAME)
+    if os.path.exists(database_path) and not dry_run:
+        deleted = sqlite_storage.SQLiteStorageHandler(database_path=database_path).delete_expired()
+        logger.debug(f'garbage collector: deleted {deleted} expired sqlite storage values')
+    now = time.time()
+    values = []
+    for entry in os.scandir(root_dir):
+        if not entry.is_file() or entry.name.startswith(sqlite_storage.DATABASE_NAME):
+            continue
+        if entry.name.startswith('.'):
+            # a temporary value file left by a killed process
+            if not _is_recent(entry.path, min_age):
+                _remove(entry.path, stats, dry_run)
+        elif entry.name.endswith(_LOCK_EXT):
+            value_path = entry.path[: -len(_LOCK_EXT)]
+            if not os.path.exists(value_path) and not _is_recent(entry.path, min_age):
+                try:
+                    with _acquired(entry.path):
+                        _remove(entry.path, stats, dry_run)
+                except _LockHeld:
+                    pass
+        else:
+            stat = entry.stat()
+            values.append((max(stat.st_atime, stat.st_mtime), stat.st_size, entry.path))
+
+    def remove_value(value_path):
+        lock_path = f'{value_path}{_LOCK_EXT}'
+        try:
+            with _acquired(lock_path):
+                _remove(value_path, stats, dry_run)
+                # a recent lock file may be opened by a process about to lock
+                # it, it is removed by a later collect
+                if not _is_recent(lock_path, min_age):
+                    _remove(lock_path, stats, dry_run)
+        except _LockHeld:
+            return False
+        return True
+
+    kept_values = []
+    for value in sorted(values):
+        expire_time = _get_expire_time(value[2])
+        if (expire_time is None and not _is_recent(value[2], min_age)) or (
+            expire_time is not None and expire_time <= now
+        ):
+            if remove_value(value[2]):
+                continue
+        kept_values.append(value)
+    if max_bytes is not None:
+        total_bytes = sum(size for _, size, _ in kept_values)
+        # the least recently used values are removed first
+        for _, size, value_path in kept_values:
+            if total_bytes <= max_bytes:
+                break
+            if remove_value(value_path):
+                total_bytes -= size
+    return stats
+
+
+def collect_lock_functions(lock_dir=None, min_age=GC_MIN_AGE, dry_run=False):
+    """Remove the function lock files not held and the empty scope
+    directories
+
+    :param lock_dir: the functions lock directory, by default the function
+        locker one
+    :param min_age: the lock files modified since less than this number of
+        seconds are kept
+    :param dry_run: whether to only report the files to remove
+    :return: a dict of the number of removed files and bytes
+    """
+    stats = _new_stats()
+    if lock_dir is None:
+        lock_dir = func_locker._get_temp_lock_function_dir(create=False)
+    if not os.path.isdir(lock_dir):
+        return stats
+    for dir_path, dir_names, file_names in os.walk(lock_dir, topdown=False):
+        for file_name in file_names:
+            lock_path = os.path.join(dir_path, file_name)
+            if not file_name.endswith(_LOCK_EXT) or _is_recent(lock_path, min_age):
+                continue
+            try:
+                with _acquired(lock_path):
+                    _remove(lock_path, stats, dry_run)
+            except _LockHeld:
+                pass
+        if dir_path != lock_dir and not dry_run:
+            try:
+                os.rmdir(dir_path)
+            except OSError:
+                # not empty
+                pass
+    return stats
+
+
+def collect(max_bytes=None, min_age=GC_MIN_AGE, dry_run=False):
+    """Collect the shared functions and the function locks temp files
+
+    :return: a dict of the number of removed files and bytes
+    """
+    stats = _new_stats()
+    for collect_stats in (
+        collect_shared_functions(max_bytes=max_bytes, min_age=min_age, dry_run=dry_run),
+        collect_lock_functions(min_age=min_age, dry_run=dry_run),
+    ):
+        for name, count in collect_stats.items():
+            stats[name] += count
+    logger.info(
+        'garbage collector: removed {removed_files} files, {removed_bytes} bytes'.format(**stats)
+    )
+    return stats
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--max-bytes', type=int, default=None, help='the maximum size of the shared values'
+    )
+    parser.add_argument(
+        '--min-age',
+        type=int,
+        default=GC_MIN_AGE,
+        help='keep the lock files modified since less than this number of seconds',
+    )
+    parser.add_argument('--dry-run', action='store_true', help='do not remove any file')
+    args = parser.parse_args(args)
+    settings.configure()
+    stats = collect(max_bytes=args.max_bytes, min_age=args.min_age, dry_run=args.dry_run)
+    print('removed {removed_files} files, {removed_bytes} bytes'.format(**stats))
+
+
+if __name__ == '__main__':
+    main()
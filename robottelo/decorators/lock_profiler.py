@@ -0,0 +1,129 @@
+"""Contention profiler of the function locks.
+
+Each lock acquire of ``robottelo.decorators.func_locker`` records the time
+spent waiting for the lock, whether the lock was acquired or the wait timed
+out, the time the lock was held, the process id of the lock holder when the
+wait started, the PID of the acquiring process and the current test node id.
+The ``pytest_plugins.lock_profiler`` plugin merges the records of the xdist
+workers and reports the hottest locks and the tests that spent the most time
+blocked.
+"""
+import os
+import threading
+from collections import defaultdict
+
+_records = []
+_records_lock = threading.Lock()
+
+
+def get_current_test():
+    """Return the node id of the running test, None outside of a test"""
+    current_test = os.environ.get('PYTEST_CURRENT_TEST')
+    if not current_test:
+        return None
+    # the value is "<nodeid> (<stage>)"
+    return current_test.rsplit(' ', 1)[0]
+
+
+def record(lock_name, wait_time, hold_time, holder_pid=None, nodeid=None, acquired=True):
+    """Record a lock acquire
+
+    :param lock_name: the lock identity
+    :param wait_time: the seconds spent waiting for the lock
+    :param hold_time: the seconds the lock was held
+    :param holder_pid: the process id of the lock holder when the wait
+        started, if any, prefixed with the host name with the redis backend,
+        the comma separated process ids of the holders of a full semaphore
+    :param nodeid: the node id of the test that acquired the lock
+    :param acquired: False if the wait for the lock failed or timed out
+    """
+    with _records_lock:
+        _records.append(
+            dict(
+                lock=lock_name,
+                wait_time=wait_time,
+                hold_time=hold_time,
+                pid=os.getpid(),
+                holder_pid=holder_pid,
+                nodeid=nodeid,
+                acquired=acquired,
+            )
+        )
+
+
+def get_records():
+    """Return a copy of the process records"""
+    with _records_lock:
+        return [dict(lock_record) for lock_record in _records]
+
+
+def reset():
+    """Clear the process records"""
+    with _records_lock:
+        del _records[:]
+
+
+def summarize(records):
+    """Return the locks and the tests summaries of the records, ranked by
+    the time spent waiting
+
+    :return: a tuple of two lists of dicts, the locks summaries with the lock
+        name, acquires, timed out waits, contended acquires and waits, total
+        and max wait time and total hold time, and the tests summaries with
+        the test node id, acquires, timed out waits and total wait time
+    """
+    locks = defaultdict(
+        lambda: dict(
+            acquires=0, timeouts=0, contended=0, wait_time=0, max_wait_time=0, hold_time=0
+        )
+    )
+    tests = defaultdict(lambda: dict(acquires=0, timeouts=0, wait_time=0))
+    for lock_record in records:
+        outcome = 'acquires' if lock_record['acquired'] else 'timeouts'
+        lock_summary = locks[lock_record['lock']]
+        lock_summary[outcome] += 1
+        lock_summary['contended'] += int(lock_record['holder_pid'] is not None)
+        lock_summary['wait_time'] += lock_record['wait_time']
+        lock_summary['max_wait_time'] = max(
+            lock_summary['max_wait_time'], lock_record['wait_time']
+        )
+        lock_summary['hold_time'] += lock_record['hold_time']
+        test_summary = tests[lock_record['nodeid'] or '<no test>']
+        test_summary[outcome] += 1
+        test_summary['wait_time'] += lock_record['wait_time']
+    locks = [dict(summary, lock=name) for name, summary in locks.items()]
+    tests = [dict(summary, nodeid=nodeid) for nodeid, summary in tests.items()]
+    return (
+        sorted(locks, key=lambda summary: summary['wait_time'], reverse=True),
+        sorted(tests, key=lambda summary: summary['wait_time'], reverse=True),
+    )
+
+
+def format_report(records, limit=None):
+    """Return the report lines of the hottest locks and the most blocked
+    tests
+
+    :param records: the lock acquires records
+    :param limit: the maximum number of locks and tests to report
+    """
+    locks, tests = summarize(records)
+    lines = [
+        'hottest locks:',
+        '{:>8} {:>8} {:>9} {:>10} {:>12} {:>10}  {}'.format(
+            'acquires', 'timeouts', 'contended', 'wait (s)', 'max wait (s)', 'hold (s)', 'lock'
+        ),
+    ]
+    for summary in locks[:limit]:
+        lines.append(
+            '{acquires:>8} {timeouts:>8} {contended:>9} {wait_time:>10.2f}'
+            ' {max_wait_time:>12.2f} {hold_time:>10.2f}  {lock}'.format(**summary)
+        )
+    lines.extend(
+        [
+            'most blocked tests:',
+            '{:>8} {:>8} {:>10}  {}'.format('acquires', 'timeouts', 'wait (s)', 'test'),
+        ]
+    )
+    for summary in tests[:limit]:
+        lines.append('{acquires:>8} {timeouts:>8} {wait_time:>10.2f}  {nodeid}'.format(**summary))
+    return lines
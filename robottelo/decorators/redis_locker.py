@@ -0,0 +1,367 @@
+"""Redis backend of the function locker.
+
+The function locks are shared by all the runner hosts using the same redis
+server, so that a run sharded on several machines against the same Satellite
+is still exclusive.
+
+- lease: a lock expires ``lease_time`` seconds after its last renewal, a
+  thread of the holder renews it every third of the lease, so that the locks
+  of a killed process or of a lost host are released.
+- fencing token: each acquire of a lock increments the lock token, the holder
+  can check with :meth:`RedisLock.check` that its lease was not lost, before
+  an operation that must not overlap an other holder.
+
+The function semaphores let at most a number of holders in, the holders and
+the waiters are members of sorted sets scored by their lease expiry time, in
+the redis server time so that the runner hosts clocks do not matter.
+
+The waiters are notified of the lock release on the lock channel.
+"""
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+from robottelo.decorators.func_shared import redis_storage
+
+logger = logging.getLogger('robottelo')
+
+KEY_PREFIX = 'robottelo.lock_function'
+LEASE_TIME = 60
+# the maximum number of seconds between two lock acquire attempts, when no
+# notification is received
+LOCK_POLL_RATE = 1
+
+_RELEASED_MESSAGE = 'released'
+_TOKEN_SEPARATOR = '|'
+
+# set the lock with the next fencing token if the lock is free, return the token
+_ACQUIRE_SCRIPT = '''
+if redis.call('exists', KEYS[1]) == 1 then
+    return nil
+end
+local token = redis.call('incr', KEYS[2])
+redis.call('set', KEYS[1], ARGV[1] .. ARGV[2] .. token, 'PX', ARGV[3])
+return token
+'''
+_RENEW_SCRIPT = '''
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+'''
+_RELEASE_SCRIPT = '''
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    redis.call('del', KEYS[1])
+    redis.call('publish', KEYS[2], ARGV[2])
+    return 1
+end
+return 0
+'''
+# the lease expiry time of the semaphore members in the redis server time
+_SEMAPHORE_EXPIRY = '''
+local time = redis.call('time')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local expiry = now + tonumber(ARGV[2])
+'''
+# remove the expired holders and waiters, add the member to the holders if
+# less than the limit, to the waiters otherwise, return whether the member is
+# a holder
+_SEMAPHORE_ACQUIRE_SCRIPT = (
+    _SEMAPHORE_EXPIRY
+    + '''
+redis.call('zremrangebyscore', KEYS[1], '-inf', now)
+redis.call('zremrangebyscore', KEYS[2], '-inf', now)
+if redis.call('zcard', KEYS[1]) < tonumber(ARGV[3]) then
+    redis.call('zadd', KEYS[1], expiry, ARGV[1])
+    redis.call('zrem', KEYS[2], ARGV[1])
+    return 1
+end
+redis.call('zadd', KEYS[2], expiry, ARGV[1])
+return 0
+'''
+)
+_SEMAPHORE_RENEW_SCRIPT = (
+    _SEMAPHORE_EXPIRY
+    + '''
+if redis.call('zscore', KEYS[1], ARGV[1]) then
+    return redis.call('zadd', KEYS[1], 'XX', 'CH', expiry, ARGV[1]) + 1
+end
+return 0
+'''
+)
+_SEMAPHORE_RELEASE_SCRIPT = '''
+local removed = redis.call('zrem', KEYS[1], ARGV[1])
+redis.call('publish', KEYS[2], ARGV[2])
+return removed
+'''
+
+
+class RedisLockError(Exception):
+    """Redis function lock related exception"""
+
+
+def get_process_id():
+    """Return the identity of the current process on all the runner hosts"""
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+class RedisLock:
+    """An acquired redis function lock, renewed until released"""
+
+    def __init__(self, backend, name, token, lease_time):
+        self.name = name
+        self.token = token
+        self.value = f'{get_process_id()}{_TOKEN_SEPARATOR}{token}'
+        self._backend = backend
+        self._lease_time = lease_time
+        self._stopped = threading.Event()
+        self._renewer = threading.Thread(target=self._renew, daemon=True)
+        self.lost = False
+
+    def _renew_lease(self):
+        """Extend the lock lease, return whether the lock is still held"""
+        return self._backend._renew_script(
+            keys=[self._backend.get_key(self.name)],
+            args=[self.value, int(self._lease_time * 1000)],
+        )
+
+    def _renew(self):
+        while not self._stopped.wait(self._lease_time / 3):
+            try:
+                renewed = self._renew_lease()
+            except redis.exceptions.RedisError as exp:
+                # the lease may still be renewed before it expires
+                logger.warning(f'function lock "{self.name}" lease renewal failed: {exp}')
+                continue
+            if not renewed:
+                self.lost = True
+                logger.error(f'function lock "{self.name}" lease lost')
+                return
+
+    def is_held(self):
+        return self._backend.client.get(self._backend.get_key(self.name)) == self.value.encode()
+
+    def check(self):
+        """Raise RedisLockError if the lock lease was lost, and the lock may
+        be held by an other process
+        """
+        if self.lost or not self.is_held():
+            raise RedisLockError(
+                f'function lock "{self.name}" with fencing token {self.token} not held'
+            )
+
+    def start(self):
+        self._renewer.start()
+
+    def _release(self):
+        return self._backend._release_script(
+            keys=[self._backend.get_key(self.name), self._backend.get_channel(self.name)],
+            args=[self.value, _RELEASED_MESSAGE],
+        )
+
+    def release(self):
+        """Stop the lease renewal and release the lock, return whether the
+        lock was still held
+        """
+        self._stopped.set()
+        self._renewer.join()
+        return bool(self._release())
+
+
+class RedisSemaphoreSlot(RedisLock):
+    """An acquired slot of a redis function semaphore, renewed until
+    released
+    """
+
+    def __init__(self, backend, name, member, lease_time):
+        super().__init__(backend, name, None, lease_time)
+        self.value = member
+
+    def _renew_lease(self):
+        return self._backend._semaphore_renew_script(
+            keys=[self._backend.get_holders_key(self.name)],
+            args=[self.value, self._lease_time],
+        )
+
+    def is_held(self):
+        return (
+            self._backend.client.zscore(self._backend.get_holders_key(self.name), self.value)
+            is not None
+        )
+
+    def _release(self):
+        return self._backend._semaphore_release_script(
+            keys=[self._backend.get_holders_key(self.name), self._backend.get_channel(self.name)],
+            args=[self.value, _RELEASED_MESSAGE],
+        )
+
+
+class RedisLockBackend:
+    """Function locker backend of the locks shared with redis"""
+
+    def __init__(
+        self,
+        host=redis_storage.REDIS_HOST,
+        port=redis_storage.REDIS_PORT,
+        db=redis_storage.REDIS_DB,
+        password=redis_storage.REDIS_PASSWORD,
+        lease_time=LEASE_TIME,
+    ):
+        if redis is None:
+            raise RedisLockError('the redis function lock backend needs the python redis package')
+        self._lease_time = lease_time
+        self._client = redis.StrictRedis(
+            connection_pool=redis_storage._get_connection_pool(host, port, db, password)
+        )
+        self._acquire_script = self._client.register_script(_ACQUIRE_SCRIPT)
+        self._renew_script = self._client.register_script(_RENEW_SCRIPT)
+        self._release_script = self._client.register_script(_RELEASE_SCRIPT)
+        self._semaphore_acquire_script = self._client.register_script(_SEMAPHORE_ACQUIRE_SCRIPT)
+        self._semaphore_renew_script = self._client.register_script(_SEMAPHORE_RENEW_SCRIPT)
+        self._semaphore_release_script = self._client.register_script(_SEMAPHORE_RELEASE_SCRIPT)
+
+    @property
+    def client(self):
+        return self._client
+
+    @staticmethod
+    def get_key(name):
+        return f'{KEY_PREFIX}:{name}'
+
+    @classmethod
+    def get_channel(cls, name):
+        return f'{cls.get_key(name)}.channel'
+
+    @classmethod
+    def get_holders_key(cls, name):
+        return f'{cls.get_key(name)}.holders'
+
+    @classmethod
+    def get_waiters_key(cls, name):
+        return f'{cls.get_key(name)}.waiters'
+
+    @staticmethod
+    def get_process_id():
+        return get_process_id()
+
+    def get_holder(self, name):
+        """Return the process id of the lock holder, None if the lock is free"""
+        value = self.client.get(self.get_key(name))
+        if value is None:
+            return None
+        return value.decode().rsplit(_TOKEN_SEPARATOR, 1)[0]
+
+    def _acquire(self, name):
+        """Return the fencing token of the acquired lock, None if the lock is
+        held by an other process
+        """
+        return self._acquire_script(
+            keys=[self.get_key(name), f'{self.get_key(name)}.token'],
+            args=[get_process_id(), _TOKEN_SEPARATOR, int(self._lease_time * 1000)],
+        )
+
+    def _wait(self, name, acquire, timeout):
+        """Call acquire until it returns a value other than None, wake up
+        when the lock is released
+
+        :raises RedisLockError: if not acquired after timeout seconds
+        """
+        end_time = time.time() + timeout
+        pubsub = None
+        try:
+            result = acquire()
+            while result is None:
+                if pubsub is None:
+                    # subscribe before the next attempt to not miss the
+                    # notifications
+                    pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                    pubsub.subscribe(self.get_channel(name))
+                else:
+                    remaining = end_time - time.time()
+                    if remaining <= 0:
+                        raise RedisLockError(f'timeout waiting for function lock "{name}"')
+                    pubsub.get_message(timeout=min(remaining, LOCK_POLL_RATE))
+                result = acquire()
+        finally:
+            if pubsub is not None:
+                pubsub.close()
+        return result
+
+    @contextmanager
+    def lock(self, name, timeout):
+        """Return the lock context manager, the lock is renewed until the
+        context exit
+
+        :raises RedisLockError: if the lock is not acquired after timeout
+            seconds
+        """
+        token = self._wait(name, lambda: self._acquire(name), timeout)
+        lock = RedisLock(self, name, token, self._lease_time)
+        lock.start()
+        try:
+            yield lock
+        finally:
+            if not lock.release():
+                logger.error(
+                    f'function lock "{name}" with fencing token {token} released after its'
+                    ' lease was lost, an other process may have held it'
+                )
+
+    def _acquire_slot(self, name, member, limit):
+        """Return True if a semaphore slot is acquired, None if the member
+        is queued in the waiters
+        """
+        acquired = self._semaphore_acquire_script(
+            keys=[self.get_holders_key(name), self.get_waiters_key(name)],
+            args=[member, self._lease_time, limit],
+        )
+        return True if acquired else None
+
+    @contextmanager
+    def semaphore(self, name, limit, timeout):
+        """Return the semaphore context manager, at most limit holders are
+        in, the slot is renewed until the context exit
+
+        :raises RedisLockError: if no slot is acquired after timeout seconds
+        """
+        member = f'{get_process_id()}{_TOKEN_SEPARATOR}{uuid.uuid4().hex}'
+        try:
+            self._wait(name, lambda: self._acquire_slot(name, member, limit), timeout)
+        except BaseException:
+            self.client.zrem(self.get_waiters_key(name), member)
+            raise
+        slot = RedisSemaphoreSlot(self, name, member, self._lease_time)
+        slot.start()
+        try:
+            yield slot
+        finally:
+            if not slot.release():
+                logger.error(
+                    f'function semaphore "{name}" slot released after its lease was lost,'
+                    ' an other process may have held it'
+                )
+
+    def get_server_time(self):
+        """Return the redis server time in seconds since the epoch"""
+        seconds, microseconds = self.client.time()
+        return seconds + microseconds / 1000000
+
+    def get_holders(self, name):
+        """Return the process ids of the semaphore holders"""
+        members = self.client.zrangebyscore(
+            self.get_holders_key(name), self.get_server_time(), '+inf'
+        )
+        return [member.decode().rsplit(_TOKEN_SEPARATOR, 1)[0] for member in members]
+
+    def get_queue_depth(self, name):
+        """Return the number of processes waiting for a semaphore slot"""
+        return self.client.zcount(self.get_waiters_key(name), self.get_server_time(), '+inf')
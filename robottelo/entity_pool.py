@@ -0,0 +1,177 @@
+"""Pre-warmed entities pool.
+
+Creating some common entities, like organizations, is slow and done at the
+start of almost every test module. An entity pool keeps a number of fresh
+entities, created asynchronously in background threads while the tests are
+running, so that they can be handed out instantly. The pools are per process
+(per xdist worker) and the entities not handed out are deleted when the pool
+is reclaimed. An entity is handed out once, the ``hand_out`` callable of the
+pool receives it, ex: to track it for cleanup with the test resources.
+
+Usage::
+
+    from robottelo import entity_pool
+    from robottelo.cleanup import RESOURCES
+
+    entity_pool.register_pool(
+        'org',
+        lambda: entities.Organization().create(),
+        cleanup=lambda org: org.delete(),
+        hand_out=lambda org: RESOURCES.track('Organization', org.id, org.delete),
+        size=2,
+    )
+
+    # return a pooled entity or None if no pool registered with that name
+    org = entity_pool.get_entity('org')
+
+    # at session end
+    entity_pool.reclaim_pools()
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger('robottelo')
+
+POOL_DEFAULT_SIZE = 2
+
+_pools = {}
+
+
+class EntityPoolError(Exception):
+    """Entity pool related exception"""
+
+
+class EntityPool:
+    """Keep ``size`` entities created in background by ``factory``"""
+
+    def __init__(self, name, factory, cleanup=None, hand_out=None, size=POOL_DEFAULT_SIZE):
+        if size < 1:
+            raise EntityPoolError(f'pool "{name}" size must be greater than 0')
+        self._name = name
+        self._factory = factory
+        self._cleanup = cleanup
+        self._hand_out = hand_out
+        self._size = size
+        self._futures = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self._executor = ThreadPoolExecutor(
+            max_workers=size, thread_name_prefix=f'entity_pool_{name}'
+        )
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def _create(self):
+        logger.debug(f'entity pool "{self.name}": creating a new entity')
+        return self._factory()
+
+    def fill(self):
+        """Start the creation of the missing pool entities"""
+        with self._lock:
+            while not self._closed and len(self._futures) < self._size:
+                self._futures.append(self._executor.submit(self._create))
+
+    def get(self):
+        """Return an entity from the pool, the ones already created first.
+
+        If the pool is closed or the pooled entity creation failed, the entity
+        is created synchronously. The entity is passed to the pool
+        ``hand_out`` callable before being returned.
+        """
+        with self._lock:
+            future = next((future for future in self._futures if future.done()), None)
+            if future is None and self._futures:
+                future = self._futures[0]
+            if future is not None:
+                self._futures.remove(future)
+        # replace the handed out entity
+        self.fill()
+        if future is None:
+            entity = self._create()
+        else:
+            try:
+                entity = future.result()
+            except Exception as err:
+                logger.warning(f'entity pool "{self.name}": pooled entity creation failed: {err}')
+                entity = self._create()
+        if self._hand_out is not None:
+            self._hand_out(entity)
+        return entity
+
+    def reclaim(self):
+        """Close the pool and delete the entities that were not handed out"""
+        with self._lock:
+            self._closed = True
+            futures = self._futures
+            self._futures = []
+        for future in futures:
+            if future.cancel():
+                continue
+            try:
+                entity = future.result()
+            except Exception as err:
+                logger.warning(f'entity pool "{self.name}": pooled entity creation failed: {err}')
+                continue
+            if self._cleanup is None:
+                continue
+            try:
+                self._cleanup(entity)
+            except Exception as err:
+                logger.warning(f'entity pool "{self.name}": entity cleanup failed: {err}')
+        self._executor.shutdown(wait=True)
+
+
+def register_pool(name, factory, cleanup=None, hand_out=None, size=POOL_DEFAULT_SIZE, fill=True):
+    """Register a new entities pool and start filling it
+
+    :type name: str
+    :type factory: callable
+    :type cleanup: callable
+    :type hand_out: callable
+    :type size: int
+    :type fill: bool
+
+    :param name: the pool name used to get the entities
+    :param factory: a callable without arguments that create a new entity
+    :param cleanup: a callable that receive an unused entity to delete it
+    :param hand_out: a callable that receive each handed out entity, ex: to
+        track it for cleanup
+    :param size: the number of entities to keep ready
+    :param fill: whether to start creating the pool entities immediately
+    :return: the registered pool
+    """
+    if name in _pools and not _pools[name].closed:
+        raise EntityPoolError(f'pool "{name}" already registered')
+    pool = EntityPool(name, factory, cleanup=cleanup, hand_out=hand_out, size=size)
+    _pools[name] = pool
+    if fill:
+        pool.fill()
+    return pool
+
+
+def get_entity(name):
+    """Return an entity from the pool name, None if the pool does not exist or
+    is closed
+    """
+    pool = _pools.get(name)
+    if pool is None or pool.closed:
+        return None
+    return pool.get()
+
+
+def reclaim_pools():
+    """Reclaim and unregister all the pools"""
+    while _pools:
+        _, pool = _pools.popitem()
+        pool.reclaim()
@@ -1,15 +1,20 @@
 """Several helper methods and functions."""
 import contextlib
+import hashlib
 import logging
 import os
 import random
 import re
+import threading
+import time
+from collections import OrderedDict
 from tempfile import mkstemp
 from urllib.parse import urljoin  # noqa
 
 import requests
 from nailgun.config import ServerConfig
 
+from robottelo import http_sessions
 from robottelo import ssh
 from robottelo.cli.base import CLIReturnCodeError
 from robottelo.cli.proxy import CapsuleTunnelError
@@ -21,6 +26,11 @@ from robottelo.errors import GCECertNotFoundError
 
 LOGGER = logging.getLogger('robottelo')
 
+# the maximum number of authenticated web sessions kept per worker
+WEB_SESSION_POOL_SIZE = 8
+# a kept web session is checked to be authenticated after 5 minutes
+WEB_SESSION_REVALIDATE = 300
+
 
 class DataFileError(Exception):
     """Indicates any issue when reading a data file."""
@@ -69,7 +79,7 @@ class ServerFileDownloader:
         if not self.file_downloaded:  # pragma: no cover
             self.fd, self.file_path = mkstemp(suffix=f'.{extention}')
             fileobj = os.fdopen(self.fd, 'wb')
-            fileobj.write(requests.get(fileurl).content)
+            fileobj.write(http_sessions.get(fileurl, retry_statuses=True).content)
             fileobj.close()
             if os.path.exists(self.file_path):
                 self.file_downloaded = True
@@ -104,7 +114,7 @@ def file_downloader(file_url, local_path=None, file_name=None, hostname=None):
     # download on localhost
     if hostname is None:
         with open(f'{local_path}{file_name}', 'wb') as fileobj:
-            r = requests.get(file_url)
+            r = http_sessions.get(file_url, retry_statuses=True)
             r.raise_for_status()
             fileobj.write(r.content)
             fileobj.close()
@@ -641,8 +651,8 @@ def extract_ui_token(input):
         return token[1]
 
 
-def get_web_session():
-    """Logs in as admin user and returns the valid requests.Session object"""
+def _web_login(login, password):
+    """Logs in the Satellite web UI and returns the requests.Session object"""
     sat_session = requests.Session()
     url = f'https://{settings.server.hostname}'
 
@@ -651,8 +661,8 @@ def get_web_session():
         f'{url}/users/login',
         data={
             'authenticity_token': extract_ui_token(init_request.text),
-            'login[login]': settings.server.admin_username,
-            'login[password]': settings.server.admin_password,
+            'login[login]': login,
+            'login[password]': password,
             'commit': 'Log In',
         },
         verify=False,
@@ -663,6 +673,90 @@ def get_web_session():
     return sat_session
 
 
+class WebSessionPool:
+    """Keep the authenticated web UI sessions by Satellite and user, so that
+    the login is done once per worker instead of once per call.
+
+    :param max_size: the maximum number of sessions kept, the least recently
+        used session is closed first
+    :param revalidate_after: the number of seconds after which a session is
+        checked to be still authenticated before being reused
+    """
+
+    def __init__(self, max_size=WEB_SESSION_POOL_SIZE, revalidate_after=WEB_SESSION_REVALIDATE):
+        self._max_size = max_size
+        self._revalidate_after = revalidate_after
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    @staticmethod
+    def _is_authenticated(sat_session):
+        """Whether the session cookies are not expired and still accepted"""
+        if not sat_session.cookies or any(cookie.is_expired() for cookie in sat_session.cookies):
+            return False
+        response = sat_session.get(
+            f'https://{settings.server.hostname}/', verify=False, allow_redirects=False
+        )
+        return response.status_code == 200
+
+    def get(self, login, password):
+        """Return an authenticated session of the user, login if needed
+
+        The sessions are kept by password too, so that a call with an other
+        password never reuses a session authenticated with the previous one.
+        """
+        key = (
+            settings.server.hostname,
+            login,
+            hashlib.sha256(str(password).encode()).hexdigest(),
+        )
+        with self._lock:
+            entry = self._sessions.pop(key, None)
+        if entry is not None:
+            sat_session, validated_time = entry
+            if time.time() - validated_time < self._revalidate_after:
+                pass
+            elif self._is_authenticated(sat_session):
+                validated_time = time.time()
+            else:
+                LOGGER.debug(f'web session of user {login} expired')
+                sat_session.close()
+                entry = None
+        if entry is None:
+            sat_session, validated_time = _web_login(login, password), time.time()
+        with self._lock:
+            self._sessions[key] = (sat_session, validated_time)
+            while len(self._sessions) > self._max_size:
+                _, (evicted_session, _) = self._sessions.popitem(last=False)
+                evicted_session.close()
+        return sat_session
+
+    def clear(self):
+        """Close and remove all the sessions"""
+        with self._lock:
+            while self._sessions:
+                _, (sat_session, _) = self._sessions.popitem()
+                sat_session.close()
+
+
+web_sessions = WebSessionPool()
+
+
+def get_web_session(login=None, password=None):
+    """Returns a valid requests.Session object logged in as the user, admin
+    user by default.
+
+    Note: the session is shared, the login is done once per worker and
+        user while the session is still authenticated.
+    """
+    if login is None:
+        login, password = settings.server.admin_username, settings.server.admin_password
+    return web_sessions.get(login, password)
+
+
 def host_provisioning_check(ip_addr):
     """Check the provisioned host status by pinging the ip of host and check
     to connect to ssh port
@@ -0,0 +1,184 @@
+"""Pooled http sessions registry.
+
+Calling ``requests.get``/``requests.post`` directly opens new TCP and TLS
+connections for each request. The registry keeps one ``requests.Session`` per
+host (scheme, hostname and port) with a tuned connection pool, keep-alive and
+a retry adapter, so that the connections to the same host are reused.
+
+The sessions retry the connection errors, and the read errors of the GET and
+HEAD requests. The 5xx responses are only retried for the callers asking for
+it with ``retry_statuses=True``, eg. the CDN downloads and the Pulp tasks
+search, the other callers, like nailgun, get the responses as they are.
+
+The sessions do not persist cookies, a request made with a registry session
+behaves like a request made with the ``requests`` functions, the credentials
+are passed with each request.
+
+Usage::
+
+    from robottelo import http_sessions
+
+    response = http_sessions.get_session(url).get(url, verify=False)
+
+    # or with the requests like helpers
+    response = http_sessions.get(url, verify=False)
+"""
+import logging
+import threading
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger('robottelo')
+
+# the number of connections kept open to the same host
+HTTP_POOL_MAXSIZE = 16
+# the number of retries on connection errors and on HTTP_RETRY_STATUSES
+HTTP_RETRIES = 3
+HTTP_RETRY_BACKOFF = 0.5
+HTTP_RETRY_STATUSES = (502, 503, 504)
+# the methods retried on read errors and on HTTP_RETRY_STATUSES
+HTTP_RETRY_METHODS = frozenset({'GET', 'HEAD'})
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def _get_host_key(url):
+    """Return the (scheme, netloc) key of url"""
+    parts = urlsplit(url)
+    return parts.scheme.lower(), parts.netloc.lower()
+
+
+def create_session(
+    pool_maxsize=HTTP_POOL_MAXSIZE,
+    retries=HTTP_RETRIES,
+    backoff_factor=HTTP_RETRY_BACKOFF,
+    status_forcelist=(),
+    allowed_methods=HTTP_RETRY_METHODS,
+):
+    """Return a new ``requests.Session`` with a tuned connection pool and a
+    retry adapter, that does not persist cookies.
+
+    Note: the connection errors are retried for all the methods, the read
+        errors and the statuses in status_forcelist only for allowed_methods.
+    """
+    session = requests.Session()
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=status_forcelist,
+        allowed_methods=allowed_methods,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def get_session(url, retry_statuses=False, retry_methods=HTTP_RETRY_METHODS):
+    """Return the registry session of the url host, create it if needed
+
+    :param url: the url of the host
+    :param retry_statuses: whether the session retries the responses with a
+        status in HTTP_RETRY_STATUSES
+    :param retry_methods: the methods retried on read errors and statuses
+    """
+    retry_methods = frozenset(retry_methods)
+    key = _get_host_key(url) + (retry_statuses, retry_methods)
+    session = _sessions.get(key)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(key)
+            if session is None:
+                logger.debug('http sessions: new session for {}://{}'.format(*key))
+                session = _sessions[key] = create_session(
+                    status_forcelist=HTTP_RETRY_STATUSES if retry_statuses else (),
+                    allowed_methods=retry_methods,
+                )
+    return session
+
+
+def close_sessions():
+    """Close and unregister all the registry sessions"""
+    with _sessions_lock:
+        while _sessions:
+            _, session = _sessions.popitem()
+            session.close()
+
+
+def request(method, url, retry_statuses=False, **kwargs):
+    """Send a request with the url host session, same as ``requests.request``
+
+    :param retry_statuses: whether to retry the responses with a status in
+        HTTP_RETRY_STATUSES, the request method is retried too, only for the
+        idempotent requests
+    """
+    retry_methods = HTTP_RETRY_METHODS
+    if retry_statuses:
+        retry_methods = retry_methods | {method.upper()}
+    return get_session(url, retry_statuses=retry_statuses, retry_methods=retry_methods).request(
+        method, url, **kwargs
+    )
+
+
+def head(url, **kwargs):
+    kwargs.setdefault('allow_redirects', False)
+    return request('HEAD', url, **kwargs)
+
+
+def get(url, params=None, **kwargs):
+    kwargs.setdefault('allow_redirects', True)
+    return request('GET', url, params=params, **kwargs)
+
+
+def post(url, data=None, json=None, **kwargs):
+    return request('POST', url, data=data, json=json, **kwargs)
+
+
+def put(url, data=None, **kwargs):
+    return request('PUT', url, data=data, **kwargs)
+
+
+def patch(url, data=None, **kwargs):
+    return request('PATCH', url, data=data, **kwargs)
+
+
+def delete(url, **kwargs):
+    return request('DELETE', url, **kwargs)
+
+
+class _RequestsProxy:
+    """A ``requests`` module replacement that sends the requests with the
+    registry sessions, the other attributes are the ``requests`` module ones.
+    """
+
+    request = staticmethod(request)
+    head = staticmethod(head)
+    get = staticmethod(get)
+    post = staticmethod(post)
+    put = staticmethod(put)
+    patch = staticmethod(patch)
+    delete = staticmethod(delete)
+
+    def __getattr__(self, name):
+        return getattr(requests, name)
+
+
+def configure_nailgun():
+    """Make nailgun send its requests with the registry sessions
+
+    ``nailgun.config.ServerConfig`` does not hold an http session, the nailgun
+    client calls the ``requests`` module functions, they are replaced by the
+    registry sessions ones. The nailgun requests are not retried on 5xx
+    responses, the API tests get them as they are.
+    """
+    from nailgun import client
+
+    if not isinstance(client.requests, _RequestsProxy):
+        client.requests = _RequestsProxy()
@@ -1,11 +1,11 @@
 import logging
 import re
 
-import requests
 from tenacity import retry
 from tenacity import stop_after_attempt
 from tenacity import wait_fixed
 
+from robottelo import http_sessions
 from robottelo.config import settings
 
 LOGGER = logging.getLogger('robottelo')
@@ -81,7 +81,7 @@ class ReportPortal:
         :returns dict: The json of all RP launches
         """
         params = {'page.page': 1, 'page.size': 500, 'page.sort': 'start_time'}
-        resp = requests.get(
+        resp = http_sessions.get(
             url=f'{self.api_url}/launch', headers=self.headers, params=params, verify=False
         )
         resp.raise_for_status()
@@ -226,7 +226,7 @@ class Launch:
             each tests properties in a page
         """
         params['page.page'] = page
-        resp = requests.get(
+        resp = http_sessions.get(
             url=f'{self.report_portal.api_url}/item',
             headers=self.report_portal.headers,
             params=params,
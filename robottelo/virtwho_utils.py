@@ -3,8 +3,7 @@ import json
 import re
 import uuid
 
-import requests
-
+from robottelo import http_sessions
 from robottelo import ssh
 from robottelo.cli.base import Base
 from robottelo.cli.host import Host
@@ -385,7 +384,7 @@ def create_fake_hypervisor_content(org_label, hypervisors, guests):
     data = hypervisor_json_create(hypervisors, guests)
     url = f"https://{settings.server.hostname}/rhsm/hypervisors/{org_label}"
     auth = (settings.server.admin_username, settings.server.admin_password)
-    result = requests.post(url, auth=auth, verify=False, json=data)
+    result = http_sessions.post(url, auth=auth, verify=False, json=data)
     assert result.status_code == 200
     return data
 
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""Benchmark the encodings of the shared functions values.
+
+Encode and decode realistic shared results (an organization with its
+repositories, a content view with many versions) with each available
+serializer and compression::
+
+    python scripts/shared_encoding_benchmark.py --repetitions 200
+
+"""
+import argparse
+import time
+
+from robottelo.decorators.func_shared import encoding
+
+
+def _entity(entity_id, **kwargs):
+    entity = {
+        'id': entity_id,
+        'name': f'entity_{entity_id}',
+        'label': f'entity_{entity_id}',
+        'description': 'a generated entity description' * 2,
+        'created_at': '2020-01-01 10:00:00 UTC',
+        'updated_at': '2020-01-01 10:00:00 UTC',
+        'organization': {'id': 1, 'name': 'organization', 'label': 'organization'},
+    }
+    entity.update(kwargs)
+    return entity
+
+
+def get_payloads():
+    """Return the realistic shared values by name"""
+    org = _entity(1)
+    repos = [
+        _entity(index, url=f'https://fixtures.example.com/repo_{index}/', content_type='yum')
+        for index in range(20)
+    ]
+    content_view = _entity(
+        1,
+        versions=[
+            _entity(index, version=f'{index}.0', environments=[_entity(1), _entity(2)])
+            for index in range(100)
+        ],
+        repositories=repos,
+    )
+    return {
+        'org and repositories': {'org': org, 'repos': repos},
+        'content view': {'content_view': content_view},
+    }
+
+
+def _get_encodings():
+    serializers = ['json'] + (['msgpack'] if encoding.msgpack else [])
+    compressions = [None, 'zlib'] + (['zstd'] if encoding.zstandard else [])
+    return [
+        (serializer, compression) for serializer in serializers for compression in compressions
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repetitions', type=int, default=200)
+    args = parser.parse_args()
+    for payload_name, payload in get_payloads().items():
+        value = {'state': 'READY', 'result': payload, 'error': None}
+        for serializer, compression in _get_encodings():
+            start_time = time.perf_counter()
+            for _ in range(args.repetitions):
+                data = encoding.encode(
+                    value, serializer=serializer, compression=compression, threshold=0
+                )
+            encode_time = time.perf_counter() - start_time
+            start_time = time.perf_counter()
+            for _ in range(args.repetitions):
+                encoding.decode(data)
+            decode_time = time.perf_counter() - start_time
+            print(
+                '{:<21} {:<8} {:<5} size: {:>7} bytes encode: {:.3f}ms decode: {:.3f}ms'.format(
+                    payload_name,
+                    serializer,
+                    compression or 'none',
+                    len(data),
+                    encode_time / args.repetitions * 1000,
+                    decode_time / args.repetitions * 1000,
+                )
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+"""Benchmark the shared function storage under contention.
+
+Simulate pytest xdist workers calling the same shared functions at the same
+time, with each storage handler:
+
+- cold: the workers race to compute new shared functions
+- locked read: the ready results are read with the storage lock
+- lock free read: the ready results are read without the storage lock
+- memo read: the ready results are read from the process memo
+
+    python scripts/shared_function_benchmark.py --workers 16 --calls 200
+
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+from robottelo.decorators.func_shared.file_storage import FileStorageHandler
+from robottelo.decorators.func_shared.shared import _SharedFunction
+from robottelo.decorators.func_shared.sqlite_storage import SQLiteStorageHandler
+
+SHARED_KEY = 'benchmark.shared_function'
+MODES = ('cold', 'locked read', 'lock free read', 'memo read')
+STORAGES = ('file', 'sqlite')
+
+
+def _shared_setup():
+    return {'org': {'id': 1, 'name': 'benchmark'}}
+
+
+def _get_storage_handler(storage, root_dir):
+    if storage == 'sqlite':
+        return SQLiteStorageHandler(database_path=os.path.join(root_dir, 'shared.db'))
+    return FileStorageHandler(root_dir=root_dir)
+
+
+def _worker(storage, root_dir, mode, calls, start_event):
+    storage_handler = _get_storage_handler(storage, root_dir)
+    shared_function = _SharedFunction(SHARED_KEY, _shared_setup, storage_handler=storage_handler)
+    start_event.wait()
+    start_time = time.perf_counter()
+    for index in range(calls):
+        if mode == 'cold':
+            _SharedFunction(
+                f'{SHARED_KEY}.{index}', _shared_setup, storage_handler=storage_handler
+            )()
+        elif mode == 'locked read':
+            shared_function._locked_call()
+        elif mode == 'lock free read':
+            shared_function._read_value()
+        else:
+            shared_function()
+    return time.perf_counter() - start_time
+
+
+def run(storage, mode, workers, calls):
+    """Return the list of the seconds spent by each worker"""
+    with tempfile.TemporaryDirectory() as root_dir:
+        # the results are ready before the workers start
+        _SharedFunction(
+            SHARED_KEY, _shared_setup, storage_handler=_get_storage_handler(storage, root_dir)
+        )()
+        manager = multiprocessing.Manager()
+        start_event = manager.Event()
+        with multiprocessing.Pool(workers) as pool:
+            results = [
+                pool.apply_async(_worker, (storage, root_dir, mode, calls, start_event))
+                for _ in range(workers)
+            ]
+            start_event.set()
+            return [result.get() for result in results]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--calls', type=int, default=200)
+    parser.add_argument('--storage', choices=STORAGES, action='append')
+    args = parser.parse_args()
+    total_calls = args.workers * args.calls
+    for storage in args.storage or STORAGES:
+        for mode in MODES:
+            durations = run(storage, mode, args.workers, args.calls)
+            print(
+                '{:<7} {:<15} workers: {} calls: {} slowest worker: {:.3f}s'
+                ' mean call: {:.3f}ms'.format(
+                    storage,
+                    mode,
+                    args.workers,
+                    total_calls,
+                    max(durations),
+                    sum(durations) / total_calls * 1000,
+                )
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -16,12 +16,14 @@
 """
 # For ease of use hc refers to host-collection throughout this document
 from time import sleep
+from time import time
 
 import pytest
 from nailgun import entities
 
 from robottelo.api.utils import enable_rhrepo_and_fetchid
 from robottelo.api.utils import promote
+from robottelo.api.utils import wait_for_errata_applicability_tasks
 from robottelo.cli.factory import setup_org_for_a_custom_repo
 from robottelo.cli.factory import setup_org_for_a_rh_repo
 from robottelo.config import settings
@@ -105,11 +107,13 @@ class ErrataTestCase(APITestCase):
         install via http api: PUT /api/v2/hosts/bulk/install_content
         """
         if via_ssh:
+            before_install = int(time())
             for client in clients:
                 result = client.run(f'yum install -y {package_name}')
                 self.assertEqual(result.return_code, 0)
                 result = client.run(f'rpm -q {package_name}')
                 self.assertEqual(result.return_code, 0)
+            wait_for_errata_applicability_tasks(host_ids, before_install)
         else:
             entities.Host().install_content(
                 data={
@@ -579,9 +583,13 @@ class ErrataTestCase(APITestCase):
             host = entities.Host().search(query={'search': f'name={client.hostname}'})[0].read()
             for errata in ('security', 'bugfix', 'enhancement'):
                 self._validate_errata_counts(host, errata, 0)
+            before_install = int(time())
             client.run(f'yum install -y {FAKE_1_CUSTOM_PACKAGE}')
+            wait_for_errata_applicability_tasks([host.id], before_install)
             self._validate_errata_counts(host, 'security', 1)
+            before_install = int(time())
             client.run(f'yum install -y {REAL_0_RH_PACKAGE}')
+            wait_for_errata_applicability_tasks([host.id], before_install)
             for errata in ('bugfix', 'enhancement'):
                 self._validate_errata_counts(host, errata, 1)
 
@@ -655,11 +663,15 @@ class ErrataTestCase(APITestCase):
             host = entities.Host().search(query={'search': f'name={client.hostname}'})[0].read()
             erratum = self._fetch_available_errata(host, 0)
             self.assertEqual(len(erratum), 0)
+            before_install = int(time())
             client.run(f'yum install -y {FAKE_1_CUSTOM_PACKAGE}')
+            wait_for_errata_applicability_tasks([host.id], before_install)
             erratum = self._fetch_available_errata(host, 1)
             self.assertEqual(len(erratum), 1)
             self.assertIn(CUSTOM_REPO_ERRATA_ID, [errata['errata_id'] for errata in erratum])
+            before_install = int(time())
             client.run(f'yum install -y {REAL_0_RH_PACKAGE}')
+            wait_for_errata_applicability_tasks([host.id], before_install)
             erratum = self._fetch_available_errata(host, 3)
             self.assertEqual(len(erratum), 3)
             self.assertTrue(
@@ -15,6 +15,7 @@
 :Upstream: No
 """
 import datetime
+import time
 from operator import itemgetter
 
 import pytest
@@ -22,6 +23,7 @@ from fauxfactory import gen_string
 
 from robottelo import manifests
 from robottelo import ssh
+from robottelo.api.utils import wait_for_errata_applicability_tasks
 from robottelo.cleanup import vm_cleanup
 from robottelo.cli.activationkey import ActivationKey
 from robottelo.cli.base import CLIReturnCodeError
@@ -139,6 +141,7 @@ class HostCollectionErrataInstallTestCase(CLITestCase):
         """Create and setup host collection, hosts and virtual machines."""
         super().setUp()
         self.virtual_machines = []
+        self.host_ids = []
         self.host_collection = make_host_collection({'organization-id': self.org['id']})
         for _ in range(self.VIRTUAL_MACHINES_COUNT):
             # create VM
@@ -156,6 +159,7 @@ class HostCollectionErrataInstallTestCase(CLITestCase):
             # install katello-agent
             virtual_machine.install_katello_agent()
             host = Host.info({'name': virtual_machine.hostname})
+            self.host_ids.append(int(host['id']))
             HostCollection.add_host(
                 {
                     'id': self.host_collection['id'],
@@ -171,10 +175,12 @@ class HostCollectionErrataInstallTestCase(CLITestCase):
             }
         )
         # install the custom package for each host
+        before_install = int(time.time())
         for virtual_machine in self.virtual_machines:
             virtual_machine.run(f'yum install -y {self.CUSTOM_PACKAGE}')
             result = virtual_machine.run(f'rpm -q {self.CUSTOM_PACKAGE}')
             self.assertEqual(result.return_code, 0)
+        wait_for_errata_applicability_tasks(self.host_ids, before_install)
 
     def _is_errata_package_installed(self, virtual_machine):
         """Check whether errata package is installed.
@@ -712,11 +718,13 @@ class HostCollectionErrataInstallTestCase(CLITestCase):
         """
         # Install kangaroo-0.2 on first VM to create a need for RHBA-2012:1030
         # Update walrus on first VM to remove its need for RHSA-2012:0055
+        before_install = int(time.time())
         result = ssh.command(
             f'yum install -y {FAKE_4_CUSTOM_PACKAGE} {FAKE_2_CUSTOM_PACKAGE}',
             self.virtual_machines[0].ip_addr,
         )
         assert result.return_code == 0, "Failed to install RPM"
+        wait_for_errata_applicability_tasks(self.host_ids[:1], before_install)
         # Step 1: Search for hosts that require RHBA errata
         result = Host.list(
             {
@@ -0,0 +1,68 @@
+"""Unit tests for :mod:`robottelo.api.permissions`."""
+from unittest import mock
+
+import pytest
+
+from robottelo.api import permissions
+
+
+class APIResponseError(Exception):
+    pass
+
+
+def _permission(name, resource_type=None):
+    permission = mock.Mock(resource_type=resource_type)
+    permission.name = name
+    return permission
+
+
+@pytest.fixture
+def entities():
+    with mock.patch('robottelo.api.permissions.entities') as entities:
+        entities.APIResponseError = APIResponseError
+        yield entities
+
+
+@pytest.fixture
+def catalog(entities):
+    return permissions.PermissionCatalog(
+        [
+            _permission('access_dashboard'),
+            _permission('view_organizations', 'Organization'),
+            _permission('edit_organizations', 'Organization'),
+            _permission('view_locations', 'Location'),
+        ]
+    )
+
+
+def test_load_pages(entities):
+    """All the permissions pages are loaded"""
+    entities.Permission.return_value.search.side_effect = [
+        [_permission('view_organizations', 'Organization')] * 2,
+        [_permission('view_locations', 'Location')],
+    ]
+    catalog = permissions.PermissionCatalog.load(page_size=2)
+    assert len(catalog) == 3
+    assert entities.Permission.return_value.search.call_count == 2
+
+
+def test_get(catalog):
+    assert catalog.get('access_dashboard').name == 'access_dashboard'
+    with pytest.raises(APIResponseError):
+        catalog.get('unknown')
+
+
+def test_get_resource_type_permissions(catalog):
+    assert {
+        permission.name for permission in catalog.get_resource_type_permissions('Organization')
+    } == {'view_organizations', 'edit_organizations'}
+    assert [
+        permission.name
+        for permission in catalog.get_resource_type_permissions(
+            'Organization', names=['view_organizations']
+        )
+    ] == ['view_organizations']
+    with pytest.raises(APIResponseError):
+        catalog.get_resource_type_permissions('Organization', names=['view_locations'])
+    with pytest.raises(APIResponseError):
+        catalog.get_resource_type_permissions('Unknown')
@@ -0,0 +1,107 @@
+"""Unit tests for :mod:`robottelo.api.tasks`."""
+from unittest import mock
+
+import pytest
+from nailgun import entity_mixins
+
+from robottelo.api import tasks
+
+
+def _task(task_id, state='running', result='pending', progress=0.0):
+    return mock.Mock(id=task_id, state=state, result=result, progress=progress)
+
+
+@pytest.fixture
+def search():
+    with mock.patch('robottelo.api.tasks.entities.ForemanTask') as foreman_task, mock.patch(
+        'robottelo.api.tasks.time.sleep'
+    ):
+        yield foreman_task.return_value.search
+
+
+def test_bulk_poll(search):
+    """All the pending tasks are polled with one search per tick"""
+    search.side_effect = [
+        [_task(1), _task(2, progress=0.5), _task(3, state='stopped', result='success')],
+        [_task(1, state='stopped', result='success'), _task(2, progress=0.5)],
+        [_task(2, state='stopped', result='success')],
+    ]
+    tracker = tasks.TaskTracker(min_poll_rate=0)
+    futures = [tracker.track(task_id) for task_id in (1, 2, 3)]
+    tracker.wait()
+    assert [future.result().id for future in futures] == [1, 2, 3]
+    assert tracker.requests_count == 3
+    assert search.call_args_list[1][1]['query']['search'] == 'id ^ (1, 2)'
+    assert search.call_args_list[2][1]['query']['search'] == 'id ^ (2)'
+
+
+def test_failed_task(search):
+    search.return_value = [_task(1, state='stopped', result='error')]
+    tracker = tasks.TaskTracker()
+    future = tracker.track(1)
+    tracker.wait()
+    with pytest.raises(entity_mixins.TaskFailedError):
+        future.result()
+
+
+def test_timeout(search):
+    search.return_value = [_task(1)]
+    tracker = tasks.TaskTracker(timeout=0)
+    future = tracker.track(1)
+    with pytest.raises(entity_mixins.TaskTimedOutError):
+        tracker.wait()
+    assert future.cancelled()
+
+
+def test_backoff():
+    """The poll delay grows while nothing progresses and is reset otherwise"""
+    tracker = tasks.TaskTracker(min_poll_rate=1, max_poll_rate=4, backoff=2, jitter=0)
+    assert [tracker._next_delay(False) for _ in range(4)] == [2, 4, 4, 4]
+    assert tracker._next_delay(True) == 1
+
+
+def _host_task(task_id, host_ids, state='running', result='pending'):
+    task = _task(task_id, state=state, result=result)
+    task.label = tasks.APPLICABILITY_TASK_LABEL
+    task.input = {'host_ids': host_ids}
+    return task
+
+
+def _profile_task(task_id, host_id, state='running', result='pending'):
+    task = _task(task_id, state=state, result=result)
+    task.label = tasks.UPLOAD_PROFILE_TASK_LABEL
+    task.input = {'host': {'id': host_id}}
+    return task
+
+
+def test_applicability_tracker(search):
+    """The hosts tasks are searched once per tick and each host is done when
+    all its tasks are finished
+    """
+    search.side_effect = [
+        [_host_task(1, [1, 2, 10]), _profile_task(2, 3, state='stopped', result='success')],
+        [
+            _host_task(1, [1, 2, 10], state='stopped', result='success'),
+            _profile_task(2, 3, state='stopped', result='success'),
+            _profile_task(3, 2),
+        ],
+        [_profile_task(3, 2, state='stopped', result='success')],
+    ]
+    tracker = tasks.ApplicabilityTracker({1, 2, 3}, 0, search_rate=0)
+    assert tracker.poll() == {3}
+    assert tracker.poll() == {1}
+    assert tracker.poll() == {2}
+    assert tracker.wait().keys() == {1, 2, 3}
+    assert tracker.requests_count == 3
+
+
+def test_applicability_tracker_failure(search):
+    search.return_value = [_host_task(1, [1], state='stopped', result='error')]
+    with pytest.raises(entity_mixins.TaskFailedError):
+        tasks.ApplicabilityTracker([1], 0).wait()
+
+
+def test_applicability_tracker_timeout(search):
+    search.return_value = [_profile_task(1, 2)]
+    with pytest.raises(entity_mixins.TaskTimedOutError):
+        tasks.ApplicabilityTracker([1, 2], 0, timeout=0).wait()
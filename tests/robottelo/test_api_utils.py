@@ -1,4 +1,9 @@
 """Unit tests for :mod:`robottelo.api.utils`."""
+import threading
+from unittest import mock
+
+import pytest
+
 from robottelo.api import utils
 
 
@@ -10,3 +15,115 @@ def test_one_to_one_names():
 def test_one_to_many_names():
     """Test :func:`robottelo.api.utils.one_to_many_names`."""
     assert utils.one_to_many_names('person') == {'person', 'person_ids', 'people'}
+
+
+@mock.patch('robottelo.api.utils.time.sleep')
+@mock.patch('robottelo.api.utils.http_sessions.post')
+@mock.patch('robottelo.api.utils._get_pulp_password')
+@mock.patch('robottelo.api.utils.settings')
+def test_wait_for_syncplan_tasks(settings, get_pulp_password, post, sleep):
+    """Test :func:`robottelo.api.utils.wait_for_syncplan_tasks` waits for
+    several repositories with one search per poll.
+    """
+    post.return_value.status_code = 200
+    post.return_value.json.side_effect = [
+        [{'tags': ['pulp:repository:repo1'], 'state': 'finished'}],
+        [],
+        [{'tags': ['pulp:repository:repo2'], 'state': 'finished'}],
+    ]
+    assert utils.wait_for_syncplan_tasks(['repo1', 'repo2'])
+    assert post.call_count == 3
+    filters = post.call_args[1]['json']['criteria']['filters']
+    assert filters['tags']['$in'] == ['pulp:repository:repo2']
+    assert [call[0][0] for call in sleep.call_args_list] == [1, 2]
+
+
+@pytest.fixture
+def provisioning_entities(monkeypatch):
+    """Mock the nailgun entities and the settings used by
+    :func:`robottelo.api.utils.configure_provisioning`
+    """
+    monkeypatch.setattr(utils, '_PROVISIONING_CONTENTS', {})
+    with mock.patch('robottelo.api.utils.settings') as settings, mock.patch(
+        'robottelo.api.utils.entities'
+    ) as entities:
+        settings.rhel7_os = 'http://rhel7/os'
+        settings.server.hostname = 'satellite.example.com'
+        yield entities
+
+
+def test_configure_provisioning(provisioning_entities):
+    """The provisioning content tasks timeout is passed to each call"""
+    entities = provisioning_entities
+    timeout = utils.PROVISIONING_CONTENT_TASK_TIMEOUT
+    task_timeout = utils.entity_mixins.TASK_TIMEOUT
+    result = utils.configure_provisioning()
+    assert result['host_group'] == entities.HostGroup.return_value.create.return_value.name
+    entities.Repository.return_value.create.return_value.sync.assert_called_once_with(
+        timeout=timeout
+    )
+    content_view = entities.ContentView.return_value.create.return_value.update.return_value
+    content_view.publish.assert_called_once_with(timeout=timeout)
+    content_view.read.return_value.version[0].promote.assert_called_once_with(
+        data=mock.ANY, timeout=timeout
+    )
+    assert utils.entity_mixins.TASK_TIMEOUT == task_timeout
+    assert not utils._PROVISIONING_CONTENTS
+
+
+def test_configure_provisioning_reuse_content(provisioning_entities):
+    """The organization with the provisioning content is created once"""
+    entities = provisioning_entities
+    content = {
+        'organization_id': 1,
+        'lifecycle_environment_id': 2,
+        'repository_name': 'repository',
+        'content_view_id': 3,
+    }
+    with mock.patch(
+        'robottelo.api.utils._create_shared_provisioning_content', return_value=content
+    ) as create_shared_content:
+        for _ in range(2):
+            utils.configure_provisioning(reuse_content=True)
+    create_shared_content.assert_called_once_with(
+        hostname='satellite.example.com', repo_url='http://rhel7/os'
+    )
+    assert not entities.Organization.return_value.create.called
+    assert entities.Organization.call_args_list == [mock.call(id=1)] * 2
+    assert not entities.Repository.return_value.create.called
+    assert entities.HostGroup.call_args[1]['content_view'] == 3
+    assert entities.HostGroup.call_args[1]['lifecycle_environment'] == 2
+    assert entities.Repository.return_value.search.call_args[1]['query']['name'] == 'repository'
+
+
+def test_configure_provisioning_concurrent_steps(provisioning_entities):
+    """The repository sync waits for a concurrent step and the time of each
+    step is logged
+    """
+    entities = provisioning_entities
+    proxy_searched = threading.Event()
+    proxy_searched_during_sync = []
+    entities.SmartProxy.return_value.search.side_effect = lambda **kwargs: (
+        proxy_searched.set() or mock.MagicMock()
+    )
+    entities.Repository.return_value.create.return_value.sync.side_effect = (
+        lambda **kwargs: proxy_searched_during_sync.append(proxy_searched.wait(timeout=10))
+    )
+    with mock.patch('robottelo.api.utils.logger') as logger:
+        utils.configure_provisioning()
+    assert proxy_searched_during_sync == [True]
+    messages = [call[0][0] for call in logger.info.call_args_list]
+    logged_steps = {message.split('"')[1] for message in messages if 'step "' in message}
+    assert logged_steps == {
+        'content',
+        'puppet environment',
+        'smart proxy',
+        'partition table',
+        'operating system',
+        'architecture',
+        'compute resource',
+        'domain and subnet',
+        'provisioning template',
+        'pxe template',
+        'operating system update',
+    }
@@ -0,0 +1,129 @@
+"""Unit tests for :mod:`robottelo.cleanup` resources registry."""
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from robottelo import cleanup
+
+
+def _track(registry, kind, resource_id, deleted):
+    registry.track(kind, resource_id, lambda: deleted.append((kind, resource_id)))
+
+
+def test_teardown_dependency_order():
+    """The resources are deleted in dependency order"""
+    registry = cleanup.ResourceRegistry()
+    deleted = []
+    registry.push_scope('module')
+    _track(registry, 'Organization', 1, deleted)
+    _track(registry, 'LifecycleEnvironment', 2, deleted)
+    _track(registry, 'Domain', 3, deleted)
+    _track(registry, 'ContentView', 4, deleted)
+    _track(registry, 'Host', 5, deleted)
+    registry.teardown(registry.pop_scope())
+    assert [kind for kind, _ in deleted] == [
+        'Host',
+        'ContentView',
+        'LifecycleEnvironment',
+        'Domain',
+        'Organization',
+    ]
+
+
+def test_teardown_rank_in_parallel():
+    """The resources of the same rank are deleted in parallel"""
+    registry = cleanup.ResourceRegistry(max_workers=2)
+    barrier = threading.Barrier(2, timeout=5)
+    registry.push_scope('module')
+    for org_id in (1, 2):
+        registry.track('Organization', org_id, barrier.wait)
+    registry.teardown(registry.pop_scope())
+    assert not barrier.broken
+
+
+def test_teardown_retry_failed_in_reverse_order():
+    registry = cleanup.ResourceRegistry()
+    deleted = []
+
+    def delete_lce(lce_id, successor_id=None):
+        def delete():
+            if successor_id is not None and successor_id not in deleted:
+                raise RuntimeError('the environment has a successor')
+            deleted.append(lce_id)
+
+        return delete
+
+    registry.push_scope('module')
+    registry.track('LifecycleEnvironment', 1, delete_lce(1, successor_id=2))
+    registry.track('LifecycleEnvironment', 2, delete_lce(2, successor_id=3))
+    registry.track('LifecycleEnvironment', 3, delete_lce(3))
+    registry.teardown(registry.pop_scope())
+    assert sorted(deleted) == [1, 2, 3]
+
+
+def test_track_scopes():
+    """The resources are tracked in the last scope, only when a scope is
+    active and not untracked
+    """
+    registry = cleanup.ResourceRegistry()
+    deleted = []
+    _track(registry, 'Organization', 1, deleted)
+    registry.push_scope('session')
+    _track(registry, 'Organization', 2, deleted)
+    registry.push_scope('module')
+    _track(registry, 'Organization', 3, deleted)
+    with registry.untracked():
+        _track(registry, 'Organization', 4, deleted)
+    _track(registry, 'Organization', 5, deleted)
+    registry.untrack('Organization', 5)
+    assert [res.resource_id for res in registry.pop_scope()] == [3]
+    assert [res.resource_id for res in registry.pop_scope()] == [2]
+
+
+def test_track_attributed_scope():
+    """The resources of a session fixture set up during a module are tracked
+    in the session scope, and not tracked without a session scope
+    """
+    registry = cleanup.ResourceRegistry()
+    deleted = []
+    registry.push_scope('module')
+    with registry.attributed_to('session'):
+        _track(registry, 'Organization', 1, deleted)
+    registry.push_scope('session')
+    registry.push_scope('module')
+    with registry.attributed_to('session'):
+        _track(registry, 'Organization', 2, deleted)
+    _track(registry, 'Organization', 3, deleted)
+    assert [res.resource_id for res in registry.pop_scope()] == [3]
+    assert [res.resource_id for res in registry.pop_scope()] == [2]
+    assert registry.pop_scope() == []
+
+
+def test_untracked_in_executor_threads():
+    """The threads running in the copied context of the caller do not track
+    the resources created in an untracked context
+    """
+    registry = cleanup.ResourceRegistry()
+    deleted = []
+    registry.push_scope('module')
+    with registry.untracked():
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            executor.submit(
+                contextvars.copy_context().run, _track, registry, 'Organization', 1, deleted
+            ).result()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        executor.submit(
+            contextvars.copy_context().run, _track, registry, 'Organization', 2, deleted
+        ).result()
+    assert [res.resource_id for res in registry.pop_scope()] == [2]
+
+
+def test_track_cli_object():
+    cli_object = mock.Mock(__name__='LifecycleEnvironment', command_requires_org=True)
+    with mock.patch('robottelo.cleanup.RESOURCES', cleanup.ResourceRegistry()) as registry:
+        registry.push_scope('module')
+        cleanup.track_cli_object(cli_object, {'id': '7'}, {'organization-id': '1'})
+        (resource,) = registry.pop_scope()
+    resource.delete()
+    cli_object.delete.assert_called_once_with({'id': '7', 'organization-id': '1'})
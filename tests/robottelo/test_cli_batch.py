@@ -0,0 +1,82 @@
+"""Unit tests for :mod:`robottelo.cli.batch`."""
+from unittest import mock
+
+import pytest
+
+from robottelo.cli.base import Base
+from robottelo.cli.batch import CLIBatch
+from robottelo.cli.batch import CLIBatchError
+
+
+class Org(Base):
+    command_base = 'organization'
+    command_requires_org = False
+    foreman_admin_username = 'admin'
+    foreman_admin_password = 'password'
+
+
+class Product(Base):
+    command_base = 'product'
+    command_requires_org = True
+    foreman_admin_username = 'admin'
+    foreman_admin_password = 'password'
+
+
+@pytest.fixture(autouse=True)
+def settings():
+    with mock.patch('robottelo.cli.base.settings') as settings:
+        settings.locale = 'en_US'
+        settings.performance = False
+        yield settings
+
+
+@pytest.fixture
+def batch():
+    batch = CLIBatch()
+    org = batch.create(Org, {'name': 'org'})
+    batch.create(Product, {'name': 'product', 'organization-id': org['id']})
+    return batch
+
+
+def test_compile_resolve_placeholders(batch):
+    """The steps options reference the ids of the previous steps"""
+    script = batch.compile()
+    assert 'organization create --name="org"' in script
+    assert 'product create --name="product" --organization-id="${STEP_0_ID}"' in script
+    assert 'product info --id="${STEP_1_ID}" --organization-id="${STEP_0_ID}"' in script
+
+
+def test_only_id_can_be_referenced(batch):
+    with pytest.raises(KeyError):
+        batch.steps[0]['name']
+
+
+@mock.patch('robottelo.cli.batch.ssh.command')
+def test_execute(command, batch):
+    """All the steps are executed in one ssh call and their info parsed"""
+    command.return_value.return_code = 0
+    command.return_value.stdout = [
+        '@@robottelo-batch-step 0',
+        'Id:   1',
+        'Name: org',
+        '@@robottelo-batch-step 1',
+        'Id:   2',
+        'Name: product',
+    ]
+    org, product = batch.execute()
+    command.assert_called_once()
+    assert org == {'id': '1', 'name': 'org'}
+    assert product == {'id': '2', 'name': 'product'}
+
+
+@mock.patch('robottelo.cli.batch.ssh.command')
+def test_execute_failed_step(command, batch):
+    command.return_value.return_code = 1
+    command.return_value.stdout = [
+        '@@robottelo-batch-step 0',
+        'Id:   1',
+        'Name: org',
+        '@@robottelo-batch-failed 1',
+    ]
+    with pytest.raises(CLIBatchError, match='Failed to create Product at batch step 1'):
+        batch.execute()
@@ -0,0 +1,163 @@
+"""Unit tests for :mod:`robottelo.cli.factory`."""
+import itertools
+from unittest import mock
+
+import pytest
+
+from robottelo.cli import factory
+from robottelo.cli.base import CLIReturnCodeError
+from robottelo.cli.factory import CLIFactoryError
+from robottelo.ssh import SSHCommandTimeoutError
+
+RH_REPO_OPTIONS = {
+    'product': 'product',
+    'repository-set': 'repository set',
+    'repository': 'repository',
+    'download-policy': 'immediate',
+}
+
+
+@pytest.fixture
+def task_progress():
+    with mock.patch('robottelo.cli.factory.Task.progress') as task_progress:
+        yield task_progress
+
+
+@pytest.fixture
+def repository_info():
+    with mock.patch('robottelo.cli.factory.Repository.info') as repository_info:
+        repository_info.side_effect = lambda options: {
+            'id': options['id'],
+            'sync': {'status': 'Success'},
+        }
+        yield repository_info
+
+
+def test_wait_for_repositories_sync(task_progress, repository_info):
+    """The sync tasks of all the repositories are waited for"""
+    sync_durations = factory.wait_for_repositories_sync({1: 'task1', 2: 'task2'}, timeout=60)
+    assert sorted(sync_durations) == [1, 2]
+    assert all(duration >= 0 for duration in sync_durations.values())
+    assert sorted(call[0][0]['id'] for call in task_progress.call_args_list) == [
+        'task1',
+        'task2',
+    ]
+    assert all(call[1]['timeout'] == 60 for call in task_progress.call_args_list)
+    assert sorted(call[0][0]['id'] for call in repository_info.call_args_list) == [1, 2]
+
+
+def test_wait_for_repositories_sync_nothing_to_wait(task_progress, repository_info):
+    assert factory.wait_for_repositories_sync({}) == {}
+    assert not task_progress.called
+
+
+def test_negative_wait_for_repositories_sync_failed(task_progress, repository_info):
+    """A failed sync status raises CLIFactoryError"""
+    repository_info.side_effect = lambda options: {
+        'id': options['id'],
+        'sync': {'status': 'Success' if options['id'] == 1 else 'Warning'},
+    }
+    with pytest.raises(CLIFactoryError, match=r'repository 2, sync status: Warning'):
+        factory.wait_for_repositories_sync({1: 'task1', 2: 'task2'})
+
+
+def test_negative_wait_for_repositories_sync_task_error(task_progress, repository_info):
+    """A task progress command failure raises CLIFactoryError"""
+    task_progress.side_effect = CLIReturnCodeError(1, 'error', 'task failed')
+    with pytest.raises(CLIFactoryError, match=r'Failed to synchronize repository 1\ntask failed'):
+        factory.wait_for_repositories_sync({1: 'task1'})
+
+
+def test_negative_wait_for_repositories_sync_timeout(task_progress, repository_info):
+    """A task progress timeout raises CLIFactoryError"""
+    task_progress.side_effect = SSHCommandTimeoutError('hammer task progress timed out')
+    with pytest.raises(CLIFactoryError, match=r'Timeout waiting .* repository 1'):
+        factory.wait_for_repositories_sync({1: 'task1'}, timeout=1)
+    assert not repository_info.called
+
+
+@pytest.fixture
+def rh_repo_cli(monkeypatch):
+    """Mock the hammer commands run to setup an organization for a RH
+    repository
+    """
+    monkeypatch.setattr(factory, '_RH_REPO_CONTENT_TEMPLATES', {})
+    ids = itertools.count(1)
+    with mock.patch.multiple(
+        'robottelo.cli.factory',
+        make_org=mock.DEFAULT,
+        make_lifecycle_environment=mock.DEFAULT,
+        make_content_view=mock.DEFAULT,
+        make_activation_key=mock.DEFAULT,
+        activationkey_add_subscription_to_repo=mock.DEFAULT,
+        manifests=mock.DEFAULT,
+        upload_file=mock.DEFAULT,
+        Subscription=mock.DEFAULT,
+        RepositorySet=mock.DEFAULT,
+        Repository=mock.DEFAULT,
+        ContentView=mock.DEFAULT,
+    ) as cli:
+        for make_entity in (
+            'make_org',
+            'make_lifecycle_environment',
+            'make_content_view',
+            'make_activation_key',
+        ):
+            cli[make_entity].side_effect = lambda *args, **kwargs: {'id': next(ids)}
+        cli['Repository'].info.side_effect = lambda options: {
+            'id': options.get('id') or f'repo-{options["organization-id"]}'
+        }
+        cli['ContentView'].info.return_value = {'versions': [{'id': 'cvv'}]}
+        yield cli
+
+
+def test_setup_org_for_a_rh_repo_reuse_content(rh_repo_cli):
+    """The organization with the synchronized repository is created once"""
+    results = [
+        factory._setup_org_for_a_rh_repo(dict(RH_REPO_OPTIONS), reuse_content=True)
+        for _ in range(2)
+    ]
+    assert rh_repo_cli['make_org'].call_count == 1
+    assert rh_repo_cli['RepositorySet'].enable.call_count == 1
+    assert rh_repo_cli['Repository'].synchronize.call_count == 1
+    org_id = results[0]['organization-id']
+    rh_repo_cli['Repository'].update.assert_called_once_with(
+        {'id': f'repo-{org_id}', 'download-policy': 'immediate'}
+    )
+    for result in results:
+        assert result['organization-id'] == org_id
+        assert result['repository-id'] == f'repo-{org_id}'
+    for entity_id in ('lifecycle-environment-id', 'content-view-id', 'activationkey-id'):
+        assert results[0][entity_id] != results[1][entity_id]
+
+
+def test_setup_org_for_a_rh_repo_reuse_deleted_content(rh_repo_cli):
+    """A template deleted since its creation is created again"""
+    factory._setup_org_for_a_rh_repo(dict(RH_REPO_OPTIONS), reuse_content=True)
+    info = rh_repo_cli['Repository'].info.side_effect
+
+    def deleted_template_info(options):
+        if options.get('id'):
+            raise CLIReturnCodeError(1, 'error', 'repository not found')
+        return info(options)
+
+    rh_repo_cli['Repository'].info.side_effect = deleted_template_info
+    result = factory._setup_org_for_a_rh_repo(dict(RH_REPO_OPTIONS), reuse_content=True)
+    assert rh_repo_cli['make_org'].call_count == 2
+    assert rh_repo_cli['Repository'].synchronize.call_count == 2
+    assert result['repository-id'] == f'repo-{result["organization-id"]}'
+
+
+def test_setup_org_for_a_rh_repo_without_reuse(rh_repo_cli):
+    """Without reuse_content or with a given organization, the repository is
+    enabled and synchronized in the organization at each call
+    """
+    for _ in range(2):
+        factory._setup_org_for_a_rh_repo(dict(RH_REPO_OPTIONS))
+    factory._setup_org_for_a_rh_repo(
+        dict(RH_REPO_OPTIONS, **{'organization-id': 100}), reuse_content=True
+    )
+    assert rh_repo_cli['make_org'].call_count == 2
+    assert rh_repo_cli['Repository'].synchronize.call_count == 3
+    assert rh_repo_cli['Repository'].update.call_count == 3
+    assert not factory._RH_REPO_CONTENT_TEMPLATES
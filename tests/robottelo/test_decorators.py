@@ -3,9 +3,11 @@ from itertools import chain
 from unittest import mock
 
 import pytest
+from fauxfactory import gen_integer
 from unittest2 import SkipTest
 
 from robottelo import decorators
+from robottelo.decorators import func_cache
 
 
 class TestCacheable:
@@ -13,7 +15,9 @@ class TestCacheable:
 
     @pytest.fixture(scope="function")
     def make_foo(self):
-        mocked_object_cache_patcher = mock.patch.dict('robottelo.decorators.OBJECT_CACHE')
+        mocked_object_cache_patcher = mock.patch(
+            'robottelo.decorators.func_cache.OBJECT_CACHE', func_cache.ObjectCache(max_size=2)
+        )
         mocked_object_cache_patcher.start()
 
         # decorators.cacheable uses the function name as the key, removing make_
@@ -29,22 +33,56 @@ class TestCacheable:
         First test in the class, as the other tests add to the cache
         """
         make_foo(cached=False)
-        assert 'foo' not in decorators.OBJECT_CACHE
-        assert decorators.OBJECT_CACHE == {}
+        assert 'foo' not in func_cache.OBJECT_CACHE
+        assert len(func_cache.OBJECT_CACHE) == 0
 
     def test_build_cache(self, make_foo):
         """Create a new object and add it to the cache."""
         obj = make_foo(cached=True)
-        assert decorators.OBJECT_CACHE == {'foo': {'id': 42}}
-        assert id(decorators.OBJECT_CACHE['foo']) == id(obj)
+        assert func_cache.OBJECT_CACHE.keys() == ['foo']
+        assert id(func_cache.OBJECT_CACHE['foo']) == id(obj)
 
     def test_return_from_cache(self, make_foo):
         """Return an already cached object."""
         cache_obj = {'id': 42}
-        decorators.OBJECT_CACHE['foo'] = cache_obj
+        func_cache.OBJECT_CACHE['foo'] = cache_obj
         obj = make_foo(cached=True)
         assert id(cache_obj) == id(obj)
 
+    def test_cache_key_use_options(self, make_foo):
+        """Objects created with different options are cached separately and
+        the options order does not matter.
+        """
+        obj = make_foo({'name': 'foo', 'organization-id': 1}, cached=True)
+        other_obj = make_foo({'name': 'bar', 'organization-id': 1}, cached=True)
+        assert id(obj) != id(other_obj)
+        assert len(func_cache.OBJECT_CACHE) == 2
+        assert id(make_foo({'organization-id': 1, 'name': 'foo'}, cached=True)) == id(obj)
+
+    def test_cache_evict_least_recently_used(self, make_foo):
+        """The least recently used object is evicted when the cache is full."""
+        make_foo({'name': 'first'}, cached=True)
+        make_foo({'name': 'second'}, cached=True)
+        make_foo({'name': 'first'}, cached=True)
+        make_foo({'name': 'third'}, cached=True)
+        keys = func_cache.OBJECT_CACHE.keys()
+        assert func_cache.get_object_key(make_foo, {'name': 'second'}) not in keys
+        assert func_cache.get_object_key(make_foo, {'name': 'first'}) in keys
+
+    @pytest.mark.parametrize('is_valid', [True, False])
+    def test_revalidate_stale_object(self, is_valid):
+        """A stale object is returned only if it is still valid."""
+        validate = mock.Mock(return_value=is_valid)
+
+        @decorators.cacheable(ttl=0, validate=validate, cache=func_cache.ObjectCache())
+        def make_foo(options):
+            return {'id': gen_integer()}
+
+        obj = make_foo(cached=True)
+        validate.assert_not_called()
+        assert (id(make_foo(cached=True)) == id(obj)) is is_valid
+        validate.assert_called_once_with(obj, None)
+
 
 class TestSkipIfNotSet:
     """Tests for :func:`robottelo.decorators.skip_if_not_set`."""
@@ -0,0 +1,48 @@
+"""Unit tests for :mod:`robottelo.api.default_entities`."""
+from unittest import mock
+
+import pytest
+
+from robottelo.api import default_entities
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    default_entities.clear_cache()
+    yield
+    default_entities.clear_cache()
+
+
+@pytest.fixture
+def organization():
+    with mock.patch('robottelo.api.default_entities.entities') as entities:
+        entities.Organization.__name__ = 'Organization'
+        yield entities.Organization
+
+
+def test_resolve_entity_once(organization):
+    """The resolver is called once, the entity is rehydrated at each call"""
+    attrs = {'id': 1, 'name': 'Default Organization'}
+    resolver = mock.Mock(return_value=mock.Mock(read_json=mock.Mock(return_value=attrs)))
+    for _ in range(3):
+        default_entities.resolve_entity(organization, resolver, key='default')
+    assert resolver.call_count == 1
+    assert organization.call_count == 3
+    organization.assert_called_with(id=1)
+    read_attrs = organization.return_value.read.call_args[1]['attrs']
+    assert read_attrs == attrs
+    assert read_attrs is not attrs
+
+
+def test_resolve_entity_by_key(organization):
+    resolver = mock.Mock(return_value=mock.Mock(read_json=mock.Mock(return_value={'id': 1})))
+    default_entities.resolve_entity(organization, resolver, key='first')
+    default_entities.resolve_entity(organization, resolver, key='second')
+    assert resolver.call_count == 2
+
+
+def test_search_entity_not_found(organization):
+    organization.return_value.search.return_value = []
+    assert default_entities.search_entity(organization, 'name="unknown"') is None
+    assert default_entities.search_entity(organization, 'name="unknown"') is None
+    organization.return_value.search.assert_called_once_with(query={'search': 'name="unknown"'})
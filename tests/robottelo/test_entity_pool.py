@@ -0,0 +1,82 @@
+"""Unit tests for :mod:`robottelo.entity_pool`."""
+import itertools
+import threading
+from unittest import mock
+
+import pytest
+
+from robottelo import entity_pool
+
+
+@pytest.fixture
+def counter_factory():
+    counter = itertools.count(1)
+    return mock.Mock(side_effect=lambda: {'id': next(counter)})
+
+
+@pytest.fixture(autouse=True)
+def reclaim_pools():
+    yield
+    entity_pool.reclaim_pools()
+
+
+def test_get_entity_without_pool():
+    """No entity is returned when the pool is not registered."""
+    assert entity_pool.get_entity('not_registered') is None
+
+
+def test_pool_is_filled(counter_factory):
+    """The pool create its entities and replace the handed out ones."""
+    pool = entity_pool.register_pool('counter', counter_factory, size=2)
+    entity = entity_pool.get_entity('counter')
+    assert entity['id'] in (1, 2)
+    pool.reclaim()
+    assert counter_factory.call_count == 3
+
+
+def test_reclaim_unused_entities(counter_factory):
+    """The entities not handed out are cleaned up."""
+    cleanup = mock.Mock()
+    entity_pool.register_pool('counter', counter_factory, cleanup=cleanup, size=3)
+    entity = entity_pool.get_entity('counter')
+    entity_pool.reclaim_pools()
+    cleaned = [call_args[0][0] for call_args in cleanup.call_args_list]
+    # the replacement entity creation may have been cancelled
+    assert len(cleaned) == counter_factory.call_count - 1
+    assert entity not in cleaned
+    assert entity_pool.get_entity('counter') is None
+
+
+def test_hand_out_entities(counter_factory):
+    """Each handed out entity is passed to the pool hand_out callable once."""
+    hand_out = mock.Mock()
+    pool = entity_pool.register_pool('counter', counter_factory, hand_out=hand_out, size=1)
+    entities = [entity_pool.get_entity('counter') for _ in range(2)]
+    pool.reclaim()
+    assert entities[0] != entities[1]
+    assert hand_out.call_args_list == [mock.call(entity) for entity in entities]
+    # a closed pool entity is created synchronously and handed out too
+    entity = pool.get()
+    hand_out.assert_called_with(entity)
+    assert hand_out.call_count == 3
+
+
+def test_failed_pooled_creation():
+    """The entity is created synchronously if the pooled creation failed."""
+    fail = threading.Event()
+    fail.set()
+
+    def factory():
+        if fail.is_set():
+            fail.clear()
+            raise ValueError('creation failed')
+        return {'id': 1}
+
+    pool = entity_pool.register_pool('failing', factory, size=1, fill=False)
+    pool.fill()
+    assert pool.get() == {'id': 1}
+
+
+def test_register_invalid_size(counter_factory):
+    with pytest.raises(entity_pool.EntityPoolError):
+        entity_pool.register_pool('counter', counter_factory, size=0)
@@ -18,6 +18,7 @@ SCOPE_2 = 'some_function_scope_2'
 
 # use the same number as the default jenkins process number
 POOL_SIZE = 8
+CONCURRENCY_LIMIT = 2
 
 # patch the default scope namespace
 func_locker.set_default_scope(NAMESPACE_SCOPE)
@@ -69,6 +70,14 @@ def _get_function_lock_path(name, scope_context=None, class_name=None):
     return os.path.join(*ls)
 
 
+@func_locker.lock_function
+def current_lock_function():
+    """Return the lock held while the function runs"""
+    lock = func_locker.get_current_lock()
+    lock.check()
+    return lock
+
+
 @func_locker.lock_function
 def simple_locked_function(index=None):
     """Read the lock file and return it"""
@@ -192,6 +201,26 @@ def simple_function_not_locked():
     return None
 
 
+@func_locker.limit_concurrency(CONCURRENCY_LIMIT, scope_context='limited_function')
+def simple_limited_function(index=None):
+    """Return the time interval of the limited function call"""
+    start_time = time.time()
+    time.sleep(0.2)
+    return start_time, time.time()
+
+
+def _get_max_concurrency(intervals):
+    events = sorted(
+        [(start_time, 1) for start_time, _ in intervals]
+        + [(end_time, -1) for _, end_time in intervals]
+    )
+    concurrency = max_concurrency = 0
+    for _, increment in events:
+        concurrency += increment
+        max_concurrency = max(concurrency, max_concurrency)
+    return max_concurrency
+
+
 class TestFuncLocker:
     @pytest.fixture(scope="function", autouse=True)
     def count_and_pool(self):
@@ -223,6 +252,22 @@ class TestFuncLocker:
 
             assert str(os.getpid()) == content
 
+    def test_current_lock(self):
+        """The locked code gets the held lock, the file locks have no fencing
+        token
+        """
+        assert func_locker.get_current_lock() is None
+        with func_locker.locking_function(simple_function_to_lock) as lock:
+            assert func_locker.get_current_lock() is lock
+            assert lock.token is None
+            lock.check()
+        assert func_locker.get_current_lock() is None
+        with pytest.raises(func_locker.FunctionLockerError, match=r'.*not held.*'):
+            lock.check()
+        lock = current_lock_function()
+        assert lock.name.endswith('current_lock_function.lock')
+        assert func_locker.get_current_lock() is None
+
     def test_locker_file_location_when_in_class(self):
         """Check the lock file location when lock function in class"""
 
@@ -413,3 +458,35 @@ class TestFuncLocker:
         with pytest.raises(func_locker.FunctionLockerError, match=r'.*Cannot ensure locking.*'):
             with func_locker.locking_function(simple_function_not_locked):
                 pass
+
+    def test_limit_concurrency_in_multiprocess(self, count_and_pool):
+        """Ensure that at most the limit of the processes run the limited
+        function at the same time
+        """
+        results = count_and_pool.map(simple_limited_function, range(POOL_SIZE))
+        assert _get_max_concurrency(results) == CONCURRENCY_LIMIT
+
+    def test_limit_concurrency_queue_depth(self, count_and_pool):
+        """Ensure that the processes waiting for a slot are counted"""
+        concurrency_limit = simple_limited_function.concurrency_limit
+        with func_locker.limit_concurrency(CONCURRENCY_LIMIT, scope_context='limited_function'):
+            with concurrency_limit:
+                assert len(concurrency_limit.get_holders()) == CONCURRENCY_LIMIT
+                results = count_and_pool.map_async(simple_limited_function, range(2))
+                end_time = time.time() + 5
+                while concurrency_limit.get_queue_depth() < 2 and time.time() < end_time:
+                    time.sleep(0.05)
+                assert concurrency_limit.get_queue_depth() == 2
+        assert len(results.get(timeout=5)) == 2
+        assert concurrency_limit.get_queue_depth() == 0
+
+    def test_negative_limit_concurrency_timeout(self):
+        with func_locker.limit_concurrency(1, scope_context='limited_block'):
+            with pytest.raises(func_locker.FunctionLockerError, match=r'.*timeout.*'):
+                with func_locker.limit_concurrency(1, scope_context='limited_block', timeout=0):
+                    pass
+
+    def test_negative_limit_concurrency_without_context(self):
+        with pytest.raises(func_locker.FunctionLockerError, match=r'.*scope_context.*'):
+            with func_locker.limit_concurrency(1):
+                pass
@@ -0,0 +1,235 @@
+"""Unit tests for :mod:`robottelo.decorators.redis_locker`."""
+import threading
+import time
+
+import pytest
+
+from robottelo.decorators import func_locker
+from robottelo.decorators import lock_profiler
+from robottelo.decorators import redis_locker
+from robottelo.decorators.func_shared import redis_storage
+from robottelo.decorators.redis_locker import RedisLockBackend
+from robottelo.decorators.redis_locker import RedisLockError
+
+fakeredis = pytest.importorskip('fakeredis')
+# the redis locks are acquired and released with lua scripts
+pytest.importorskip('lupa')
+
+
+@pytest.fixture(autouse=True)
+def redis_server(monkeypatch):
+    connection_pool = redis_storage.redis.ConnectionPool(
+        connection_class=fakeredis.FakeConnection, server=fakeredis.FakeServer()
+    )
+    monkeypatch.setattr(redis_storage, '_get_connection_pool', lambda *args: connection_pool)
+    monkeypatch.setattr(func_locker, 'LOCK_BACKEND', 'redis')
+    monkeypatch.setattr(func_locker, '_redis_lock_backends', {})
+
+
+@func_locker.lock_function
+def redis_locked_function():
+    return RedisLockBackend().get_holder(
+        'func_locker_redis_scope/tests.robottelo.test_func_locker_redis.redis_locked_function.lock'
+    )
+
+
+def test_lock_function(monkeypatch):
+    """The lock holder is the process on the runner host while the function
+    runs
+    """
+    monkeypatch.setattr(func_locker, 'LOCK_DEFAULT_SCOPE', 'func_locker_redis_scope')
+    with func_locker.locking_function(redis_locked_function) as lock:
+        assert lock.token == 1
+        lock.check()
+    assert redis_locked_function() == redis_locker.get_process_id()
+    with pytest.raises(func_locker.FunctionLockerError):
+        with func_locker.locking_function(redis_locked_function):
+            redis_locked_function()
+    assert RedisLockBackend().get_holder(lock.name) is None
+
+
+def test_lock_backend_cached(monkeypatch):
+    """The locked functions get the redis lock, the lock backend is created
+    once
+    """
+    monkeypatch.setattr(func_locker, 'LOCK_DEFAULT_SCOPE', 'func_locker_redis_scope')
+
+    @func_locker.lock_function
+    def locked():
+        return func_locker.get_current_lock()
+
+    lock = locked()
+    assert isinstance(lock, redis_locker.RedisLock)
+    assert lock.token == 1
+    assert locked().token == 2
+    assert func_locker._get_lock_backend() is func_locker._get_lock_backend()
+
+
+def test_fencing_token_and_timeout():
+    backend = RedisLockBackend()
+    with backend.lock('lock', timeout=1) as lock:
+        assert backend.get_holder('lock') == redis_locker.get_process_id()
+        with pytest.raises(RedisLockError):
+            with backend.lock('lock', timeout=0.1):
+                pass
+    with backend.lock('lock', timeout=1) as other_lock:
+        assert other_lock.token == lock.token + 1
+
+
+def test_waiter_notified(monkeypatch):
+    """A waiter acquires the lock as soon as the lock is released, without
+    polling the lock
+    """
+    monkeypatch.setattr(redis_locker, 'LOCK_POLL_RATE', 30)
+    backend = RedisLockBackend()
+    acquired_times = []
+
+    def wait_lock():
+        with backend.lock('lock', timeout=10):
+            acquired_times.append(time.time())
+
+    with backend.lock('lock', timeout=1):
+        waiter = threading.Thread(target=wait_lock)
+        waiter.start()
+        time.sleep(0.2)
+    release_time = time.time()
+    waiter.join(timeout=5)
+    assert not waiter.is_alive()
+    assert acquired_times[0] - release_time < 1
+
+
+def test_lease_renewal():
+    """The lock is held longer than its lease while renewed, and not held
+    anymore when the lease is lost
+    """
+    backend = RedisLockBackend(lease_time=0.3)
+    with backend.lock('lock', timeout=1) as lock:
+        time.sleep(0.6)
+        lock.check()
+        assert backend.client.pttl(backend.get_key('lock')) > 0
+        # an other process took the lock after the lease expired
+        backend.client.set(backend.get_key('lock'), 'other')
+        with pytest.raises(RedisLockError):
+            lock.check()
+    assert backend.get_holder('lock') == 'other'
+
+
+def test_semaphore():
+    """At most limit holders are in, the waiters are counted"""
+    backend = RedisLockBackend()
+    intervals = []
+
+    def limited():
+        with backend.semaphore('semaphore', 2, timeout=10):
+            start_time = time.time()
+            time.sleep(0.3)
+            intervals.append((start_time, time.time()))
+
+    with backend.semaphore('semaphore', 2, timeout=1):
+        with backend.semaphore('semaphore', 2, timeout=1):
+            assert backend.get_holders('semaphore') == [redis_locker.get_process_id()] * 2
+            with pytest.raises(RedisLockError):
+                with backend.semaphore('semaphore', 2, timeout=0.1):
+                    pass
+            waiters = [threading.Thread(target=limited) for _ in range(3)]
+            for waiter in waiters:
+                waiter.start()
+            time.sleep(0.2)
+            assert backend.get_queue_depth('semaphore') == 3
+    for waiter in waiters:
+        waiter.join(timeout=5)
+    assert backend.get_queue_depth('semaphore') == 0
+    assert len(intervals) == 3
+    # the waiters ran two at a time
+    intervals.sort()
+    assert intervals[2][0] >= min(intervals[0][1], intervals[1][1])
+
+
+def test_semaphore_expired_members():
+    """The holders and waiters scores are the lease expiry in the redis server
+    time, the expired ones are removed
+    """
+    backend = RedisLockBackend(lease_time=30)
+    holders_key = backend.get_holders_key('semaphore')
+    waiters_key = backend.get_waiters_key('semaphore')
+    # a process killed while holding or waiting for a slot
+    backend.client.zadd(holders_key, {'dead|holder': 1})
+    backend.client.zadd(waiters_key, {'dead|waiter': 1})
+    with backend.semaphore('semaphore', 1, timeout=1) as slot:
+        server_time = backend.get_server_time()
+        assert 29 < backend.client.zscore(holders_key, slot.value) - server_time <= 30
+        assert backend.client.zcard(holders_key) == 1
+        assert backend.client.zcard(waiters_key) == 0
+
+
+def test_limit_concurrency_shared_by_threads():
+    """The same limit instance is entered by several threads at once, each
+    thread exits its own slot
+    """
+    limit = func_locker.limit_concurrency(2, scope='func_locker_redis_scope', scope_context='ctx')
+    entered = threading.Barrier(2, timeout=5)
+    first_exited = threading.Event()
+    still_held = []
+
+    def first():
+        with limit:
+            entered.wait()
+        first_exited.set()
+
+    def second():
+        with limit as slot:
+            entered.wait()
+            first_exited.wait(timeout=5)
+            still_held.append(slot.is_held())
+
+    threads = [threading.Thread(target=first), threading.Thread(target=second)]
+    for thread in threads:
+        thread.start()
+        # the second thread enters last
+        time.sleep(0.1)
+    for thread in threads:
+        thread.join(timeout=5)
+    assert still_held == [True]
+    assert limit.get_holders() == []
+
+
+def test_limit_concurrency():
+    limited = func_locker.limit_concurrency(1, scope='func_locker_redis_scope')(time.sleep)
+    limited(0)
+    assert limited.concurrency_limit.name == 'func_locker_redis_scope/time.sleep.semaphore'
+    assert limited.concurrency_limit.get_queue_depth() == 0
+
+
+def test_timed_out_waits_recorded(monkeypatch):
+    """The waits timing out are recorded with the holders of the lock or of
+    the full semaphore
+    """
+    monkeypatch.setattr(func_locker, 'LOCK_DEFAULT_SCOPE', 'func_locker_redis_scope')
+    lock_profiler.reset()
+    backend = RedisLockBackend()
+    lock_name = (
+        'func_locker_redis_scope/tests.robottelo.test_func_locker_redis.redis_locked_function.lock'
+    )
+    # an other runner host process holds the lock
+    backend.client.set(backend.get_key(lock_name), 'other-host:1|1')
+    with pytest.raises(RedisLockError):
+        with func_locker.locking_function(redis_locked_function, timeout=0.1):
+            pass
+    limit = func_locker.limit_concurrency(1, scope='func_locker_redis_scope', scope_context='ctx')
+    with limit:
+        with pytest.raises(RedisLockError):
+            with func_locker.limit_concurrency(
+                1, scope='func_locker_redis_scope', scope_context='ctx', timeout=0.1
+            ):
+                pass
+    records = lock_profiler.get_records()
+    lock_profiler.reset()
+    assert [
+        (lock_record['lock'], lock_record['holder_pid'], lock_record['acquired'])
+        for lock_record in records
+    ] == [
+        (lock_name, 'other-host:1', False),
+        (limit.name, redis_locker.get_process_id(), False),
+        (limit.name, None, True),
+    ]
+    assert all(lock_record['wait_time'] >= 0.1 for lock_record in records[:2])
@@ -1,15 +1,18 @@
 import multiprocessing
 import os
 import time
+from unittest import mock
 
 from fauxfactory import gen_integer
 from fauxfactory import gen_string
 from unittest2 import TestCase
 
+from robottelo.decorators.func_shared.file_storage import FileStorageHandler
 from robottelo.decorators.func_shared.file_storage import get_temp_dir
 from robottelo.decorators.func_shared.file_storage import TEMP_FUNC_SHARED_DIR
 from robottelo.decorators.func_shared.file_storage import TEMP_ROOT_DIR
 from robottelo.decorators.func_shared.shared import _NAMESPACE_SCOPE_KEY_TYPE
+from robottelo.decorators.func_shared.shared import _memo
 from robottelo.decorators.func_shared.shared import _set_configured
 from robottelo.decorators.func_shared.shared import enable_shared_function
 from robottelo.decorators.func_shared.shared import set_default_scope
@@ -140,6 +143,18 @@ def basic_shared_counter_string(prefix='', suffix='', counter=0, increment_by=1)
     return '{}_{}_{}'.format(prefix, counter + increment_by, suffix)
 
 
+@shared
+def simple_shared_counter_lock_free(index=0):
+    """used to check that the ready results are read without lock"""
+    return {'index': index + 1}
+
+
+@shared
+def simple_shared_counter_memo(index=0):
+    """used to check the process memo of the ready results"""
+    return {'index': index + 1}
+
+
 class NotRestorableException(Exception):
     """ this exception is not restorable as need mote args"""
 
@@ -519,3 +534,35 @@ class FunctionSharedTestCase(TestCase):
                 suffix=suffix, prefix=prefix, counter=counter_value
             )
             self.assertEqual(inc_string, inc_string_2)
+
+    def test_ready_results_read_without_lock(self):
+        """The ready results are read without acquiring the storage lock"""
+        counter_value = gen_integer(min_value=2, max_value=10000)
+        result = simple_shared_counter_lock_free(index=counter_value)
+        self.assertEqual(result['index'], counter_value + 1)
+        with mock.patch.object(FileStorageHandler, 'lock', side_effect=AssertionError):
+            result = simple_shared_counter_lock_free(
+                index=gen_integer(min_value=10001, max_value=20000)
+            )
+        self.assertEqual(result['index'], counter_value + 1)
+
+    def test_ready_results_memo(self):
+        """The ready results are kept in the process memo until the storage
+        value changes
+        """
+        counter_value = gen_integer(min_value=2, max_value=10000)
+        result = simple_shared_counter_memo(index=counter_value)
+        self.assertEqual(result['index'], counter_value + 1)
+        # the memo returns a copy of the results
+        result['index'] = 0
+        with mock.patch.object(FileStorageHandler, 'get', side_effect=AssertionError):
+            result = simple_shared_counter_memo(index=counter_value + 1)
+        self.assertEqual(result['index'], counter_value + 1)
+        # an other process wrote a new value
+        storage = FileStorageHandler()
+        key = next(key for _, key in _memo._entries if key.endswith('simple_shared_counter_memo'))
+        value = storage.get(key)
+        value['result'] = {'index': 0}
+        storage.set(key, value)
+        result = simple_shared_counter_memo(index=counter_value + 1)
+        self.assertEqual(result['index'], 0)
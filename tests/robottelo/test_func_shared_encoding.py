@@ -0,0 +1,55 @@
+"""Unit tests for :mod:`robottelo.decorators.func_shared.encoding`."""
+import json
+
+import pytest
+
+from robottelo.decorators.func_shared import encoding
+
+VALUE = {
+    'state': 'READY',
+    'result': {'org': {'id': 1, 'name': 'org'}, 'repos': [{'id': i} for i in range(500)]},
+    'error': None,
+}
+
+SERIALIZERS = [
+    'json',
+    pytest.param(
+        'msgpack', marks=pytest.mark.skipif(encoding.msgpack is None, reason='needs msgpack')
+    ),
+]
+COMPRESSIONS = [
+    None,
+    'zlib',
+    pytest.param(
+        'zstd', marks=pytest.mark.skipif(encoding.zstandard is None, reason='needs zstandard')
+    ),
+]
+
+
+@pytest.mark.parametrize('compression', COMPRESSIONS)
+@pytest.mark.parametrize('serializer', SERIALIZERS)
+def test_encode_decode(serializer, compression):
+    """The values are decoded whatever the encoding settings of the reader"""
+    data = encoding.encode(VALUE, serializer=serializer, compression=compression, threshold=0)
+    assert data.startswith(f'RSF1:{serializer}:{compression or "none"}\n'.encode())
+    assert encoding.decode(data) == VALUE
+
+
+def test_compression_threshold():
+    """The values smaller than the threshold are not compressed"""
+    data = encoding.encode(VALUE, compression='zlib', threshold=len(json.dumps(VALUE)) + 1)
+    assert data.startswith(b'RSF1:json:none\n')
+    data = encoding.encode(VALUE, compression='zlib', threshold=len(json.dumps(VALUE)))
+    assert data.startswith(b'RSF1:json:zlib\n')
+
+
+def test_decode_without_header():
+    assert encoding.decode(json.dumps(VALUE)) == VALUE
+    assert encoding.decode(json.dumps(VALUE).encode()) == VALUE
+
+
+def test_unsupported_encoding():
+    with pytest.raises(encoding.EncodingError):
+        encoding.encode(VALUE, serializer='pickle')
+    with pytest.raises(encoding.EncodingError):
+        encoding.encode(VALUE, compression='bz2', threshold=0)
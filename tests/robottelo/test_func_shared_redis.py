@@ -0,0 +1,93 @@
+"""Unit tests for :mod:`robottelo.decorators.func_shared.redis_storage`."""
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from robottelo.decorators import func_cache
+from robottelo.decorators.func_shared import redis_storage
+from robottelo.decorators.func_shared.redis_storage import RedisStorageHandler
+from robottelo.decorators.func_shared.shared import _SharedFunction
+
+fakeredis = pytest.importorskip('fakeredis')
+# the redis locks are released with a lua script
+pytest.importorskip('lupa')
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    connection_pool = redis_storage.redis.ConnectionPool(
+        connection_class=fakeredis.FakeConnection, server=fakeredis.FakeServer()
+    )
+    monkeypatch.setattr(redis_storage, '_get_connection_pool', lambda *args: connection_pool)
+    return RedisStorageHandler(lock_timeout=10)
+
+
+def test_shared_connection_pool():
+    """The handlers with the same connection parameters share their pool"""
+    pool = redis_storage._get_connection_pool('localhost', 6379, 0, None)
+    assert redis_storage._get_connection_pool('localhost', 6379, 0, None) is pool
+    assert redis_storage._get_connection_pool('localhost', 6379, 1, None) is not pool
+
+
+def test_get_with_version(storage):
+    assert storage.get_with_version('key') == (None, None)
+    storage.set('key', {'id': 'transaction', 'result': 1})
+    assert storage.get_with_version('key') == ({'id': 'transaction', 'result': 1}, 'transaction')
+    assert storage.get_version('key') == 'transaction'
+
+
+def test_waiter_notified(storage, monkeypatch):
+    """A waiter acquires the lock as soon as the value is published, without
+    polling the lock
+    """
+    monkeypatch.setattr(redis_storage, 'LOCK_POLL_RATE', 30)
+    acquired_times = []
+
+    def wait_lock():
+        with storage.lock('key'):
+            acquired_times.append(time.time())
+
+    with storage.lock('key'):
+        waiter = threading.Thread(target=wait_lock)
+        waiter.start()
+        time.sleep(0.2)
+        storage.set('key', {'id': 'transaction', 'result': 1})
+        release_time = time.time()
+    waiter.join(timeout=5)
+    assert not waiter.is_alive()
+    assert acquired_times[0] - release_time < 1
+
+
+def test_shared_function(storage):
+    """The shared function results are stored once"""
+    results = [
+        _SharedFunction('function', lambda value=value: value, storage_handler=storage)()
+        for value in range(3)
+    ]
+    assert results == [0, 0, 0]
+
+
+def test_shared_object_cache(storage):
+    """The objects cached with shared=True, stored without transaction id,
+    are created once for all the processes
+    """
+    created = []
+
+    def make_foo(options):
+        created.append({'id': len(created)})
+        return created[-1]
+
+    # a cacheable function with its own object cache for each process
+    make_foos = [
+        func_cache.cacheable(make_foo, shared=True, cache=func_cache.ObjectCache())
+        for _ in range(2)
+    ]
+    with mock.patch.object(func_cache, '_shared_storage', return_value=storage), mock.patch.object(
+        func_cache, 'settings'
+    ) as settings:
+        settings.server.hostname = 'satellite.example.com'
+        assert [make_foo(cached=True) for make_foo in make_foos] == [{'id': 0}, {'id': 0}]
+        assert storage.get_version(func_cache._get_shared_key('foo')) is not None
+    assert len(created) == 1
@@ -0,0 +1,130 @@
+"""Unit tests for :mod:`robottelo.decorators.func_shared.sqlite_storage`."""
+import datetime
+import os
+import time
+from unittest import mock
+
+import pytest
+
+from robottelo.decorators import func_cache
+from robottelo.decorators.func_shared import sqlite_storage
+from robottelo.decorators.func_shared.shared import _SharedFunction
+from robottelo.decorators.func_shared.sqlite_storage import SQLiteStorageError
+from robottelo.decorators.func_shared.sqlite_storage import SQLiteStorageHandler
+
+
+def _value(state='READY', result=None, share_timeout=60, age=0):
+    creation_datetime = datetime.datetime.utcnow() - datetime.timedelta(seconds=age)
+    return dict(
+        state=state,
+        id='transaction',
+        result=result,
+        error=None,
+        pid=os.getpid(),
+        creation_datetime=creation_datetime.strftime('%Y-%m-%dT%H:%M:%S'),
+        share_timeout=share_timeout,
+    )
+
+
+@pytest.fixture
+def storage(tmpdir):
+    return SQLiteStorageHandler(database_path=str(tmpdir.join('shared.db')), lock_timeout=0)
+
+
+def test_set_under_lock(storage):
+    """The value is written and the key released by its owner only"""
+    assert storage.get('key') is None
+    assert storage.get_version('key') is None
+    with pytest.raises(SQLiteStorageError):
+        storage.set('key', _value(result=1))
+    with storage.lock('key'):
+        # an other handler can not lock the key
+        other_storage = SQLiteStorageHandler(database_path=storage._database_path, lock_timeout=0)
+        with pytest.raises(SQLiteStorageError):
+            with other_storage.lock('key'):
+                pass
+        storage.set('key', _value(result=1))
+    assert storage.get('key')['result'] == 1
+    assert storage.get_version('key') == 1
+    with storage.lock('key'):
+        storage.set('key', _value(result=2))
+    assert storage.get('key')['result'] == 2
+    assert storage.get_version('key') == 2
+
+
+def test_lock_of_dead_owner(storage, monkeypatch):
+    """A key locked by a process that does not exist anymore is taken over"""
+    with storage.lock('key'):
+        monkeypatch.setattr(sqlite_storage, '_is_process_alive', lambda pid: False)
+        other_storage = SQLiteStorageHandler(database_path=storage._database_path, lock_timeout=0)
+        with other_storage.lock('key'):
+            other_storage.set('key', _value(result=1))
+    assert storage.get('key')['result'] == 1
+
+
+def test_delete_expired(storage):
+    with storage.lock('expired'):
+        storage.set('expired', _value(age=120))
+    with storage.lock('valid'):
+        storage.set('valid', _value())
+    assert storage.delete_expired() == 1
+    assert storage.get('expired') is None
+    assert storage.get('valid') is not None
+
+
+def test_shared_function(storage):
+    """The shared function results are stored once"""
+    results = [
+        _SharedFunction('function', lambda value=value: value, storage_handler=storage)()
+        for value in range(3)
+    ]
+    assert results == [0, 0, 0]
+
+
+def test_shared_function_memo_per_database(storage, tmpdir):
+    """The results kept in the process memo are not shared by the databases"""
+    other_storage = SQLiteStorageHandler(database_path=str(tmpdir.join('other.db')))
+    results = [
+        _SharedFunction('function', lambda value=value: value, storage_handler=value_storage)()
+        for value, value_storage in enumerate([storage, other_storage, storage, other_storage])
+    ]
+    assert results == [0, 1, 0, 1]
+
+
+def test_set_value_without_state(storage):
+    """The values without state and share timeout expire after the default
+    expiry
+    """
+    with storage.lock('expired'):
+        storage.set(
+            'expired',
+            {'object': 1, 'creation_time': time.time() - sqlite_storage.DEFAULT_EXPIRY},
+        )
+    with storage.lock('valid'):
+        storage.set('valid', {'object': 2, 'creation_time': time.time()})
+    assert storage.get('valid') == {'object': 2, 'creation_time': mock.ANY}
+    assert storage.delete_expired() == 1
+    assert storage.get('expired') is None
+
+
+def test_shared_object_cache(storage):
+    """The objects cached with shared=True are created once for all the
+    processes
+    """
+    created = []
+
+    def make_foo(options):
+        created.append({'id': len(created)})
+        return created[-1]
+
+    # a cacheable function with its own object cache for each process
+    make_foos = [
+        func_cache.cacheable(make_foo, shared=True, cache=func_cache.ObjectCache())
+        for _ in range(2)
+    ]
+    with mock.patch.object(func_cache, '_shared_storage', return_value=storage), mock.patch.object(
+        func_cache, 'settings'
+    ) as settings:
+        settings.server.hostname = 'satellite.example.com'
+        assert [make_foo(cached=True) for make_foo in make_foos] == [{'id': 0}, {'id': 0}]
+    assert len(created) == 1
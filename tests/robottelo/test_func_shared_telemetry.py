@@ -0,0 +1,83 @@
+"""Unit tests for :mod:`robottelo.decorators.func_shared.telemetry`."""
+import time
+from contextlib import contextmanager
+
+import pytest
+
+from robottelo.decorators.func_shared import telemetry
+from robottelo.decorators.func_shared.shared import _SharedFunction
+from robottelo.decorators.func_shared.sqlite_storage import SQLiteStorageHandler
+
+
+@pytest.fixture(autouse=True)
+def reset_telemetry():
+    telemetry.reset()
+    yield
+    telemetry.reset()
+
+
+@pytest.fixture
+def storage(tmpdir):
+    return SQLiteStorageHandler(database_path=str(tmpdir.join('shared.db')))
+
+
+def test_hits_and_misses(storage):
+    for value in range(3):
+        _SharedFunction('function', lambda value=value: value, storage_handler=storage)()
+    stats = telemetry.get_stats()['function']
+    assert stats['calls'] == 3
+    assert stats['misses'] == 1
+    assert stats['hits'] == 2
+    assert stats['failures'] == 0
+    assert stats['compute_time'] >= 0
+
+
+def test_retries_and_failures(storage):
+    def failing_function():
+        raise ValueError('failed')
+
+    with pytest.raises(ValueError):
+        _SharedFunction('function', failing_function, retries=3, storage_handler=storage)()
+    with pytest.raises(ValueError):
+        _SharedFunction('function', failing_function, storage_handler=storage)()
+    stats = telemetry.get_stats()['function']
+    assert stats['calls'] == 2
+    assert stats['retries'] == 2
+    assert stats['failures'] == 2
+
+
+def test_storage_lock_timeout(storage, monkeypatch):
+    """A storage lock wait timing out is a failure with its wait time"""
+
+    @contextmanager
+    def lock(key):
+        time.sleep(0.1)
+        raise TimeoutError('storage lock timeout')
+        yield
+
+    monkeypatch.setattr(storage, 'lock', lock)
+    with pytest.raises(TimeoutError):
+        _SharedFunction('function', lambda: 1, storage_handler=storage)()
+    stats = telemetry.get_stats()['function']
+    assert stats['calls'] == 1
+    assert stats['hits'] == 0
+    assert stats['misses'] == 0
+    assert stats['failures'] == 1
+    assert stats['lock_wait_time'] >= 0.1
+
+
+def test_merge_and_report():
+    telemetry.record('function', calls=1, misses=1, compute_time=2.0)
+    stats = telemetry.merge(
+        telemetry.get_stats(),
+        {
+            'function': dict(calls=2, hits=2, lock_wait_time=1.5),
+            'other_function': dict(calls=1, hits=1),
+        },
+    )
+    assert stats['function']['calls'] == 3
+    assert stats['function']['lock_wait_time'] == 1.5
+    lines = telemetry.format_report(stats, limit=1)
+    assert len(lines) == 2
+    assert lines[1].endswith('function')
+    assert 'other_function' not in lines[1]
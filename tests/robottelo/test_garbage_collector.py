@@ -0,0 +1,113 @@
+"""Unit tests for :mod:`robottelo.decorators.garbage_collector`."""
+import datetime
+import fcntl
+import os
+import time
+
+import pytest
+
+from robottelo.decorators import garbage_collector
+from robottelo.decorators.func_shared.file_storage import FileStorageHandler
+
+
+def _set_value(storage, key, age=0, share_timeout=60, size=0, lock_age=7200):
+    creation_datetime = datetime.datetime.utcnow() - datetime.timedelta(seconds=age)
+    storage.set(
+        key,
+        dict(
+            state='READY',
+            id='transaction',
+            result='x' * size,
+            creation_datetime=creation_datetime.strftime('%Y-%m-%dT%H:%M:%S'),
+            share_timeout=share_timeout,
+        ),
+    )
+    with open(storage.get_key_file_path(f'{key}.lock'), 'w'):
+        pass
+    _set_old(storage.get_key_file_path(f'{key}.lock'), age=lock_age)
+
+
+def _set_old(path, age=7200):
+    old_time = time.time() - age
+    os.utime(path, (old_time, old_time))
+
+
+@pytest.fixture
+def storage(tmpdir):
+    return FileStorageHandler(root_dir=str(tmpdir.mkdir('shared_functions')))
+
+
+def test_expired_values(storage):
+    """The expired values are removed with their lock files, unless locked"""
+    _set_value(storage, 'valid')
+    _set_value(storage, 'expired', age=120)
+    _set_value(storage, 'expired_locked', age=120)
+    with open(storage.get_key_file_path('expired_locked.lock')) as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        stats = garbage_collector.collect_shared_functions(root_dir=storage._root_dir)
+    assert stats['removed_files'] == 2
+    assert sorted(os.listdir(storage._root_dir)) == [
+        'expired_locked',
+        'expired_locked.lock',
+        'valid',
+        'valid.lock',
+    ]
+
+
+def test_expired_values_recent_lock(storage):
+    """The recent lock file of an expired value is kept"""
+    _set_value(storage, 'expired', age=120, lock_age=0)
+    stats = garbage_collector.collect_shared_functions(root_dir=storage._root_dir)
+    assert stats['removed_files'] == 1
+    assert os.listdir(storage._root_dir) == ['expired.lock']
+
+
+def test_expired_object_cache_values(storage):
+    """The shared object cache values expire after the default share timeout,
+    the values of unknown schema are kept
+    """
+    timeout = garbage_collector.SHARE_DEFAULT_TIMEOUT
+    storage.set('valid', dict(object='x', creation_time=time.time() - timeout + 60))
+    storage.set('expired', dict(object='x', creation_time=time.time() - timeout - 60))
+    storage.set('unknown', dict(object='x'))
+    for key in ('valid', 'expired', 'unknown'):
+        _set_old(storage.get_key_file_path(key))
+    stats = garbage_collector.collect_shared_functions(root_dir=storage._root_dir)
+    assert stats['removed_files'] == 1
+    assert sorted(os.listdir(storage._root_dir)) == ['unknown', 'valid']
+
+
+def test_max_bytes(storage):
+    """The least recently used values are removed above max bytes"""
+    for index, key in enumerate(['oldest', 'old', 'recent']):
+        _set_value(storage, key, size=1000)
+        _set_old(storage.get_key_file_path(key), age=300 - index * 100)
+    garbage_collector.collect_shared_functions(root_dir=storage._root_dir, max_bytes=2500)
+    assert sorted(os.listdir(storage._root_dir)) == ['old', 'old.lock', 'recent', 'recent.lock']
+
+
+def test_dry_run(storage):
+    _set_value(storage, 'expired', age=120)
+    stats = garbage_collector.collect_shared_functions(root_dir=storage._root_dir, dry_run=True)
+    assert stats['removed_files'] == 2
+    assert len(os.listdir(storage._root_dir)) == 2
+
+
+def test_lock_functions(tmpdir):
+    """The stale function lock files and the empty scopes are removed"""
+    scope_dir = tmpdir.mkdir('lock_functions').mkdir('scope')
+    recent_lock = scope_dir.join('recent.lock')
+    recent_lock.write('')
+    held_lock = scope_dir.join('held.lock')
+    held_lock.write('')
+    _set_old(str(held_lock))
+    stale_lock = scope_dir.mkdir('context').join('stale.lock')
+    stale_lock.write('')
+    _set_old(str(stale_lock))
+    with open(str(held_lock)) as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        stats = garbage_collector.collect_lock_functions(
+            lock_dir=str(tmpdir.join('lock_functions'))
+        )
+    assert stats['removed_files'] == 1
+    assert sorted(os.listdir(str(scope_dir))) == ['held.lock', 'recent.lock']
@@ -10,6 +10,7 @@ from robottelo.helpers import get_server_version
 from robottelo.helpers import HostInfoError
 from robottelo.helpers import slugify_component
 from robottelo.helpers import Storage
+from robottelo.helpers import WebSessionPool
 
 
 class FakeSSHResult:
@@ -130,3 +131,53 @@ class TestGetAvailableCapsulePort:
         ssh.command = mock.MagicMock(return_value=FakeSSHResult(['""'], 0))
         port = get_available_capsule_port()
         assert port, "No available capsule port found."
+
+
+class TestWebSessionPool:
+    """Tests for the ``WebSessionPool`` class."""
+
+    @mock.patch('robottelo.helpers._web_login')
+    def test_login_once_per_user(self, web_login):
+        """The session of a user is reused until revalidation"""
+        web_login.side_effect = lambda login, password: mock.MagicMock()
+        pool = WebSessionPool()
+        assert pool.get('admin', 'changeme') is pool.get('admin', 'changeme')
+        assert pool.get('user', 'password') is not pool.get('admin', 'changeme')
+        assert web_login.call_count == 2
+
+    @mock.patch('robottelo.helpers._web_login')
+    def test_login_again_with_other_password(self, web_login):
+        """A session is not reused for the same user with an other password"""
+        web_login.side_effect = lambda login, password: mock.MagicMock()
+        pool = WebSessionPool()
+        sat_session = pool.get('admin', 'changeme')
+        assert pool.get('admin', 'wrong password') is not sat_session
+        web_login.assert_called_with('admin', 'wrong password')
+        assert web_login.call_count == 2
+
+    @mock.patch('robottelo.helpers._web_login')
+    def test_evict_least_recently_used(self, web_login):
+        """The least recently used session is closed when the pool is full"""
+        web_login.side_effect = lambda login, password: mock.MagicMock()
+        pool = WebSessionPool(max_size=2)
+        first = pool.get('first', 'password')
+        second = pool.get('second', 'password')
+        pool.get('first', 'password')
+        pool.get('third', 'password')
+        assert len(pool) == 2
+        second.close.assert_called_once_with()
+        assert not first.close.called
+
+    @mock.patch('robottelo.helpers._web_login')
+    def test_login_again_when_expired(self, web_login):
+        """A session no longer authenticated is replaced"""
+        web_login.side_effect = lambda login, password: mock.MagicMock()
+        pool = WebSessionPool(revalidate_after=0)
+        sat_session = pool.get('admin', 'changeme')
+        with mock.patch.object(WebSessionPool, '_is_authenticated', return_value=False):
+            new_session = pool.get('admin', 'changeme')
+        assert new_session is not sat_session
+        sat_session.close.assert_called_once_with()
+        with mock.patch.object(WebSessionPool, '_is_authenticated', return_value=True):
+            assert pool.get('admin', 'changeme') is new_session
+        assert web_login.call_count == 2
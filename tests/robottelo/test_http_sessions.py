@@ -0,0 +1,81 @@
+"""Unit tests for :mod:`robottelo.http_sessions`."""
+from http.client import HTTPMessage
+from unittest import mock
+
+import pytest
+import requests
+from requests.cookies import MockRequest
+from requests.cookies import MockResponse
+
+from robottelo import http_sessions
+
+
+@pytest.fixture(autouse=True)
+def close_sessions():
+    yield
+    http_sessions.close_sessions()
+
+
+def test_session_per_host():
+    """The same session is returned for the urls of the same host"""
+    session = http_sessions.get_session('https://example.com/api/v2/hosts')
+    assert session is http_sessions.get_session('HTTPS://Example.com/katello/api')
+    assert session is not http_sessions.get_session('https://example.com:8443/')
+    assert session is not http_sessions.get_session('http://example.com/')
+
+
+def test_session_does_not_persist_cookies():
+    session = http_sessions.get_session('https://example.com/')
+    headers = HTTPMessage()
+    headers['Set-Cookie'] = '_session_id=secret; path=/'
+    request = requests.Request('GET', 'https://example.com/').prepare()
+    session.cookies.extract_cookies(MockResponse(headers), MockRequest(request))
+    assert len(session.cookies) == 0
+
+
+def test_session_retry_adapter():
+    """The sessions retry the 5xx responses of GET and HEAD on demand only"""
+    adapter = http_sessions.get_session('https://example.com/').get_adapter('https://example.com/')
+    assert adapter.max_retries.total == http_sessions.HTTP_RETRIES
+    assert adapter.max_retries.allowed_methods == frozenset({'GET', 'HEAD'})
+    assert not adapter.max_retries.status_forcelist
+    assert adapter._pool_maxsize == http_sessions.HTTP_POOL_MAXSIZE
+    session = http_sessions.get_session('https://example.com/', retry_statuses=True)
+    assert session is not http_sessions.get_session('https://example.com/')
+    retry = session.get_adapter('https://example.com/').max_retries
+    assert set(retry.status_forcelist) == set(http_sessions.HTTP_RETRY_STATUSES)
+    assert not retry.is_retry('PUT', 503)
+    assert not retry.is_retry('DELETE', 502)
+    assert retry.is_retry('GET', 503)
+
+
+def test_request_retry_statuses_opt_in():
+    """Only the requests asking for it are retried on 5xx"""
+    with mock.patch.object(http_sessions, 'get_session') as get_session:
+        http_sessions.put('https://example.com/api', data='{}')
+        get_session.assert_called_with(
+            'https://example.com/api',
+            retry_statuses=False,
+            retry_methods=http_sessions.HTTP_RETRY_METHODS,
+        )
+        http_sessions.post('https://example.com/search', json={}, retry_statuses=True)
+        get_session.assert_called_with(
+            'https://example.com/search',
+            retry_statuses=True,
+            retry_methods=frozenset({'GET', 'HEAD', 'POST'}),
+        )
+
+
+def test_request_helpers_use_host_session():
+    session = http_sessions.get_session('https://example.com/')
+    with mock.patch.object(session, 'request') as session_request:
+        http_sessions.post('https://example.com/api', json={'name': 'foo'}, verify=False)
+    session_request.assert_called_once_with(
+        'POST', 'https://example.com/api', data=None, json={'name': 'foo'}, verify=False
+    )
+
+
+def test_requests_proxy():
+    proxy = http_sessions._RequestsProxy()
+    assert proxy.get is http_sessions.get
+    assert proxy.exceptions is requests.exceptions
@@ -0,0 +1,77 @@
+"""Unit tests for :mod:`robottelo.decorators.lock_profiler`."""
+import os
+
+import pytest
+
+from robottelo.decorators import func_locker
+from robottelo.decorators import lock_profiler
+
+
+@pytest.fixture(autouse=True)
+def reset_records():
+    lock_profiler.reset()
+    yield
+    lock_profiler.reset()
+
+
+@func_locker.lock_function
+def profiled_function():
+    return os.getpid()
+
+
+def test_get_current_test(monkeypatch):
+    monkeypatch.setenv('PYTEST_CURRENT_TEST', 'tests/test_module.py::test_name[param 1] (call)')
+    assert lock_profiler.get_current_test() == 'tests/test_module.py::test_name[param 1]'
+    monkeypatch.delenv('PYTEST_CURRENT_TEST')
+    assert lock_profiler.get_current_test() is None
+
+
+def test_locked_functions_acquires_recorded():
+    profiled_function()
+    with func_locker.locking_function(profiled_function):
+        pass
+    records = lock_profiler.get_records()
+    assert len(records) == 2
+    for lock_record in records:
+        assert lock_record['lock'].endswith(f'{profiled_function.__name__}.lock')
+        assert lock_record['pid'] == os.getpid()
+        assert lock_record['holder_pid'] is None
+        assert lock_record['nodeid'].endswith('test_locked_functions_acquires_recorded')
+        assert lock_record['wait_time'] >= 0
+        assert lock_record['hold_time'] >= 0
+        assert lock_record['acquired']
+
+
+def test_report_ranks_waits():
+    lock_profiler.record('hot', 3, 1, holder_pid=1, nodeid='test_a')
+    lock_profiler.record('hot', 2, 1, holder_pid=2, nodeid='test_b')
+    lock_profiler.record('cold', 0, 5, nodeid='test_a')
+    locks, tests = lock_profiler.summarize(lock_profiler.get_records())
+    assert [summary['lock'] for summary in locks] == ['hot', 'cold']
+    assert locks[0]['acquires'] == 2
+    assert locks[0]['contended'] == 2
+    assert locks[0]['wait_time'] == 5
+    assert locks[0]['max_wait_time'] == 3
+    assert locks[1]['hold_time'] == 5
+    assert [(summary['nodeid'], summary['wait_time']) for summary in tests] == [
+        ('test_a', 3),
+        ('test_b', 2),
+    ]
+    report = lock_profiler.format_report(lock_profiler.get_records(), limit=1)
+    assert report[2].endswith('hot')
+    assert not any(line.endswith('cold') for line in report)
+    assert report[-1].endswith('test_a')
+
+
+def test_report_counts_timeouts():
+    lock_profiler.record('hot', 10, 0, holder_pid=1, nodeid='test_a', acquired=False)
+    lock_profiler.record('hot', 1, 2, holder_pid=1, nodeid='test_b')
+    locks, tests = lock_profiler.summarize(lock_profiler.get_records())
+    assert locks[0]['acquires'] == 1
+    assert locks[0]['timeouts'] == 1
+    assert locks[0]['contended'] == 2
+    assert locks[0]['wait_time'] == 11
+    assert [(summary['nodeid'], summary['timeouts']) for summary in tests] == [
+        ('test_a', 1),
+        ('test_b', 0),
+    ]
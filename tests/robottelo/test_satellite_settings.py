@@ -0,0 +1,56 @@
+"""Unit tests for :mod:`robottelo.api.satellite_settings`."""
+from unittest import mock
+
+import pytest
+
+from robottelo.api import satellite_settings
+
+
+def _setting(name, value):
+    setting = mock.Mock(value=value)
+    setting.name = name
+    return setting
+
+
+@pytest.fixture
+def server_settings():
+    settings_entities = {
+        'idle_timeout': _setting('idle_timeout', 30),
+        'entries_per_page': _setting('entries_per_page', 20),
+        'login_text': _setting('login_text', None),
+    }
+
+    def search(query):
+        return [
+            setting
+            for name, setting in settings_entities.items()
+            if 'search' not in query or name in query['search']
+        ]
+
+    with mock.patch('robottelo.api.satellite_settings.entities') as entities:
+        entities.Setting.return_value.search.side_effect = search
+        yield settings_entities
+
+
+def test_load_names(server_settings):
+    snapshot = satellite_settings.SettingsSnapshot.load(names=['idle_timeout'])
+    assert snapshot.names == {'idle_timeout'}
+    assert snapshot.values() == {'idle_timeout': 30}
+
+
+def test_apply_only_changes(server_settings):
+    """Only the settings that differ from the snapshot are updated"""
+    snapshot = satellite_settings.SettingsSnapshot.load()
+    previous_values = snapshot.apply({'idle_timeout': 1, 'entries_per_page': 20})
+    assert previous_values == {'idle_timeout': 30}
+    assert server_settings['idle_timeout'].value == 1
+    server_settings['idle_timeout'].update.assert_called_once_with({'value'})
+    server_settings['entries_per_page'].update.assert_not_called()
+
+
+def test_settings_updated_restore(server_settings):
+    with satellite_settings.settings_updated({'idle_timeout': 1, 'entries_per_page': 20}):
+        assert server_settings['idle_timeout'].value == 1
+    assert server_settings['idle_timeout'].value == 30
+    assert server_settings['idle_timeout'].update.call_count == 2
+    server_settings['entries_per_page'].update.assert_not_called()